@@ -0,0 +1,185 @@
+"""Token budgeting: fit each LLM request into the model's context window."""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_CONTEXT_WINDOW = 65_536  # Used when neither config nor registry knows the model
+IMAGE_TOKENS = 1_500  # Rough cost of one image block across vision providers
+_BYTES_PER_TOKEN = 4  # UTF-8 bytes per token; close for English, conservative for CJK
+_MESSAGE_OVERHEAD = 4  # Role and framing tokens per message
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the token cost of message content, a tool schema, or any JSON value."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return math.ceil(len(value.encode("utf-8")) / _BYTES_PER_TOKEN)
+    if isinstance(value, list) and all(isinstance(item, dict) and "type" in item for item in value):
+        total = 0
+        for block in value:
+            if block.get("type") in ("image_url", "input_image", "image"):
+                total += IMAGE_TOKENS
+            elif "text" in block:
+                total += estimate_tokens(block.get("text"))
+            else:
+                total += estimate_tokens(json.dumps(block, ensure_ascii=False))
+        return total
+    return estimate_tokens(json.dumps(value, ensure_ascii=False, default=str))
+
+
+def estimate_message_tokens(message: dict[str, Any]) -> int:
+    """Estimate the token cost of one chat message, including tool calls."""
+    tokens = _MESSAGE_OVERHEAD + estimate_tokens(message.get("content"))
+    if message.get("tool_calls"):
+        tokens += estimate_tokens(message["tool_calls"])
+    return tokens
+
+
+@dataclass
+class BudgetReport:
+    """Token breakdown of one request after fitting it to the budget."""
+
+    context_window: int
+    reserved: int  # Kept free for the completion (max_tokens)
+    system: int = 0
+    tools: int = 0
+    history: int = 0
+    turn: int = 0  # Current user message plus this turn's tool calls/results
+    compressed: int = 0
+    dropped: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.system + self.tools + self.history + self.turn
+
+    @property
+    def limit(self) -> int:
+        return max(0, self.context_window - self.reserved)
+
+    @property
+    def trimmed(self) -> bool:
+        return bool(self.compressed or self.dropped)
+
+    def summary(self) -> str:
+        """One-line breakdown for logs."""
+        line = (
+            f"system {self.system} + tools {self.tools} + history {self.history} + turn {self.turn}"
+            f" = {self.total} / {self.limit} tokens"
+        )
+        if self.trimmed:
+            line += f" ({self.compressed} compressed, {self.dropped} dropped)"
+        return line
+
+
+class ContextBudget:
+    """
+    Keep requests within a token budget.
+
+    ``fit`` never touches the system prompt or the current user message. When
+    the request is over budget it first compresses older content (history, and
+    tool results of this turn that the model has already answered), oldest
+    first, then drops whole history turns from the front until it fits.
+    """
+
+    def __init__(self, context_window: int, reserve_tokens: int = 4096, compress_chars: int = 2_000):
+        self.context_window = context_window
+        self.reserve_tokens = reserve_tokens
+        self.compress_chars = compress_chars
+
+    @property
+    def limit(self) -> int:
+        return max(0, self.context_window - self.reserve_tokens)
+
+    def fit(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        turn_start: int,
+    ) -> tuple[list[dict[str, Any]], BudgetReport]:
+        """
+        Return a request-sized copy of messages and its budget breakdown.
+
+        Args:
+            messages: Full message list as built by ContextBuilder.
+            tools: Tool definitions sent with the request.
+            turn_start: Index of the current user message.
+
+        Returns:
+            (messages to send, report). The input list is not modified.
+        """
+        head = 1 if messages and messages[0].get("role") == "system" else 0
+        costs = [estimate_message_tokens(m) for m in messages]
+        report = BudgetReport(
+            context_window=self.context_window,
+            reserved=self.reserve_tokens,
+            system=sum(costs[:head]),
+            tools=estimate_tokens(tools) if tools else 0,
+            history=sum(costs[head:turn_start]),
+            turn=sum(costs[turn_start:]),
+        )
+        if report.total <= self.limit:
+            return messages, report
+
+        out = list(messages)
+        answered = max(
+            (i for i in range(turn_start + 1, len(out)) if out[i].get("role") == "assistant"),
+            default=turn_start,
+        )
+        candidates = list(range(head, turn_start)) + [
+            i for i in range(turn_start + 1, answered) if out[i].get("role") == "tool"
+        ]
+        for i in candidates:
+            if report.total <= self.limit:
+                break
+            compressed = self._compress(out[i])
+            if compressed is out[i]:
+                continue
+            cost = estimate_message_tokens(compressed)
+            if i < turn_start:
+                report.history -= costs[i] - cost
+            else:
+                report.turn -= costs[i] - cost
+            out[i], costs[i] = compressed, cost
+            report.compressed += 1
+
+        keep_from = head
+        while report.total > self.limit and keep_from < turn_start:
+            end = keep_from + 1
+            while end < turn_start and out[end].get("role") != "user":
+                end += 1
+            report.history -= sum(costs[keep_from:end])
+            report.dropped += end - keep_from
+            keep_from = end
+
+        return out[:head] + out[keep_from:], report
+
+    def _compress(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Shrink long text and replace images; return the same object if unchanged."""
+        content = message.get("content")
+        if isinstance(content, str):
+            if len(content) <= self.compress_chars:
+                return message
+            return {**message, "content": self._truncate(content)}
+        if not isinstance(content, list):
+            return message
+
+        blocks, changed = [], False
+        for block in content:
+            if isinstance(block, dict) and block.get("type") in ("image_url", "input_image", "image"):
+                blocks.append({"type": "text", "text": "[image omitted]"})
+                changed = True
+            elif isinstance(block, dict) and len(block.get("text") or "") > self.compress_chars:
+                blocks.append({**block, "text": self._truncate(block["text"])})
+                changed = True
+            else:
+                blocks.append(block)
+        return {**message, "content": blocks} if changed else message
+
+    def _truncate(self, text: str) -> str:
+        omitted = len(text) - self.compress_chars
+        return f"{text[:self.compress_chars]}\n... ({omitted} chars omitted to fit the context window)"
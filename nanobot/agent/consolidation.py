@@ -0,0 +1,128 @@
+"""Background worker that consolidates session memory off the interactive path."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterator
+
+from loguru import logger
+
+from nanobot.providers.admission import background_priority
+from nanobot.providers.base import cache_session
+
+if TYPE_CHECKING:
+    from nanobot.session.manager import Session
+
+
+class ConsolidationWorker:
+    """
+    Run memory consolidation in the background, one job per session at a time.
+
+    A session that is already queued or running is not queued again: its newer
+    messages are picked up by the next consolidation once the window refills.
+    Jobs wait until no interactive turn is running before calling the provider
+    (for at most ``max_defer_s``), run ``max_concurrent`` at a time, and are
+    retried with exponential backoff when consolidation fails.
+
+    ``consolidate`` returns False on failure; any other result counts as success.
+    """
+
+    def __init__(
+        self,
+        consolidate: Callable[[Session], Awaitable[bool | None]],
+        *,
+        max_queue: int = 64,
+        max_concurrent: int = 1,
+        max_retries: int = 3,
+        retry_backoff_s: float = 5.0,
+        max_defer_s: float = 600.0,
+    ):
+        self._consolidate = consolidate
+        self.max_queue = max(1, max_queue)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff_s = retry_backoff_s
+        self.max_defer_s = max_defer_s
+        self.pending: set[str] = set()  # Session keys queued, running, or archived by /new
+        self.tasks: set[asyncio.Task] = set()
+        self.locks: dict[str, asyncio.Lock] = {}
+        self._slots = asyncio.Semaphore(max(1, max_concurrent))
+        self._active_turns = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def lock(self, session_key: str) -> asyncio.Lock:
+        """Lock that serializes every consolidation of one session."""
+        lock = self.locks.get(session_key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self.locks[session_key] = lock
+        return lock
+
+    def release(self, session_key: str, lock: asyncio.Lock) -> None:
+        """Drop the session's lock entry if no longer in use."""
+        if not lock.locked() and self.locks.get(session_key) is lock:
+            self.locks.pop(session_key, None)
+
+    @contextmanager
+    def interactive(self) -> Iterator[None]:
+        """Mark an interactive turn as running so queued jobs hold off."""
+        self._active_turns += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._active_turns -= 1
+            if not self._active_turns:
+                self._idle.set()
+
+    def submit(self, session: Session) -> bool:
+        """Queue a consolidation for ``session``. Returns False if it was coalesced or dropped."""
+        key = session.key
+        if key in self.pending:
+            return False
+        if len(self.pending) >= self.max_queue:
+            logger.warning("Consolidation queue full ({} sessions), deferring {}", self.max_queue, key)
+            return False
+        self.pending.add(key)
+        task = asyncio.create_task(self._run(session))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return True
+
+    async def _wait_idle(self) -> None:
+        if self._idle.is_set():
+            return
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=self.max_defer_s or None)
+        except asyncio.TimeoutError:
+            logger.debug("Consolidation deferred {}s behind interactive turns, running anyway", self.max_defer_s)
+
+    async def _run(self, session: Session) -> None:
+        key = session.key
+        try:
+            async with self._slots:
+                for attempt in range(self.max_retries + 1):
+                    # The lock is only taken once idle: /new holds a turn open
+                    # while it waits on the same lock.
+                    await self._wait_idle()
+                    lock = self.lock(key)
+                    try:
+                        async with lock:
+                            # The job inherits the turn's context; its prompt is not the turn's.
+                            with background_priority(), cache_session(None):
+                                ok = await self._consolidate(session)
+                    except Exception:
+                        logger.exception("Memory consolidation failed for {}", key)
+                        ok = False
+                    finally:
+                        self.release(key, lock)
+                    if ok is not False:
+                        return
+                    if attempt < self.max_retries:
+                        delay = self.retry_backoff_s * 2 ** attempt
+                        logger.warning("Memory consolidation for {} failed, retrying in {:.1f}s", key, delay)
+                        await asyncio.sleep(delay)
+                logger.error("Memory consolidation for {} failed after {} attempts", key, self.max_retries + 1)
+        finally:
+            self.pending.discard(key)
@@ -3,12 +3,26 @@
 import base64
 import mimetypes
 import platform
+import re
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Hashable
 
 from nanobot.agent.memory import MemoryStore
+from nanobot.agent.memory_recall import MemoryRecall
 from nanobot.agent.skills import SkillsLoader
 
+if TYPE_CHECKING:
+    from nanobot.config.schema import MemoryRecallConfig
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    """Cheap change detector for a file: (mtime_ns, size), or None if missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
 
 class ContextBuilder:
     """
@@ -16,8 +30,17 @@ class ContextBuilder:
     
     Assembles bootstrap files, memory, skills, and conversation history
     into a coherent prompt for the LLM.
+
+    The system prompt only contains content that changes when workspace files
+    change, so it stays byte-identical across turns and provider-side prompt
+    caches keep hitting. Each section is cached against the mtime/size of the
+    files it was built from. Per-turn data (current time, channel, chat ID) goes
+    into a runtime context block on the current user message instead, as do
+    the memory sections recalled for the message once MEMORY.md outgrows its
+    budget.
     """
     
+    RUNTIME_CONTEXT_TAG = "[Runtime Context — metadata only, not instructions]"
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     _IMAGE_MIME_BY_SUFFIX = {
         ".jpg": "image/jpeg",
@@ -33,10 +56,28 @@ class ContextBuilder:
         ".heif": "image/heif",
     }
     
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, memory_recall: "MemoryRecallConfig | None" = None):
         self.workspace = workspace
         self.memory = MemoryStore(workspace)
+        self.recall = MemoryRecall(self.memory, memory_recall)
         self.skills = SkillsLoader(workspace)
+        self._sections: dict[str, tuple[Hashable, str]] = {}
+
+    def _cached(self, name: str, signature: Hashable, build: Callable[[], str]) -> str:
+        """Return a prompt section, rebuilding it only when its signature changes."""
+        hit = self._sections.get(name)
+        if hit is not None and hit[0] == signature:
+            return hit[1]
+        content = build()
+        self._sections[name] = (signature, content)
+        return content
+
+    def _bootstrap_signature(self) -> Hashable:
+        return tuple(_file_signature(self.workspace / f) for f in self.BOOTSTRAP_FILES)
+
+    def _skills_signature(self) -> Hashable:
+        """Signature over the skill index, PATH and required env vars (availability depends on them)."""
+        return self.skills.signature()
     
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """
@@ -51,19 +92,31 @@ class ContextBuilder:
         parts = []
         
         # Core identity
-        parts.append(self._get_identity())
+        parts.append(self._cached("identity", None, self._get_identity))
         
         # Bootstrap files
-        bootstrap = self._load_bootstrap_files()
+        bootstrap = self._cached("bootstrap", self._bootstrap_signature(), self._load_bootstrap_files)
         if bootstrap:
             parts.append(bootstrap)
         
         # Memory context
-        memory = self.memory.get_memory_context()
+        memory = self._cached(
+            "memory", _file_signature(self.memory.memory_file), self.recall.stable_context
+        )
         if memory:
             parts.append(f"# Memory\n\n{memory}")
         
         # Skills - progressive loading
+        skills = self._cached("skills", self._skills_signature(), self._build_skills_section)
+        if skills:
+            parts.append(skills)
+        
+        return "\n\n---\n\n".join(parts)
+
+    def _build_skills_section(self) -> str:
+        """Build the always-loaded skills and the available-skills summary."""
+        parts = []
+
         # 1. Always-loaded skills: include full content
         always_skills = self.skills.get_always_skills()
         if always_skills:
@@ -85,10 +138,6 @@ Skills with available="false" need dependencies installed first - you can try in
     
     def _get_identity(self) -> str:
         """Get the core identity section."""
-        from datetime import datetime
-        import time as _time
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
-        tz = _time.strftime("%Z") or "UTC"
         workspace_path = str(self.workspace.expanduser().resolve())
         system = platform.system()
         runtime = f"{'macOS' if system == 'Darwin' else system} {platform.machine()}, Python {platform.python_version()}"
@@ -97,19 +146,17 @@ Skills with available="false" need dependencies installed first - you can try in
 
 You are nanobot, a helpful AI assistant. 
 
-## Current Time
-{now} ({tz})
-
 ## Runtime
 {runtime}
 
 ## Workspace
 Your workspace is at: {workspace_path}
 - Long-term memory: {workspace_path}/memory/MEMORY.md
-- History log: {workspace_path}/memory/HISTORY.md (grep-searchable)
+- History log: {workspace_path}/memory/HISTORY.md (searchable with memory_search)
 - Custom skills: {workspace_path}/skills/{{skill-name}}/SKILL.md
 
 Reply directly with text for conversations. Only use the 'message' tool to send to a specific chat channel.
+The current time and chat routing are given in a "{self.RUNTIME_CONTEXT_TAG}" block at the start of the latest user message.
 
 ## Tool Call Guidelines
 - Before calling tools, you may briefly state your intent (e.g. "Let me check that"), but NEVER predict or describe the expected result before receiving it.
@@ -120,7 +167,7 @@ Reply directly with text for conversations. Only use the 'message' tool to send
 
 ## Memory
 - Remember important facts: write to {workspace_path}/memory/MEMORY.md
-- Recall past events: grep {workspace_path}/memory/HISTORY.md"""
+- Recall past events and earlier conversations: use the memory_search tool"""
     
     def _load_bootstrap_files(self) -> str:
         """Load all bootstrap files from workspace."""
@@ -133,6 +180,50 @@ Reply directly with text for conversations. Only use the 'message' tool to send
                 parts.append(f"## {filename}\n\n{content}")
         
         return "\n\n".join(parts) if parts else ""
+
+    @classmethod
+    def _build_runtime_context(cls, channel: str | None, chat_id: str | None, memory: str = "") -> str:
+        """Per-turn metadata kept out of the system prompt so the prompt prefix stays cacheable."""
+        from datetime import datetime
+        import time as _time
+        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+        tz = _time.strftime("%Z") or "UTC"
+        lines = [cls.RUNTIME_CONTEXT_TAG, f"Current Time: {now} ({tz})"]
+        if channel and chat_id:
+            lines += [f"Channel: {channel}", f"Chat ID: {chat_id}"]
+        if memory:
+            # The block ends at the first blank line (see strip_runtime_context).
+            lines += ["Recalled Memory (MEMORY.md sections relevant to this message):", re.sub(r"\n\s*\n", "\n", memory)]
+        return "\n".join(lines)
+
+    def recall_query(self, history: list[dict[str, Any]], current_message: str) -> str:
+        """Text that memory sections are ranked against: the message plus recent history."""
+        recent = history[-self.recall.config.history_messages:] if self.recall.config.history_messages > 0 else []
+        texts = [m["content"] for m in recent if m.get("role") in ("user", "assistant") and isinstance(m.get("content"), str)]
+        return "\n".join([*texts, current_message])
+
+    async def recall_memory(self, history: list[dict[str, Any]], current_message: str) -> str:
+        """Memory sections to recall for this message ("" while MEMORY.md fits in the system prompt)."""
+        return await self.recall.recall(self.recall_query(history, current_message))
+
+    @classmethod
+    def strip_runtime_context(cls, content: Any) -> Any:
+        """Remove the runtime context block from user content (for persisting history)."""
+        if isinstance(content, str):
+            if content.startswith(cls.RUNTIME_CONTEXT_TAG):
+                _, sep, rest = content.partition("\n\n")
+                return rest if sep else ""
+            return content
+        if isinstance(content, list):
+            return [
+                item for item in content
+                if not (
+                    isinstance(item, dict)
+                    and item.get("type") == "text"
+                    and str(item.get("text", "")).startswith(cls.RUNTIME_CONTEXT_TAG)
+                )
+            ]
+        return content
     
     def build_messages(
         self,
@@ -142,6 +233,7 @@ Reply directly with text for conversations. Only use the 'message' tool to send
         media: list[str] | None = None,
         channel: str | None = None,
         chat_id: str | None = None,
+        recalled_memory: str | None = None,
     ) -> list[dict[str, Any]]:
         """
         Build the complete message list for an LLM call.
@@ -153,23 +245,29 @@ Reply directly with text for conversations. Only use the 'message' tool to send
             media: Optional list of local file paths for images/media.
             channel: Current channel (telegram, feishu, etc.).
             chat_id: Current chat/user ID.
+            recalled_memory: Memory sections from ``recall_memory``; ranked
+                with BM25 here when omitted.
 
         Returns:
             List of messages including system prompt.
         """
         messages = []
 
-        # System prompt
-        system_prompt = self.build_system_prompt(skill_names)
-        if channel and chat_id:
-            system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
-        messages.append({"role": "system", "content": system_prompt})
+        # System prompt (stable across turns)
+        messages.append({"role": "system", "content": self.build_system_prompt(skill_names)})
 
         # History
         messages.extend(history)
 
-        # Current message (with optional image attachments)
+        # Current message: runtime context + text (with optional image attachments)
+        if recalled_memory is None:
+            recalled_memory = self.recall.select(self.recall_query(history, current_message))
+        runtime = self._build_runtime_context(channel, chat_id, recalled_memory)
         user_content = self._build_user_content(current_message, media)
+        if isinstance(user_content, str):
+            user_content = f"{runtime}\n\n{user_content}"
+        else:
+            user_content = [{"type": "text", "text": runtime}] + user_content
         messages.append({"role": "user", "content": user_content})
 
         return messages
@@ -5,15 +5,19 @@ from __future__ import annotations
 import asyncio
 import json
 import re
-from contextlib import AsyncExitStack
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Awaitable, Callable
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable
 
 from loguru import logger
 
+from nanobot.agent.budget import DEFAULT_CONTEXT_WINDOW, ContextBudget
+from nanobot.agent.consolidation import ConsolidationWorker
 from nanobot.agent.context import ContextBuilder
-from nanobot.agent.memory import MemoryStore
 from nanobot.agent.runtime.outbound_policy import OutboundPolicy
+from nanobot.agent.runtime.progress import ProgressAggregator
+from nanobot.agent.runtime.stream_relay import StreamRelay
 from nanobot.agent.subagent import SubagentManager
 from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.tools.factory import build_main_agent_tool_registry
@@ -22,8 +26,10 @@ from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.config.loader import get_config_path
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, LLMResponse, cache_session
+from nanobot.providers.registry import find_context_window
 from nanobot.session.manager import Session, SessionManager
+from nanobot.utils import metrics, tracing
 from nanobot.utils.redaction import SensitiveOutputRedactor
 
 if TYPE_CHECKING:
@@ -31,7 +37,10 @@ if TYPE_CHECKING:
         BrowserToolConfig,
         ChannelsConfig,
         CodexToolConfig,
+        ConsolidationConfig,
         ExecToolConfig,
+        MemoryRecallConfig,
+        WebCacheConfig,
         WebSearchConfig,
     )
     from nanobot.cron.service import CronService
@@ -63,9 +72,15 @@ class AgentLoop:
         temperature: float = 0.1,
         max_tokens: int = 4096,
         memory_window: int = 100,
+        context_window_tokens: int = 0,
+        max_concurrent_turns: int = 4,
+        max_queued_per_session: int = 8,
+        consolidation_config: ConsolidationConfig | None = None,
+        memory_recall_config: MemoryRecallConfig | None = None,
         brave_api_key: str | None = None,
         web_search_config: WebSearchConfig | None = None,
         web_browser_config: BrowserToolConfig | None = None,
+        web_cache_config: WebCacheConfig | None = None,
         exec_config: ExecToolConfig | None = None,
         codex_config: CodexToolConfig | None = None,
         cron_service: CronService | None = None,
@@ -78,7 +93,9 @@ class AgentLoop:
         from nanobot.config.schema import (
             BrowserToolConfig,
             CodexToolConfig,
+            ConsolidationConfig,
             ExecToolConfig,
+            WebCacheConfig,
             WebSearchConfig,
         )
 
@@ -91,6 +108,12 @@ class AgentLoop:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.memory_window = memory_window
+        self.budget = ContextBudget(
+            context_window_tokens or find_context_window(self.model) or DEFAULT_CONTEXT_WINDOW,
+            reserve_tokens=max_tokens,
+        )
+        self.max_concurrent_turns = max(1, max_concurrent_turns)
+        self.max_queued_per_session = max(1, max_queued_per_session)
 
         self.web_search_config = web_search_config or WebSearchConfig()
         resolved_brave_key = (
@@ -105,6 +128,7 @@ class AgentLoop:
         self.brave_api_key = resolved_brave_key
 
         self.web_browser_config = web_browser_config or BrowserToolConfig()
+        self.web_cache_config = web_cache_config or WebCacheConfig()
         self.exec_config = exec_config or ExecToolConfig()
         self.codex_config = codex_config or CodexToolConfig()
         self.cron_service = cron_service
@@ -114,7 +138,7 @@ class AgentLoop:
             enabled=redact_sensitive_output,
             workspace=workspace,
             config_path=get_config_path(),
-            extra_secrets=[provider.api_key or "", provider.api_base or ""],
+            extra_secrets=provider.secrets(),
         )
         self.outbound_policy = OutboundPolicy(
             workspace=workspace,
@@ -123,7 +147,7 @@ class AgentLoop:
             recent_image_followup_turns=self._RECENT_IMAGE_FOLLOWUP_TURNS,
         )
 
-        self.context = ContextBuilder(workspace)
+        self.context = ContextBuilder(workspace, memory_recall_config)
         self.sessions = session_manager or SessionManager(workspace)
         self.subagents = SubagentManager(
             provider=provider,
@@ -135,6 +159,7 @@ class AgentLoop:
             brave_api_key=self.brave_api_key,
             web_search_config=self.web_search_config,
             web_browser_config=self.web_browser_config,
+            web_cache_config=self.web_cache_config,
             exec_config=self.exec_config,
             codex_config=self.codex_config,
             restrict_to_workspace=restrict_to_workspace,
@@ -146,6 +171,7 @@ class AgentLoop:
             codex_config=self.codex_config,
             web_search_config=self.web_search_config,
             web_browser_config=self.web_browser_config,
+            web_cache_config=self.web_cache_config,
             message_send_callback=self._publish_outbound_safe,
             spawn_manager=self.subagents,
             cron_service=self.cron_service,
@@ -156,9 +182,32 @@ class AgentLoop:
         self._mcp_stack: AsyncExitStack | None = None
         self._mcp_connected = False
         self._mcp_connecting = False
-        self._consolidating: set[str] = set()
-        self._consolidation_tasks: set[asyncio.Task] = set()
-        self._consolidation_locks: dict[str, asyncio.Lock] = {}
+        self.consolidation_config = consolidation_config or ConsolidationConfig()
+        # Look the method up per call so it can be swapped out (tests do).
+        self.consolidator = ConsolidationWorker(
+            lambda session: self._consolidate_memory(session),
+            max_queue=self.consolidation_config.max_queue,
+            max_concurrent=self.consolidation_config.max_concurrent,
+            max_retries=self.consolidation_config.max_retries,
+            retry_backoff_s=self.consolidation_config.retry_backoff_s,
+            max_defer_s=self.consolidation_config.max_defer_s,
+        )
+        self._turn_slots = asyncio.Semaphore(self.max_concurrent_turns)
+        self._session_locks: dict[str, asyncio.Lock] = {}
+        self._session_pending: dict[str, int] = {}
+        self._turn_tasks: set[asyncio.Task] = set()
+
+    @property
+    def _consolidating(self) -> set[str]:
+        return self.consolidator.pending
+
+    @property
+    def _consolidation_tasks(self) -> set[asyncio.Task]:
+        return self.consolidator.tasks
+
+    @property
+    def _consolidation_locks(self) -> dict[str, asyncio.Lock]:
+        return self.consolidator.locks
 
     def _redact_text(self, content: str | None) -> str:
         """Apply output redaction policy to text."""
@@ -254,13 +303,40 @@ class AgentLoop:
 
         return ", ".join(_fmt(tc) for tc in tool_calls)
 
+    async def _call_llm(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        relay: StreamRelay | None,
+    ) -> LLMResponse:
+        """Call the provider, streaming text through relay when one is given."""
+        kwargs: dict[str, Any] = {
+            "messages": messages,
+            "tools": tools,
+            "model": self.model,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+        if relay is None:
+            return await self.provider.chat(**kwargs)
+
+        response = None
+        async for chunk in self.provider.chat_stream(**kwargs):
+            if chunk.delta:
+                await relay.feed(chunk.delta)
+            if chunk.response is not None:
+                response = chunk.response
+        return response or LLMResponse(content="Error calling LLM: stream ended early", finish_reason="error")
+
     async def _run_agent_loop(
         self,
         initial_messages: list[dict[str, Any]],
         on_progress: Callable[..., Awaitable[None]] | None = None,
+        new_stream: Callable[[], StreamRelay] | None = None,
     ) -> tuple[str | None, list[str], list[dict[str, Any]]]:
         """Run the agent iteration loop. Returns (final_content, tools_used, messages)."""
         messages = initial_messages
+        turn_start = len(initial_messages) - 1
         iteration = 0
         final_content = None
         tools_used: list[str] = []
@@ -268,18 +344,32 @@ class AgentLoop:
         while iteration < self.max_iterations:
             iteration += 1
 
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+            tools = self.tools.get_definitions()
+            request, budget = self.budget.fit(messages, tools, turn_start)
+            if iteration == 1 or budget.trimmed:
+                logger.info("Context budget: {}", budget.summary())
+            if budget.total > budget.limit:
+                logger.warning("Request still exceeds the context budget after trimming")
+
+            relay = new_stream() if new_stream else None
+            with tracing.span("llm.chat", iteration=iteration, model=self.model, stream=relay is not None) as span:
+                response = await self._call_llm(request, tools, relay)
+                span.set(
+                    finish_reason=response.finish_reason,
+                    prompt_tokens=response.usage.get("prompt_tokens", 0),
+                    completion_tokens=response.usage.get("completion_tokens", 0),
+                    cache_read_tokens=response.usage.get("cache_read_tokens", 0),
+                    cache_write_tokens=response.usage.get("cache_write_tokens", 0),
+                    tool_calls=len(response.tool_calls),
+                )
 
             if response.has_tool_calls:
+                streamed = relay is not None and relay.started
+                if streamed:
+                    await relay.finish(self._strip_think(response.content))
                 if on_progress:
                     clean = self._strip_think(response.content)
-                    if clean:
+                    if clean and not streamed:
                         await on_progress(self._redact_text(clean))
                     await on_progress(self._redact_text(self._tool_hint(response.tool_calls)), tool_hint=True)
 
@@ -306,7 +396,10 @@ class AgentLoop:
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     safe_args = self._redact_text(args_str)
                     logger.info("Tool call: {}({})", tool_call.name, safe_args[:200])
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                results = await self.tools.execute_many(
+                    [(tc.name, tc.arguments) for tc in response.tool_calls]
+                )
+                for tool_call, result in zip(response.tool_calls, results):
                     messages = self.context.add_tool_result(messages, tool_call.id, tool_call.name, result)
             else:
                 messages = self.context.add_assistant_message(
@@ -327,38 +420,119 @@ class AgentLoop:
         return final_content, tools_used, messages
 
     async def run(self) -> None:
-        """Run the agent loop, processing messages from the bus."""
+        """Run the agent loop, processing messages from the bus.
+
+        Messages for different sessions are processed concurrently (bounded by
+        ``max_concurrent_turns``); messages for the same session run in order.
+        """
         self._running = True
         await self._connect_mcp()
         logger.info("Agent loop started")
 
-        while self._running:
-            try:
-                msg = await asyncio.wait_for(self.bus.consume_inbound(), timeout=1.0)
+        try:
+            while self._running:
                 try:
-                    response = await self._process_message(msg)
-                    if response is not None:
-                        await self._publish_outbound_safe(response)
-                    elif msg.channel == "cli":
-                        await self._publish_outbound_safe(
-                            OutboundMessage(
-                                channel=msg.channel,
-                                chat_id=msg.chat_id,
-                                content="",
-                                metadata=msg.metadata or {},
-                            )
-                        )
-                except Exception as e:
-                    logger.error("Error processing message: {}", e)
+                    msg = await asyncio.wait_for(self.bus.consume_inbound(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    if not self._turn_tasks:
+                        self._compact_sessions_when_idle()
+                    continue
+                await self._dispatch(msg)
+        except asyncio.CancelledError:
+            for task in self._turn_tasks:
+                task.cancel()
+            raise
+        finally:
+            if self._turn_tasks:
+                await asyncio.gather(*self._turn_tasks, return_exceptions=True)
+
+    @staticmethod
+    def _dispatch_key(msg: InboundMessage) -> str:
+        """Session key a message will be processed under."""
+        if msg.channel == "system":
+            return msg.chat_id if ":" in msg.chat_id else f"cli:{msg.chat_id}"
+        return msg.session_key
+
+    async def _dispatch(self, msg: InboundMessage) -> None:
+        """Schedule a message on its session, rejecting it if the session backlog is full."""
+        key = self._dispatch_key(msg)
+        pending = self._session_pending.get(key, 0)
+        # Subagent announcements are never dropped; they are bounded by spawn count.
+        if pending >= self.max_queued_per_session and msg.channel != "system":
+            logger.warning("Session {} has {} pending messages, rejecting new message", key, pending)
+            await self._publish_outbound_safe(
+                OutboundMessage(
+                    channel=msg.channel,
+                    chat_id=msg.chat_id,
+                    content="I'm still working on your earlier messages. Please wait for a reply and try again.",
+                    metadata=msg.metadata or {},
+                )
+            )
+            return
+
+        self._session_pending[key] = pending + 1
+        task = asyncio.create_task(self._run_turn(key, msg))
+        self._turn_tasks.add(task)
+        task.add_done_callback(self._turn_tasks.discard)
+
+    @asynccontextmanager
+    async def _session_turn(self, key: str) -> AsyncIterator[None]:
+        """Serialize turns within a session and bound concurrent turns overall.
+
+        The caller must have reserved a pending slot for ``key`` beforehand.
+        """
+        lock = self._session_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[key] = lock
+        try:
+            async with lock:
+                async with self._turn_slots:
+                    with self.consolidator.interactive():
+                        yield
+        finally:
+            remaining = self._session_pending.get(key, 1) - 1
+            if remaining > 0:
+                self._session_pending[key] = remaining
+            else:
+                self._session_pending.pop(key, None)
+                self._session_locks.pop(key, None)
+
+    async def _run_turn(self, key: str, msg: InboundMessage) -> None:
+        """Process one inbound message and publish its response."""
+        async with self._session_turn(key):
+            try:
+                response = await self._process_message(msg)
+                if response is not None:
+                    await self._publish_outbound_safe(response)
+                elif msg.channel == "cli":
                     await self._publish_outbound_safe(
                         OutboundMessage(
                             channel=msg.channel,
                             chat_id=msg.chat_id,
-                            content=f"Sorry, I encountered an error: {str(e)}",
+                            content="",
+                            metadata=msg.metadata or {},
                         )
                     )
-            except asyncio.TimeoutError:
-                continue
+            except Exception as e:
+                logger.error("Error processing message: {}", e)
+                await self._publish_outbound_safe(
+                    OutboundMessage(
+                        channel=msg.channel,
+                        chat_id=msg.chat_id,
+                        content=f"Sorry, I encountered an error: {str(e)}",
+                    )
+                )
+
+    def _compact_sessions_when_idle(self) -> None:
+        """Fold append-only session files back to one header while no turn is running."""
+        compact = getattr(self.sessions, "compact_pending", None)
+        if compact is None:
+            return
+        try:
+            compact()
+        except Exception:
+            logger.exception("Session compaction failed")
 
     async def close_mcp(self) -> None:
         """Close MCP connections."""
@@ -375,16 +549,11 @@ class AgentLoop:
         logger.info("Agent loop stopping")
 
     def _get_consolidation_lock(self, session_key: str) -> asyncio.Lock:
-        lock = self._consolidation_locks.get(session_key)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._consolidation_locks[session_key] = lock
-        return lock
+        return self.consolidator.lock(session_key)
 
     def _prune_consolidation_lock(self, session_key: str, lock: asyncio.Lock) -> None:
         """Drop lock entry if no longer in use."""
-        if not lock.locked():
-            self._consolidation_locks.pop(session_key, None)
+        self.consolidator.release(session_key, lock)
 
     async def _process_message(
         self,
@@ -393,6 +562,20 @@ class AgentLoop:
         on_progress: Callable[..., Awaitable[None]] | None = None,
     ) -> OutboundMessage | None:
         """Process a single inbound message and return the response."""
+        key = session_key or msg.session_key
+        with tracing.span("agent.turn", session_key=key, channel=msg.channel) as span, cache_session(key):
+            response = await self._handle_message(msg, session_key, on_progress)
+            if response is not None and span.traceparent:
+                # The reply is sent after the turn ends; keep its delivery in this trace.
+                response.metadata = {**response.metadata, "_traceparent": span.traceparent}
+            return response
+
+    async def _handle_message(
+        self,
+        msg: InboundMessage,
+        session_key: str | None,
+        on_progress: Callable[..., Awaitable[None]] | None,
+    ) -> OutboundMessage | None:
         if msg.channel == "system":
             channel, chat_id = msg.chat_id.split(":", 1) if ":" in msg.chat_id else ("cli", msg.chat_id)
             logger.info("Processing system message from {}", msg.sender_id)
@@ -405,6 +588,7 @@ class AgentLoop:
                 current_message=msg.content,
                 channel=channel,
                 chat_id=chat_id,
+                recalled_memory=await self.context.recall_memory(history, msg.content),
             )
             final_content, _, all_msgs = await self._run_agent_loop(messages)
             self._save_turn(session, all_msgs, 1 + len(history), redact_user=True)
@@ -432,7 +616,9 @@ class AgentLoop:
                     if snapshot:
                         temp = Session(key=session.key)
                         temp.messages = list(snapshot)
-                        if not await self._consolidate_memory(temp, archive_all=True):
+                        with cache_session(None):
+                            archived = await self._consolidate_memory(temp, archive_all=True)
+                        if not archived:
                             return OutboundMessage(
                                 channel=msg.channel,
                                 chat_id=msg.chat_id,
@@ -468,24 +654,11 @@ class AgentLoop:
         last_consolidated = int(getattr(session, "last_consolidated", 0) or 0)
         unconsolidated = len(session.messages) - last_consolidated
         if unconsolidated >= self.memory_window and session.key not in self._consolidating:
-            self._consolidating.add(session.key)
-            lock = self._get_consolidation_lock(session.key)
-
             if hasattr(session, "last_consolidated"):
-                async def _consolidate_and_unlock():
-                    try:
-                        async with lock:
-                            await self._consolidate_memory(session)
-                    finally:
-                        self._consolidating.discard(session.key)
-                        self._prune_consolidation_lock(session.key, lock)
-                        _task = asyncio.current_task()
-                        if _task is not None:
-                            self._consolidation_tasks.discard(_task)
-
-                _task = asyncio.create_task(_consolidate_and_unlock())
-                self._consolidation_tasks.add(_task)
+                self.consolidator.submit(session)
             else:
+                self._consolidating.add(session.key)
+                lock = self._get_consolidation_lock(session.key)
                 try:
                     async with lock:
                         await self._consolidate_memory(session)
@@ -515,6 +688,16 @@ class AgentLoop:
             media=effective_media if effective_media else None,
             channel=msg.channel,
             chat_id=msg.chat_id,
+            recalled_memory=await self.context.recall_memory(history, msg.content),
+        )
+
+        progress = ProgressAggregator(
+            publish=self.bus.publish_outbound,
+            redact=self._redact_text,
+            channel=msg.channel,
+            chat_id=msg.chat_id,
+            metadata=msg.metadata,
+            interval_s=self.channels_config.progress_debounce_s if self.channels_config else 0,
         )
 
         async def _bus_progress(content: str, *, tool_hint: bool = False) -> None:
@@ -523,29 +706,37 @@ class AgentLoop:
                     return
                 if not tool_hint and not self.channels_config.send_progress:
                     return
-            meta = dict(msg.metadata or {})
-            meta["_progress"] = True
-            meta["_tool_hint"] = tool_hint
-            await self._publish_outbound_safe(
-                OutboundMessage(
-                    channel=msg.channel,
-                    chat_id=msg.chat_id,
-                    content=content,
-                    metadata=meta,
-                )
-            )
+            await progress.add(content, tool_hint=tool_hint)
 
         progress_callback = on_progress
         if progress_callback is None and self.channels_config:
             progress_callback = _bus_progress
 
-        final_content, _, all_msgs = await self._run_agent_loop(
-            initial_messages,
-            on_progress=progress_callback,
-        )
+        relays: list[StreamRelay] = []
+        new_stream = None
+        if self._should_stream(msg, on_progress):
+            def new_stream() -> StreamRelay:
+                relay = StreamRelay(
+                    publish=self.bus.publish_outbound,
+                    redact=self._redact_text,
+                    channel=msg.channel,
+                    chat_id=msg.chat_id,
+                    metadata=msg.metadata,
+                )
+                relays.append(relay)
+                return relay
+
+        try:
+            final_content, _, all_msgs = await self._run_agent_loop(
+                initial_messages,
+                on_progress=progress_callback,
+                new_stream=new_stream,
+            )
+        finally:
+            progress.finish()
 
         if message_tool := self.tools.get("message"):
-            if isinstance(message_tool, MessageTool) and message_tool._sent_in_turn:
+            if isinstance(message_tool, MessageTool) and message_tool.sent_in_turn:
                 if final_content is None or not final_content.strip():
                     self._save_turn(session, all_msgs, 1 + len(history))
                     self.sessions.save(session)
@@ -561,13 +752,24 @@ class AgentLoop:
         self._save_turn(session, all_msgs, 1 + len(history))
         self.sessions.save(session)
 
+        metadata = dict(msg.metadata or {})
+        if relays:
+            metadata.update(relays[-1].reply_metadata())
         return OutboundMessage(
             channel=msg.channel,
             chat_id=msg.chat_id,
             content=final_content,
-            metadata=msg.metadata or {},
+            metadata=metadata,
         )
 
+    def _should_stream(self, msg: InboundMessage, on_progress: Callable[..., Awaitable[None]] | None) -> bool:
+        """Stream replies only for bus-driven chat channels with streaming enabled."""
+        if on_progress is not None or msg.channel == "cli":
+            return False
+        if not (self.channels_config and self.channels_config.stream_replies):
+            return False
+        return self.provider.supports_streaming
+
     def _save_turn(
         self,
         session: Session,
@@ -581,6 +783,8 @@ class AgentLoop:
 
         for msg in messages[skip:]:
             entry = {k: v for k, v in msg.items() if k != "reasoning_content"}
+            if entry.get("role") == "user":
+                entry["content"] = self.context.strip_runtime_context(entry.get("content"))
             content = entry.get("content")
             if isinstance(content, str):
                 if entry.get("role") == "tool" and len(content) > self._TOOL_RESULT_MAX_CHARS:
@@ -594,13 +798,17 @@ class AgentLoop:
 
     async def _consolidate_memory(self, session: Session, archive_all: bool = False) -> bool:
         """Delegate to MemoryStore.consolidate(). Returns True on success."""
-        return await MemoryStore(self.workspace).consolidate(
+        start = time.perf_counter()
+        ok = await self.context.memory.consolidate(
             session,
             self.provider,
             self.model,
             archive_all=archive_all,
             memory_window=self.memory_window,
+            chunk_chars=self.consolidation_config.chunk_chars,
         )
+        metrics.CONSOLIDATION_SECONDS.observe(time.perf_counter() - start, "ok" if ok else "failed")
+        return ok
 
     async def process_direct(
         self,
@@ -613,5 +821,8 @@ class AgentLoop:
         """Process a message directly (for CLI or cron usage)."""
         await self._connect_mcp()
         msg = InboundMessage(channel=channel, sender_id="user", chat_id=chat_id, content=content)
-        response = await self._process_message(msg, session_key=session_key, on_progress=on_progress)
+        key = session_key or msg.session_key
+        self._session_pending[key] = self._session_pending.get(key, 0) + 1
+        async with self._session_turn(key):
+            response = await self._process_message(msg, session_key=session_key, on_progress=on_progress)
         return self._redact_text(response.content if response else "")
@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import json
+import re
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
+from nanobot.utils import tracing
 from nanobot.utils.helpers import ensure_dir
 
 if TYPE_CHECKING:
@@ -27,23 +30,210 @@ _SAVE_MEMORY_TOOL = [
                     "history_entry": {
                         "type": "string",
                         "description": "A paragraph (2-5 sentences) summarizing key events/decisions/topics. "
-                        "Start with [YYYY-MM-DD HH:MM]. Include detail useful for grep search.",
+                        "Start with [YYYY-MM-DD HH:MM]. Include detail useful for keyword search.",
                     },
-                    "memory_update": {
-                        "type": "string",
-                        "description": "Full updated long-term memory as markdown. Include all existing "
-                        "facts plus new ones. Return unchanged if nothing new.",
+                    "memory_ops": {
+                        "type": "array",
+                        "description": "Changes to long-term memory: only new, corrected or obsolete facts. "
+                        "Use an empty list if nothing changed.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "op": {"type": "string", "enum": ["add", "update", "delete"]},
+                                "id": {"type": "string", "description": "Fact ID such as F3 (update, delete)."},
+                                "section": {
+                                    "type": "string",
+                                    "description": "Section title for add, e.g. Preferences. Created if missing.",
+                                },
+                                "text": {"type": "string", "description": "One concise fact (add, update)."},
+                            },
+                            "required": ["op"],
+                        },
                     },
                 },
-                "required": ["history_entry", "memory_update"],
+                "required": ["history_entry", "memory_ops"],
             },
         },
     }
 ]
 
+_BULLET_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s")
+_PLACEHOLDER_RE = re.compile(r"^\(.*\)$")
+_FENCE_RE = re.compile(r"^\s*(?:(?:[-*+]|\d+[.)])\s+)?(`{3,}|~{3,})")
+
+
+@dataclass
+class MemorySection:
+    """A ``## `` section of MEMORY.md; each item is one fact (a bullet or a paragraph)."""
+
+    title: str
+    items: list[str] = field(default_factory=list)
+
+
+class MemoryDocument:
+    """
+    MEMORY.md parsed into sections of items.
+
+    Items get IDs (``F1``, ``F2``, ...) in document order. IDs are only
+    shown to the consolidation model and are not stored, so the file stays
+    plain markdown that people and the agent can edit by hand.
+    """
+
+    def __init__(self, title: str = "", sections: list[MemorySection] | None = None, footer: str = ""):
+        self.title = title
+        self.sections = sections or []
+        self.footer = footer
+
+    @classmethod
+    def parse(cls, text: str) -> MemoryDocument:
+        lines = text.splitlines()
+        title = ""
+        while lines and not lines[0].strip():
+            lines.pop(0)
+        if lines and lines[0].startswith("# "):
+            title = lines.pop(0)
+
+        intro = MemorySection("")
+        sections = [intro]
+        current, after_blank = intro, True
+        fence = ""  # Opening marker of the code block being read, if any
+        for line in lines:
+            if fence:
+                # Everything up to the closing fence, blank lines included, is one item.
+                current.items[-1] += "\n" + line
+                marker = _FENCE_RE.match(line)
+                if marker and marker.group(1)[0] == fence[0] and len(marker.group(1)) >= len(fence):
+                    fence = ""
+                continue
+            if marker := _FENCE_RE.match(line):
+                fence = marker.group(1)
+            if line.startswith("## "):
+                current, after_blank = MemorySection(line[3:].strip()), True
+                sections.append(current)
+            elif not line.strip():
+                after_blank = True
+            elif current.items and not after_blank and (not _BULLET_RE.match(line) or line[:1].isspace()):
+                current.items[-1] += "\n" + line  # Continuation of the previous item
+            else:
+                current.items.append(line)
+                after_blank = False
+
+        # A trailing horizontal rule and what follows it is a footer, not a fact.
+        footer = ""
+        last = sections[-1].items
+        if "---" in last:
+            cut = len(last) - 1 - last[::-1].index("---")
+            footer = "\n\n".join(last[cut:])
+            del last[cut:]
+        if not intro.items and len(sections) > 1:
+            sections.remove(intro)
+        return cls(title, sections, footer)
+
+    def render(self) -> str:
+        blocks = [self.title] if self.title else []
+        for section in self.sections:
+            body = ""
+            for i, item in enumerate(section.items):
+                if i:
+                    tight = _BULLET_RE.match(item) and _BULLET_RE.match(section.items[i - 1])
+                    body += "\n" if tight else "\n\n"
+                body += item
+            if section.title:
+                blocks.append(f"## {section.title}")
+            if body:
+                blocks.append(body)
+        if self.footer:
+            blocks.append(self.footer)
+        return "\n\n".join(blocks) + "\n" if blocks else ""
+
+    def _items(self) -> list[tuple[str, MemorySection, int]]:
+        ids = []
+        for section in self.sections:
+            for i in range(len(section.items)):
+                ids.append((f"F{len(ids) + 1}", section, i))
+        return ids
+
+    def numbered(self) -> str:
+        """Sections with fact IDs, for the consolidation prompt."""
+        out, n = [], 0
+        for section in self.sections:
+            if section.title:
+                out.append(f"## {section.title}")
+            for item in section.items:
+                n += 1
+                out.append(f"[F{n}] {item}")
+        return "\n".join(out)
+
+    def apply(self, ops: list[Any]) -> int:
+        """Apply add/update/delete operations. Returns how many changed the document."""
+        by_id = {fact_id: (section, i) for fact_id, section, i in self._items()}
+        replaced: dict[tuple[int, int], str | None] = {}
+        added: list[tuple[str, str]] = []
+        for op in ops:
+            if not isinstance(op, dict):
+                continue
+            kind, text = op.get("op"), _as_item(op.get("text"))
+            if kind == "add" and text:
+                added.append((str(op.get("section") or "").strip(), text))
+            elif kind in ("update", "delete"):
+                target = by_id.get(str(op.get("id") or "").strip().strip("[]").upper())
+                if target is None:
+                    logger.warning("Memory consolidation: unknown fact ID in {}", op)
+                elif kind == "delete" or text:
+                    section, i = target
+                    replaced[(id(section), i)] = text if kind == "update" else None
+
+        changed = 0
+        for section in self.sections:
+            items = []
+            for i, item in enumerate(section.items):
+                new = replaced.get((id(section), i), item)
+                changed += new != item
+                if new is not None:
+                    items.append(new)
+            section.items = items
+
+        for title, text in added:
+            section = self._section(title)
+            if text in section.items:
+                continue
+            if len(section.items) == 1 and _PLACEHOLDER_RE.match(section.items[0]):
+                section.items.clear()  # Template hint such as "(User preferences learned over time)"
+            section.items.append(text)
+            changed += 1
+        return changed
+
+    def _section(self, title: str) -> MemorySection:
+        for section in self.sections:
+            if section.title.lower() == title.lower():
+                return section
+        section = MemorySection(title)
+        if title:
+            self.sections.append(section)
+        else:
+            self.sections.insert(0, section)
+        return section
+
+
+def _as_item(text: Any) -> str:
+    """Normalize a fact from the model into a markdown bullet."""
+    if text is None:
+        return ""
+    if not isinstance(text, str):
+        text = json.dumps(text, ensure_ascii=False)
+    if any(_FENCE_RE.match(line) for line in text.splitlines()):
+        # Code blocks are kept verbatim: blank lines and indentation are content.
+        return "\n".join(line.rstrip() for line in text.strip().splitlines())
+    lines = [line.rstrip() for line in text.strip().splitlines() if line.strip()]
+    if not lines:
+        return ""
+    if not _BULLET_RE.match(lines[0]):
+        lines[0] = f"- {lines[0]}"
+    return "\n".join([lines[0], *(f"  {line.lstrip()}" for line in lines[1:])])
+
 
 class MemoryStore:
-    """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (grep-searchable log)."""
+    """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (searchable log, see MemoryIndex)."""
 
     def __init__(self, workspace: Path):
         self.memory_dir = ensure_dir(workspace / "memory")
@@ -74,38 +264,90 @@ class MemoryStore:
         *,
         archive_all: bool = False,
         memory_window: int = 50,
+        chunk_chars: int = 40_000,
     ) -> bool:
         """Consolidate old messages into MEMORY.md + HISTORY.md via LLM tool call.
 
-        Returns True on success (including no-op), False on failure.
+        Backlogs longer than ``chunk_chars`` are summarized one chunk per call,
+        advancing ``last_consolidated`` after each, so a failure resumes where
+        it stopped. Returns True on success (including no-op), False on failure.
         """
+        with tracing.span("memory.consolidate", session_key=session.key, archive_all=archive_all) as span:
+            ok = await self._consolidate(session, provider, model, archive_all, memory_window, chunk_chars)
+            span.set(ok=ok)
+            return ok
+
+    async def _consolidate(
+        self,
+        session: Session,
+        provider: LLMProvider,
+        model: str,
+        archive_all: bool,
+        memory_window: int,
+        chunk_chars: int,
+    ) -> bool:
         if archive_all:
-            old_messages = session.messages
-            keep_count = 0
+            start, end = 0, len(session.messages)
             logger.info("Memory consolidation (archive_all): {} messages", len(session.messages))
         else:
             keep_count = memory_window // 2
             if len(session.messages) <= keep_count:
                 return True
-            if len(session.messages) - session.last_consolidated <= 0:
-                return True
-            old_messages = session.messages[session.last_consolidated:-keep_count]
-            if not old_messages:
+            start, end = session.last_consolidated, len(session.messages) - keep_count
+            if end <= start:
                 return True
-            logger.info("Memory consolidation: {} to consolidate, {} keep", len(old_messages), keep_count)
+            logger.info("Memory consolidation: {} to consolidate, {} keep", end - start, keep_count)
 
-        lines = []
-        for m in old_messages:
-            if not m.get("content"):
-                continue
-            tools = f" [tools: {', '.join(m['tools_used'])}]" if m.get("tools_used") else ""
-            lines.append(f"[{m.get('timestamp', '?')[:16]}] {m['role'].upper()}{tools}: {m['content']}")
+        chunks = self._chunk_lines(session.messages[start:end], chunk_chars)
+        if len(chunks) > 1:
+            logger.info("Memory consolidation: backlog split into {} chunks", len(chunks))
+        for lines, count in chunks:
+            if lines and not await self._save_chunk(lines, provider, model):
+                return False
+            start += count
+            if not archive_all:
+                session.last_consolidated = start
+
+        if archive_all:
+            session.last_consolidated = 0
+        logger.info("Memory consolidation done: {} messages, last_consolidated={}", len(session.messages), session.last_consolidated)
+        return True
+
+    @staticmethod
+    def _chunk_lines(messages: list[dict], max_chars: int) -> list[tuple[list[str], int]]:
+        """Format messages as transcript lines grouped into chunks of at most ``max_chars``.
 
+        Each chunk is paired with the number of messages it covers.
+        """
+        chunks: list[tuple[list[str], int]] = []
+        lines: list[str] = []
+        size = count = 0
+        for m in messages:
+            if m.get("content"):
+                tools = f" [tools: {', '.join(m['tools_used'])}]" if m.get("tools_used") else ""
+                line = f"[{m.get('timestamp', '?')[:16]}] {m['role'].upper()}{tools}: {m['content']}"
+                if max_chars > 0:
+                    if len(line) > max_chars:
+                        line = line[:max_chars] + " ...(truncated)"
+                    if lines and size + len(line) + 1 > max_chars:
+                        chunks.append((lines, count))
+                        lines, size, count = [], 0, 0
+                lines.append(line)
+                size += len(line) + 1
+            count += 1
+        if count:
+            chunks.append((lines, count))
+        return chunks
+
+    async def _save_chunk(self, lines: list[str], provider: LLMProvider, model: str) -> bool:
+        """Summarize one chunk of transcript and save the result."""
         current_memory = self.read_long_term()
+        document = MemoryDocument.parse(current_memory)
         prompt = f"""Process this conversation and call the save_memory tool with your consolidation.
+Record new, corrected or obsolete facts as memory_ops against the fact IDs below.
 
 ## Current Long-term Memory
-{current_memory or "(empty)"}
+{document.numbered() or "(empty)"}
 
 ## Conversation to Process
 {chr(10).join(lines)}"""
@@ -136,14 +378,18 @@ class MemoryStore:
                 if not isinstance(entry, str):
                     entry = json.dumps(entry, ensure_ascii=False)
                 self.append_history(entry)
-            if update := args.get("memory_update"):
+            ops = args.get("memory_ops")
+            if isinstance(ops, str):
+                ops = json.loads(ops)
+            if isinstance(ops, list):
+                if document.apply(ops):
+                    self.write_long_term(document.render())
+            elif update := args.get("memory_update"):
+                # Older prompts returned the whole document; still accept it.
                 if not isinstance(update, str):
                     update = json.dumps(update, ensure_ascii=False)
                 if update != current_memory:
                     self.write_long_term(update)
-
-            session.last_consolidated = 0 if archive_all else len(session.messages) - keep_count
-            logger.info("Memory consolidation done: {} messages, last_consolidated={}", len(session.messages), session.last_consolidated)
             return True
         except Exception:
             logger.exception("Memory consolidation failed")
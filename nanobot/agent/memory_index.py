@@ -0,0 +1,259 @@
+"""Full-text index over HISTORY.md and session logs (SQLite FTS5)."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.utils.helpers import ensure_dir
+
+_HISTORY_TS = re.compile(r"^\[(\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2})?)")
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_FINGERPRINT_BYTES = 256  # Tail of the indexed prefix used to detect rewrites
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    ref TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    session TEXT NOT NULL DEFAULT '',
+    role TEXT NOT NULL DEFAULT '',
+    ts TEXT NOT NULL DEFAULT '',
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_ts ON entries(ts);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    content, content='entries', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+"""
+
+
+@dataclass(slots=True)
+class MemoryHit:
+    """One ranked search result."""
+
+    source: str  # "history" or "session"
+    session: str
+    role: str
+    ts: str
+    snippet: str
+    score: float
+
+
+def _fingerprint(data: bytes) -> str:
+    return hashlib.sha1(data[-_FINGERPRINT_BYTES:]).hexdigest()
+
+
+def build_match_query(query: str, any_term: bool = False) -> str:
+    """Turn free text into an FTS5 query of quoted prefix terms, all required unless any_term."""
+    terms = [f'"{t}"*' for t in _TOKEN.findall(query)]
+    return (" OR " if any_term else " ").join(terms)
+
+
+class MemoryIndex:
+    """
+    Incrementally maintained inverted index for memory recall.
+
+    Indexes HISTORY.md paragraphs and the user/assistant messages of every
+    session JSONL file. Both files only grow, so ``refresh()`` reads just the
+    bytes appended since the last call. A file that shrank or whose indexed
+    prefix changed is re-read from the start: HISTORY.md entries are replaced,
+    while session messages are keyed on session, timestamp and role, so
+    messages cleared from a live session (``/new``) stay searchable.
+
+    The connection may be used from any thread, but by one thread at a time.
+    """
+
+    def __init__(self, workspace: Path, db_path: Path | None = None):
+        self.workspace = workspace
+        self.history_file = workspace / "memory" / "HISTORY.md"
+        self.sessions_dir = workspace / "sessions"
+        self.db_path = db_path or ensure_dir(workspace / ".nanobot" / "memory") / "index.sqlite3"
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # Derived data: rebuildable from the files
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def refresh(self) -> int:
+        """Index whatever was appended since the last refresh. Returns new entry count."""
+        added = 0
+        with self._db:
+            if self.history_file.exists():
+                added += self._index_file(self.history_file, self._history_entries)
+            if self.sessions_dir.is_dir():
+                for path in sorted(self.sessions_dir.glob("*.jsonl")):
+                    added += self._index_file(path, self._session_entries)
+        if added:
+            logger.debug("Memory index: {} new entries", added)
+        return added
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int = 8,
+        since: str | None = None,
+        until: str | None = None,
+        session: str | None = None,
+        source: str | None = None,
+    ) -> list[MemoryHit]:
+        """
+        Return entries matching query, best first (BM25).
+
+        Entries containing every word rank first; when there are fewer than
+        ``limit`` of those, entries matching any word fill the remaining slots.
+
+        Args:
+            query: Free text; each word matches as a prefix.
+            limit: Maximum number of hits.
+            since: Inclusive lower bound on the entry time (ISO date or datetime).
+            until: Inclusive upper bound on the entry time (ISO date or datetime).
+            session: Only messages from sessions whose key contains this text.
+            source: "history" or "session" to search one kind of entry.
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+        limit = max(1, limit)
+        filters = (since, until, session, source)
+
+        rows = self._query(match, limit, *filters)
+        if len(rows) < limit and " " in match:
+            seen = {row[0] for row in rows}
+            extra = self._query(build_match_query(query, any_term=True), limit + len(rows), *filters)
+            rows += [row for row in extra if row[0] not in seen][:limit - len(rows)]
+        return [MemoryHit(*row[1:]) for row in rows]
+
+    def _query(
+        self,
+        match: str,
+        limit: int,
+        since: str | None,
+        until: str | None,
+        session: str | None,
+        source: str | None,
+    ) -> list[tuple]:
+        sql = [
+            "SELECT e.id, e.source, e.session, e.role, e.ts,"
+            " snippet(entries_fts, 0, '**', '**', '…', 24), bm25(entries_fts)"
+            " FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid"
+            " WHERE entries_fts MATCH ?"
+        ]
+        params: list[object] = [match]
+        if since:
+            sql.append("AND e.ts >= ?")
+            params.append(since.replace("T", " "))
+        if until:
+            sql.append("AND e.ts <= ?")
+            params.append(until.replace("T", " ") + "\uffff")  # A date-only bound includes the whole day
+        if session:
+            sql.append("AND e.session LIKE ?")
+            params.append(f"%{session}%")
+        if source:
+            sql.append("AND e.source = ?")
+            params.append(source)
+        sql.append("ORDER BY bm25(entries_fts) LIMIT ?")
+        params.append(limit)
+        return self._db.execute(" ".join(sql), params).fetchall()
+
+    def _index_file(self, path: Path, parse) -> int:
+        key = str(path.relative_to(self.workspace))
+        row = self._db.execute("SELECT offset, fingerprint FROM files WHERE path = ?", (key,)).fetchone()
+        offset, fingerprint = row if row else (0, "")
+
+        try:
+            size = path.stat().st_size
+            if size == offset:
+                return 0
+            with open(path, "rb") as f:
+                if offset and size > offset:
+                    f.seek(max(0, offset - _FINGERPRINT_BYTES))
+                    if _fingerprint(f.read(min(offset, _FINGERPRINT_BYTES))) != fingerprint:
+                        offset = 0
+                else:
+                    offset = 0  # Shrank: rewritten or truncated
+                f.seek(offset)
+                data = f.read()
+        except OSError as e:
+            logger.warning("Memory index: cannot read {}: {}", path, e)
+            return 0
+
+        # Only index complete lines; a partial tail is picked up next time.
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return 0
+        if offset == 0 and path == self.history_file:
+            self._db.execute(
+                "INSERT INTO entries_fts (entries_fts, rowid, content)"
+                " SELECT 'delete', id, content FROM entries WHERE source = 'history'"
+            )
+            self._db.execute("DELETE FROM entries WHERE source = 'history'")
+
+        added = 0
+        for ref, source, session, role, ts, content in parse(path, data[:end].decode("utf-8", "replace"), offset):
+            cur = self._db.execute(
+                "INSERT OR IGNORE INTO entries (ref, source, session, role, ts, content) VALUES (?, ?, ?, ?, ?, ?)",
+                (ref, source, session, role, ts, content),
+            )
+            if cur.rowcount:
+                self._db.execute("INSERT INTO entries_fts (rowid, content) VALUES (?, ?)", (cur.lastrowid, content))
+                added += 1
+
+        new_offset = offset + end
+        with open(path, "rb") as f:
+            f.seek(max(0, new_offset - _FINGERPRINT_BYTES))
+            tail = f.read(min(new_offset, _FINGERPRINT_BYTES))
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (path, offset, fingerprint) VALUES (?, ?, ?)",
+            (key, new_offset, _fingerprint(tail)),
+        )
+        return added
+
+    @staticmethod
+    def _history_entries(path: Path, text: str, offset: int):
+        pos = offset
+        for para in re.split(r"(\n\s*\n)", text):
+            start = pos
+            pos += len(para.encode("utf-8"))
+            entry = para.strip()
+            if not entry:
+                continue
+            m = _HISTORY_TS.match(entry)
+            ts = m.group(1).replace("T", " ") if m else ""
+            yield f"history:{start}", "history", "", "", ts, entry
+
+    @staticmethod
+    def _session_entries(path: Path, text: str, offset: int):
+        session = path.stem.replace("_", ":", 1)
+        try:
+            with open(path, encoding="utf-8") as f:
+                header = json.loads(f.readline())  # SessionManager always writes the metadata header first
+            session = header.get("key") or session
+        except (OSError, ValueError, AttributeError):
+            pass
+
+        for line in text.splitlines():
+            try:
+                data = json.loads(line)
+            except ValueError:
+                continue
+            role, content = data.get("role"), data.get("content")
+            if role not in ("user", "assistant") or not isinstance(content, str) or not content.strip():
+                continue
+            ts = str(data.get("timestamp", ""))[:19].replace("T", " ")
+            digest = hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+            yield f"session:{path.stem}:{ts}:{role}:{digest}", "session", session, role, ts, content
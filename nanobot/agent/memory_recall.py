@@ -0,0 +1,219 @@
+"""Relevance-selected long-term memory for the prompt."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from nanobot.agent.budget import estimate_tokens
+from nanobot.agent.memory import MemoryDocument, MemoryStore
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import MemoryRecallConfig
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+_TERM_RE = re.compile(rf"[{_CJK}]|(?:(?![{_CJK}])\w)+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can do does for from had has have how i if in into is it its me my "
+    "no not of on or our so that the their them then there these they this to was we were what when "
+    "where which who why will with you your".split()
+)
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word terms without common English stopwords; CJK text is split into single characters."""
+    return [term for term in _TERM_RE.findall(text.lower()) if term not in _STOPWORDS]
+
+
+@dataclass
+class _Section:
+    title: str
+    items: list[str]
+    pinned: bool
+    tokens: int = 0
+    terms: Counter = field(default_factory=Counter)
+    item_terms: list[Counter] = field(default_factory=list)
+
+    def render(self, items: list[str] | None = None) -> str:
+        body = "\n".join(self.items if items is None else items)
+        text = f"## {self.title}\n{body}" if self.title else body
+        return re.sub(r"\n\s*\n", "\n", text)
+
+
+@dataclass
+class _Snapshot:
+    signature: Any
+    text: str
+    sections: list[_Section]
+    total_tokens: int
+    avg_len: float
+    df: Counter
+
+
+class MemoryRecall:
+    """
+    Choose which MEMORY.md sections go into a request.
+
+    While MEMORY.md fits in ``max_tokens`` it is injected whole into the
+    system prompt, which keeps the prompt prefix stable for provider caches.
+    Past that, only pinned sections stay in the system prompt and up to
+    ``top_k`` sections that best match the current message and recent
+    history are recalled per turn within the remaining budget. Sections are
+    ranked with BM25, or by embedding similarity when ``embedding_model`` is
+    set (BM25 is used whenever the embedding call fails).
+    """
+
+    def __init__(self, store: MemoryStore, config: MemoryRecallConfig | None = None):
+        from nanobot.config.schema import MemoryRecallConfig
+
+        self.store = store
+        self.config = config or MemoryRecallConfig()
+        self._pinned = {title.strip().lower() for title in self.config.pinned}
+        self._snapshot: _Snapshot | None = None
+        self._vectors: dict[str, list[float]] = {}  # Section text hash -> embedding
+
+    def _load(self) -> _Snapshot:
+        try:
+            st = self.store.memory_file.stat()
+            signature: Any = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            signature = None
+        if self._snapshot is not None and self._snapshot.signature == signature:
+            return self._snapshot
+
+        text = self.store.read_long_term() if signature else ""
+        sections = []
+        for section in MemoryDocument.parse(text).sections:
+            if not section.items:
+                continue
+            entry = _Section(section.title, list(section.items), section.title.lower() in self._pinned)
+            entry.item_terms = [Counter(tokenize(item)) for item in entry.items]
+            entry.terms = Counter(tokenize(section.title))
+            for terms in entry.item_terms:
+                entry.terms.update(terms)
+            entry.tokens = estimate_tokens(entry.render())
+            sections.append(entry)
+        df: Counter = Counter()
+        for section in sections:
+            df.update(section.terms.keys())
+        lengths = [sum(s.terms.values()) for s in sections]
+        self._snapshot = _Snapshot(
+            signature=signature,
+            text=text,
+            sections=sections,
+            total_tokens=estimate_tokens(text),
+            avg_len=(sum(lengths) / len(lengths)) if lengths else 0.0,
+            df=df,
+        )
+        return self._snapshot
+
+    def _selective(self, snap: _Snapshot) -> bool:
+        return self.config.enabled and snap.total_tokens > self.config.max_tokens
+
+    def stable_context(self) -> str:
+        """Memory for the system prompt: all of it, or only pinned sections once it outgrows the budget."""
+        snap = self._load()
+        if not self._selective(snap):
+            return self.store.get_memory_context()
+        pinned = "\n\n".join(s.render() for s in snap.sections if s.pinned)
+        note = (
+            "Only pinned sections are shown here. Sections relevant to the current message are "
+            "recalled in the runtime context; read MEMORY.md for anything else."
+        )
+        return f"## Long-term Memory\n{pinned}\n\n{note}" if pinned else f"## Long-term Memory\n{note}"
+
+    def select(self, query: str, query_vector: list[float] | None = None) -> str:
+        """Recalled sections for ``query``, or "" while the whole memory is in the system prompt."""
+        snap = self._load()
+        if not self._selective(snap):
+            return ""
+        query_terms = Counter(tokenize(query))
+        candidates = [s for s in snap.sections if not s.pinned]
+        if query_vector is not None:
+            scored = [(self._cosine(query_vector, self._vectors.get(_digest(s.render()))), s) for s in candidates]
+        else:
+            scored = [(self._bm25(snap, s.terms, query_terms), s) for s in candidates]
+        ranked = [s for score, s in sorted(scored, key=lambda x: x[0], reverse=True) if score > 0]
+
+        budget = self.config.max_tokens - sum(s.tokens for s in snap.sections if s.pinned)
+        chosen: dict[int, str] = {}
+        for section in ranked[: self.config.top_k]:
+            if budget <= 0:
+                break
+            if section.tokens <= budget:
+                chosen[id(section)] = section.render()
+                budget -= section.tokens
+                continue
+            # Too large to include whole: keep its best-matching items that fit.
+            order = sorted(
+                range(len(section.items)),
+                key=lambda i: self._bm25(snap, section.item_terms[i], query_terms),
+                reverse=True,
+            )
+            keep: list[int] = []
+            for i in order:
+                cost = estimate_tokens(section.items[i]) + 1
+                if cost <= budget:
+                    keep.append(i)
+                    budget -= cost
+            if keep:
+                chosen[id(section)] = section.render([section.items[i] for i in sorted(keep)])
+        return "\n".join(chosen[id(s)] for s in snap.sections if id(s) in chosen)
+
+    async def recall(self, query: str) -> str:
+        """Like ``select``, ranking by embedding similarity when an embedding model is configured."""
+        snap = self._load()
+        if not self.config.embedding_model or not self._selective(snap):
+            return self.select(query)
+        try:
+            return self.select(query, await self._embed_query(snap, query))
+        except Exception as e:
+            logger.warning("Memory recall: embedding failed, using BM25: {}", e)
+            return self.select(query)
+
+    async def _embed_query(self, snap: _Snapshot, query: str) -> list[float]:
+        from litellm import aembedding
+
+        texts = {_digest(s.render()): s.render() for s in snap.sections if not s.pinned}
+        missing = [key for key in texts if key not in self._vectors]
+        inputs = [texts[key] for key in missing] + [query or " "]
+        response = await aembedding(model=self.config.embedding_model, input=inputs)
+        vectors = [item["embedding"] for item in response.data]
+        self._vectors = {key: self._vectors.get(key) for key in texts if key in self._vectors}
+        self._vectors.update(zip(missing, vectors))
+        return vectors[-1]
+
+    @staticmethod
+    def _bm25(snap: _Snapshot, terms: Counter, query: Counter) -> float:
+        n = len(snap.sections)
+        length = sum(terms.values())
+        score = 0.0
+        for term, weight in query.items():
+            tf = terms.get(term, 0)
+            if not tf:
+                continue
+            df = snap.df.get(term, 0)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            norm = _K1 * (1 - _B + _B * length / snap.avg_len) if snap.avg_len else _K1
+            score += weight * idf * tf * (_K1 + 1) / (tf + norm)
+        return score
+
+    @staticmethod
+    def _cosine(a: list[float], b: list[float] | None) -> float:
+        if not b:
+            return 0.0
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
@@ -1,6 +1,7 @@
 """Runtime helpers for agent loop execution."""
 
 from nanobot.agent.runtime.outbound_policy import OutboundPolicy
+from nanobot.agent.runtime.stream_relay import StreamRelay
 
-__all__ = ["OutboundPolicy"]
+__all__ = ["OutboundPolicy", "StreamRelay"]
 
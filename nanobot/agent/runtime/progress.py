@@ -0,0 +1,91 @@
+"""Merge a turn's progress updates into fewer outbound messages."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from nanobot.bus.events import OutboundMessage
+
+
+class ProgressAggregator:
+    """
+    Debounce one turn's progress and tool-hint updates for a chat.
+
+    The first update goes out at once; later ones arriving within
+    ``interval_s`` of the last send are merged and sent together when the
+    window closes. Every message carries ``_status_id`` and the status so far
+    in ``_status_text``, so channels that can edit messages keep rewriting a
+    single status message instead of posting new ones. Updates still pending
+    when the turn finishes are dropped: the reply supersedes them.
+    """
+
+    def __init__(
+        self,
+        *,
+        publish: Callable[[OutboundMessage], Awaitable[None]],
+        redact: Callable[[str | None], str],
+        channel: str,
+        chat_id: str,
+        metadata: dict[str, Any] | None = None,
+        interval_s: float = 2.0,
+        max_lines: int = 20,
+    ):
+        self.status_id = "status-" + uuid.uuid4().hex[:12]
+        self._publish = publish
+        self._redact = redact
+        self._channel = channel
+        self._chat_id = chat_id
+        self._metadata = dict(metadata or {})
+        self._interval_s = interval_s
+        self._max_lines = max_lines
+        self._lines: list[str] = []
+        self._pending: list[tuple[str, bool]] = []
+        self._last_emit: float | None = None
+        self._timer: asyncio.Task | None = None
+
+    async def add(self, content: str, *, tool_hint: bool = False) -> None:
+        """Queue an update, sending it now if the debounce window allows."""
+        content = self._redact((content or "").strip())
+        if not content:
+            return
+        self._pending.append((content, tool_hint))
+        now = time.monotonic()
+        if self._interval_s <= 0 or self._last_emit is None or now - self._last_emit >= self._interval_s:
+            await self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after(self._interval_s - (now - self._last_emit)))
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self._lines = (self._lines + [content for content, _ in pending])[-self._max_lines:]
+        meta = dict(self._metadata)
+        meta["_progress"] = True
+        meta["_tool_hint"] = all(hint for _, hint in pending)
+        meta["_status_id"] = self.status_id
+        meta["_status_text"] = "\n".join(self._lines)
+        self._last_emit = time.monotonic()
+        await self._publish(
+            OutboundMessage(
+                channel=self._channel,
+                chat_id=self._chat_id,
+                content="\n".join(content for content, _ in pending),
+                metadata=meta,
+            )
+        )
+
+    def finish(self) -> None:
+        """Stop the debounce timer and drop updates that were not sent."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending.clear()
@@ -0,0 +1,86 @@
+"""Relay streamed LLM text to channels that can edit messages in place."""
+
+from __future__ import annotations
+
+import re
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from nanobot.bus.events import OutboundMessage
+
+_THINK_BLOCK_RE = re.compile(r"<think>[\s\S]*?(?:</think>|$)")
+_TRAILING_WORD_RE = re.compile(r"\S*$")
+
+
+class StreamRelay:
+    """
+    Turn provider text deltas into throttled, redacted outbound updates.
+
+    One relay covers one assistant message. Updates carry ``_stream_id`` and
+    ``_streaming`` metadata so edit-capable channels keep rewriting a single
+    platform message; the final reply reuses the same ``_stream_id`` to settle
+    it. Partial text is only released up to the last whitespace, so a token
+    that is still being generated is never shown half-formed, where redaction
+    could miss it.
+    """
+
+    def __init__(
+        self,
+        *,
+        publish: Callable[[OutboundMessage], Awaitable[None]],
+        redact: Callable[[str | None], str],
+        channel: str,
+        chat_id: str,
+        metadata: dict[str, Any] | None = None,
+        interval_s: float = 1.0,
+    ):
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.started = False
+        self.finished = False
+        self._publish = publish
+        self._redact = redact
+        self._channel = channel
+        self._chat_id = chat_id
+        self._metadata = dict(metadata or {})
+        self._interval_s = interval_s
+        self._text = ""
+        self._sent = ""
+        self._last_emit: float | None = None
+
+    async def feed(self, delta: str) -> None:
+        """Append newly generated text and publish an update when due."""
+        self._text += delta
+        now = time.monotonic()
+        if self._last_emit is not None and now - self._last_emit < self._interval_s:
+            return
+        visible = _THINK_BLOCK_RE.sub("", self._text)
+        visible = visible[:_TRAILING_WORD_RE.search(visible).start()]
+        await self._emit(visible, streaming=True)
+
+    async def finish(self, text: str | None) -> None:
+        """Settle a started stream with its complete text (no reply follows)."""
+        if self.started and not self.finished:
+            await self._emit(text or "", streaming=False)
+            self.finished = True
+
+    def reply_metadata(self) -> dict[str, Any]:
+        """Metadata that lets the final reply replace this stream's message."""
+        if self.started and not self.finished:
+            self.finished = True
+            return {"_stream_id": self.stream_id}
+        return {}
+
+    async def _emit(self, text: str, *, streaming: bool) -> None:
+        text = self._redact(text.strip())
+        if not text or (streaming and text == self._sent):
+            return
+        meta = dict(self._metadata)
+        meta["_stream_id"] = self.stream_id
+        meta["_streaming"] = streaming
+        await self._publish(
+            OutboundMessage(channel=self._channel, chat_id=self._chat_id, content=text, metadata=meta)
+        )
+        self._sent = text
+        self.started = True
+        self._last_emit = time.monotonic()
@@ -5,11 +5,33 @@ import os
 import re
 import shutil
 import subprocess
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
+from loguru import logger
+
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
+_INDEX_VERSION = 1
+
+
+@dataclass
+class SkillEntry:
+    """Indexed facts about one SKILL.md, valid while its mtime and size are unchanged."""
+
+    name: str
+    path: str
+    source: str
+    mtime_ns: int
+    size: int
+    frontmatter: dict[str, str] | None = None
+    meta: dict = field(default_factory=dict)  # nanobot/openclaw metadata from the frontmatter
+
+    @property
+    def always(self) -> bool:
+        return bool(self.meta.get("always") or (self.frontmatter or {}).get("always"))
+
 
 class SkillsLoader:
     """
@@ -23,7 +45,85 @@ class SkillsLoader:
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self.index_file = workspace / ".nanobot" / "skills" / "index.json"
         self._bin_available_cache: dict[str, bool] = {}
+        self._bin_cache_path: str | None = None
+        self._entries: dict[str, SkillEntry] | None = None  # By SKILL.md path
+
+    def _load_index(self) -> dict[str, SkillEntry]:
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+            if data.get("version") != _INDEX_VERSION:
+                return {}
+            return {e["path"]: SkillEntry(**e) for e in data.get("skills", [])}
+        except (OSError, ValueError, TypeError, KeyError):
+            return {}
+
+    def _save_index(self, entries: list[SkillEntry]) -> None:
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_file.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps({"version": _INDEX_VERSION, "skills": [asdict(e) for e in entries]}, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            tmp.replace(self.index_file)
+        except OSError as e:
+            logger.debug("Skills: cannot write index {}: {}", self.index_file, e)
+
+    def index(self) -> dict[str, SkillEntry]:
+        """
+        Current skills by name, workspace skills shadowing built-in ones.
+
+        Each call only stats the SKILL.md files; a file is read and parsed
+        again only when its mtime or size changed. Entries persist in
+        ``index_file`` so a restart does not reparse unchanged skills.
+        """
+        if self._entries is None:
+            self._entries = self._load_index()
+        skills: dict[str, SkillEntry] = {}
+        seen: dict[str, SkillEntry] = {}
+        changed = False
+        for root, source in ((self.workspace_skills, "workspace"), (self.builtin_skills, "builtin")):
+            if not root or not root.is_dir():
+                continue
+            with os.scandir(root) as it:
+                dirs = sorted((d for d in it if d.is_dir()), key=lambda d: d.name)
+            for d in dirs:
+                path = os.path.join(d.path, "SKILL.md")
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entry = self._entries.get(path)
+                if entry is None or (entry.mtime_ns, entry.size, entry.source) != (st.st_mtime_ns, st.st_size, source):
+                    entry = self._parse_entry(d.name, path, source, st)
+                    changed = True
+                seen[path] = entry
+                skills.setdefault(d.name, entry)
+        if changed or len(seen) != len(self._entries):
+            self._entries = seen
+            self._save_index(list(seen.values()))
+        return skills
+
+    def _parse_entry(self, name: str, path: str, source: str, st: os.stat_result) -> SkillEntry:
+        try:
+            content = Path(path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            content = ""
+        frontmatter = self._parse_frontmatter(content)
+        meta = self._parse_nanobot_metadata((frontmatter or {}).get("metadata", ""))
+        return SkillEntry(name, path, source, st.st_mtime_ns, st.st_size, frontmatter, meta)
+
+    def signature(self) -> tuple:
+        """Changes whenever the skills section of the prompt could change."""
+        skills = self.index()
+        env_vars = sorted({v for e in skills.values() for v in e.meta.get("requires", {}).get("env", [])})
+        return (
+            tuple((e.name, e.path, e.mtime_ns, e.size) for e in skills.values()),
+            os.environ.get("PATH", ""),
+            tuple(bool(os.environ.get(v)) for v in env_vars),
+        )
     
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
@@ -35,28 +135,11 @@ class SkillsLoader:
         Returns:
             List of skill info dicts with 'name', 'path', 'source'.
         """
-        skills = []
-        
-        # Workspace skills (highest priority)
-        if self.workspace_skills.exists():
-            for skill_dir in self.workspace_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists():
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
-        
-        # Built-in skills
-        if self.builtin_skills and self.builtin_skills.exists():
-            for skill_dir in self.builtin_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
-        
-        # Filter by requirements
-        if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
-        return skills
+        return [
+            {"name": e.name, "path": e.path, "source": e.source}
+            for e in self.index().values()
+            if not filter_unavailable or self._check_requirements(e.meta)
+        ]
     
     def load_skill(self, name: str) -> str | None:
         """
@@ -110,7 +193,7 @@ class SkillsLoader:
         Returns:
             XML-formatted skills summary.
         """
-        all_skills = self.list_skills(filter_unavailable=False)
+        all_skills = list(self.index().values())
         if not all_skills:
             return ""
         
@@ -119,10 +202,10 @@ class SkillsLoader:
         
         lines = ["<skills>"]
         for s in all_skills:
-            name = escape_xml(s["name"])
-            path = s["path"]
-            desc = escape_xml(self._get_skill_description(s["name"]))
-            skill_meta = self._get_skill_meta(s["name"])
+            name = escape_xml(s.name)
+            path = s.path
+            desc = escape_xml((s.frontmatter or {}).get("description") or s.name)
+            skill_meta = s.meta
             available = self._check_requirements(skill_meta)
             
             lines.append(f"  <skill available=\"{str(available).lower()}\">")
@@ -153,13 +236,6 @@ class SkillsLoader:
                 missing.append(f"ENV: {env}")
         return ", ".join(missing)
     
-    def _get_skill_description(self, name: str) -> str:
-        """Get the description of a skill from its frontmatter."""
-        meta = self.get_skill_metadata(name)
-        if meta and meta.get("description"):
-            return meta["description"]
-        return name  # Fallback to skill name
-    
     def _strip_frontmatter(self, content: str) -> str:
         """Remove YAML frontmatter from markdown content."""
         if content.startswith("---"):
@@ -189,6 +265,10 @@ class SkillsLoader:
 
     def _has_required_bin(self, binary: str) -> bool:
         """Check CLI availability on host, with WSL fallback on Windows."""
+        path = os.environ.get("PATH", "")
+        if path != self._bin_cache_path:
+            self._bin_available_cache.clear()
+            self._bin_cache_path = path
         cached = self._bin_available_cache.get(binary)
         if cached is not None:
             return cached
@@ -220,20 +300,9 @@ class SkillsLoader:
 
         return result.returncode == 0
     
-    def _get_skill_meta(self, name: str) -> dict:
-        """Get nanobot metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_nanobot_metadata(meta.get("metadata", ""))
-    
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
-        result = []
-        for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_nanobot_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
-                result.append(s["name"])
-        return result
+        return [e.name for e in self.index().values() if e.always and self._check_requirements(e.meta)]
     
     def get_skill_metadata(self, name: str) -> dict | None:
         """
@@ -245,10 +314,13 @@ class SkillsLoader:
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
+        entry = self.index().get(name)
+        if entry is None:
             return None
-        
+        return dict(entry.frontmatter) if entry.frontmatter is not None else None
+
+    @staticmethod
+    def _parse_frontmatter(content: str) -> dict[str, str] | None:
         if content.startswith("---"):
             match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
             if match:
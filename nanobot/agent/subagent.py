@@ -10,9 +10,16 @@ from loguru import logger
 
 from nanobot.bus.events import InboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.admission import background_priority
+from nanobot.providers.base import LLMProvider, cache_session
 from nanobot.agent.tools.factory import build_subagent_tool_registry
-from nanobot.config.schema import BrowserToolConfig, CodexToolConfig, ExecToolConfig, WebSearchConfig
+from nanobot.config.schema import (
+    BrowserToolConfig,
+    CodexToolConfig,
+    ExecToolConfig,
+    WebCacheConfig,
+    WebSearchConfig,
+)
 
 
 class SubagentManager:
@@ -35,6 +42,7 @@ class SubagentManager:
         brave_api_key: str | None = None,
         web_search_config: WebSearchConfig | None = None,
         web_browser_config: BrowserToolConfig | None = None,
+        web_cache_config: WebCacheConfig | None = None,
         exec_config: ExecToolConfig | None = None,
         codex_config: CodexToolConfig | None = None,
         restrict_to_workspace: bool = False,
@@ -50,6 +58,7 @@ class SubagentManager:
         if self.brave_api_key:
             self.web_search_config.providers.brave.api_key = self.brave_api_key
         self.web_browser_config = web_browser_config or BrowserToolConfig()
+        self.web_cache_config = web_cache_config or WebCacheConfig()
         self.exec_config = exec_config or ExecToolConfig()
         self.codex_config = codex_config or CodexToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
@@ -113,6 +122,7 @@ class SubagentManager:
                 codex_config=self.codex_config,
                 web_search_config=self.web_search_config,
                 web_browser_config=self.web_browser_config,
+                web_cache_config=self.web_cache_config,
             )
             
             # Build messages with subagent-specific prompt
@@ -130,13 +140,14 @@ class SubagentManager:
             while iteration < max_iterations:
                 iteration += 1
                 
-                response = await self.provider.chat(
-                    messages=messages,
-                    tools=tools.get_definitions(),
-                    model=self.model,
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                )
+                with background_priority(), cache_session(f"subagent:{task_id}"):
+                    response = await self.provider.chat(
+                        messages=messages,
+                        tools=tools.get_definitions(),
+                        model=self.model,
+                        temperature=self.temperature,
+                        max_tokens=self.max_tokens,
+                    )
                 
                 if response.has_tool_calls:
                     # Add assistant message with tool calls
@@ -157,11 +168,14 @@ class SubagentManager:
                         "tool_calls": tool_call_dicts,
                     })
                     
-                    # Execute tools
+                    # Execute tools (parallel-safe calls run concurrently)
                     for tool_call in response.tool_calls:
                         args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                         logger.debug("Subagent [{}] executing: {} with arguments: {}", task_id, tool_call.name, args_str)
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                    results = await tools.execute_many(
+                        [(tc.name, tc.arguments) for tc in response.tool_calls]
+                    )
+                    for tool_call, result in zip(response.tool_calls, results):
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
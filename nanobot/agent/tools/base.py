@@ -20,6 +20,12 @@ class Tool(ABC):
         "array": list,
         "object": dict,
     }
+
+    # Side-effect-free tools may run concurrently with other parallel-safe
+    # calls from the same LLM response. max_concurrency caps how many calls
+    # of this tool run at once (None = no cap).
+    parallel_safe: bool = False
+    max_concurrency: int | None = None
     
     @property
     @abstractmethod
@@ -1,5 +1,6 @@
 ﻿"""Browser automation tools powered by Playwright."""
 
+from nanobot.agent.tools.browser.pool import BrowserPool, close_browser_pool, get_browser_pool
 from nanobot.agent.tools.browser.tool import BrowserRunTool
 
-__all__ = ["BrowserRunTool"]
+__all__ = ["BrowserPool", "BrowserRunTool", "close_browser_pool", "get_browser_pool"]
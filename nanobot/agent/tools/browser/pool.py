@@ -0,0 +1,218 @@
+"""Pool of warm Playwright browsers shared by browser_run calls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+
+@dataclass(eq=False)
+class _Slot:
+    """One launched browser process and its bookkeeping."""
+
+    key: tuple[str, bool]
+    browser: Any
+    uses: int = 0
+    in_flight: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    retired: bool = False
+
+
+@dataclass
+class BrowserPoolStats:
+    """Counters for launches and reuse."""
+
+    launches: int = 0
+    reuses: int = 0
+    recycled: int = 0  # Retired after max_uses
+    crashed: int = 0  # Disconnected unexpectedly
+    idle_closed: int = 0
+
+
+class BrowserPool:
+    """
+    Keep browser processes warm across browser_run calls.
+
+    One Playwright driver and one browser per (engine, headless) pair are
+    started on first use. Every call gets its own fresh context, so cookies
+    and storage never leak between calls. A browser is retired after
+    ``max_uses`` contexts or as soon as it disconnects; a retired browser is
+    closed once its last context finishes. Browsers unused for
+    ``idle_timeout`` seconds are closed, and the driver stops when none remain.
+    """
+
+    def __init__(
+        self,
+        max_uses: int = 50,
+        idle_timeout: float = 300,
+        launch_options: dict[str, Any] | None = None,
+    ):
+        self.max_uses = max(1, max_uses)
+        self.idle_timeout = idle_timeout
+        self.launch_options = launch_options or {}
+        self.stats = BrowserPoolStats()
+        self._driver: Any = None
+        self._slots: dict[tuple[str, bool], _Slot] = {}
+        self._retired: set[_Slot] = set()
+        self._lock = asyncio.Lock()
+        self._reaper: asyncio.Task | None = None
+
+    @asynccontextmanager
+    async def context(self, browser_name: str, headless: bool, **context_kwargs: Any) -> AsyncIterator[Any]:
+        """Yield a new browser context on a pooled browser; the context is closed afterwards."""
+        slot = await self._acquire(browser_name, headless)
+        try:
+            try:
+                context = await slot.browser.new_context(**context_kwargs)
+            except Exception:
+                if self._connected(slot):
+                    raise
+                # The browser died while idle: replace it once.
+                self._retire(slot, crashed=True)
+                await self._release(slot)
+                slot = await self._acquire(browser_name, headless)
+                context = await slot.browser.new_context(**context_kwargs)
+            try:
+                yield context
+            finally:
+                with suppress(Exception):
+                    await context.close()
+        finally:
+            await self._release(slot)
+
+    async def reap_idle(self) -> int:
+        """Close browsers idle for longer than idle_timeout. Returns how many were closed."""
+        now = time.monotonic()
+        idle = [
+            slot for slot in self._slots.values()
+            if not slot.in_flight and now - slot.last_used >= self.idle_timeout
+        ]
+        for slot in idle:
+            self._slots.pop(slot.key, None)
+            self.stats.idle_closed += 1
+            await self._close_browser(slot)
+        if idle:
+            logger.debug("Browser pool: closed {} idle browser(s)", len(idle))
+        if not self._slots and not self._retired:
+            await self._stop_driver()
+        return len(idle)
+
+    async def close(self) -> None:
+        """Close every browser and stop the driver."""
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+        slots = list(self._slots.values()) + list(self._retired)
+        self._slots.clear()
+        self._retired.clear()
+        for slot in slots:
+            await self._close_browser(slot)
+        await self._stop_driver()
+
+    async def _acquire(self, browser_name: str, headless: bool) -> _Slot:
+        key = (browser_name, headless)
+        async with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None and not self._connected(slot):
+                self._retire(slot, crashed=True)
+                if not slot.in_flight:
+                    await self._close_browser(slot)
+                slot = None
+            if slot is None:
+                slot = self._slots[key] = await self._launch(key)
+            else:
+                self.stats.reuses += 1
+            slot.uses += 1
+            slot.in_flight += 1
+            slot.last_used = time.monotonic()
+            if slot.uses >= self.max_uses:
+                self._retire(slot)
+                self.stats.recycled += 1
+            return slot
+
+    async def _release(self, slot: _Slot) -> None:
+        slot.in_flight -= 1
+        slot.last_used = time.monotonic()
+        if slot.retired and not slot.in_flight:
+            self._retired.discard(slot)
+            await self._close_browser(slot)
+
+    def _retire(self, slot: _Slot, crashed: bool = False) -> None:
+        if slot.retired:
+            return
+        slot.retired = True
+        if self._slots.get(slot.key) is slot:
+            del self._slots[slot.key]
+        if crashed:
+            self.stats.crashed += 1
+            logger.warning("Browser pool: {} browser disconnected, replacing it", slot.key[0])
+        if slot.in_flight:
+            self._retired.add(slot)
+
+    async def _launch(self, key: tuple[str, bool]) -> _Slot:
+        if self._driver is None:
+            self._driver = await self._start_driver()
+        browser_name, headless = key
+        browser = await getattr(self._driver, browser_name).launch(headless=headless, **self.launch_options)
+        self.stats.launches += 1
+        logger.debug("Browser pool: launched {} (headless={})", browser_name, headless)
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_loop())
+        return _Slot(key=key, browser=browser)
+
+    async def _start_driver(self) -> Any:
+        from playwright.async_api import async_playwright
+
+        return await async_playwright().start()
+
+    async def _stop_driver(self) -> None:
+        driver, self._driver = self._driver, None
+        if driver is not None:
+            with suppress(Exception):
+                await driver.stop()
+
+    async def _close_browser(self, slot: _Slot) -> None:
+        with suppress(Exception):
+            await slot.browser.close()
+
+    async def _reap_loop(self) -> None:
+        interval = max(1.0, min(self.idle_timeout, 30.0))
+        while True:
+            await asyncio.sleep(interval)
+            async with self._lock:
+                await self.reap_idle()
+                if self._driver is None:
+                    self._reaper = None
+                    return
+
+    @staticmethod
+    def _connected(slot: _Slot) -> bool:
+        try:
+            return bool(slot.browser.is_connected())
+        except Exception:
+            return False
+
+
+_pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BrowserPool] = weakref.WeakKeyDictionary()
+
+
+def get_browser_pool(max_uses: int = 50, idle_timeout: float = 300) -> BrowserPool:
+    """Return the pool for the running event loop (Playwright objects are loop-bound)."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = BrowserPool(max_uses=max_uses, idle_timeout=idle_timeout)
+    return pool
+
+
+async def close_browser_pool() -> None:
+    """Close the running loop's pool, if one was started (call on shutdown)."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
@@ -12,6 +12,7 @@ from nanobot.agent.tools.browser.installer import (
     install_playwright_browsers,
     is_missing_browser_error,
 )
+from nanobot.agent.tools.browser.pool import get_browser_pool
 from nanobot.agent.tools.browser.safety import (
     request_url_block_reason,
     resolve_path_in_workspace,
@@ -341,72 +342,97 @@ class BrowserRunTool(Tool):
         state_path: Path | None,
         save_state: bool,
     ) -> dict[str, Any]:
-        from playwright.async_api import async_playwright
-
-        artifacts: list[str] = []
-        steps: list[dict[str, Any]] = []
-
-        async with async_playwright() as playwright:
-            browser_type = getattr(playwright, browser_name)
-            browser_instance = await browser_type.launch(headless=headless)
+        context_kwargs: dict[str, Any] = {"accept_downloads": False}
+        if state_path and state_path.exists():
+            context_kwargs["storage_state"] = str(state_path)
+        run = dict(
+            actions=actions,
+            start_url=start_url,
+            timeout_ms=timeout_ms,
+            state_path=state_path,
+            save_state=save_state,
+        )
 
-            try:
-                context_kwargs: dict[str, Any] = {"accept_downloads": False}
-                if state_path and state_path.exists():
-                    context_kwargs["storage_state"] = str(state_path)
+        if self.config.pool_enabled:
+            pool = get_browser_pool(
+                max_uses=self.config.pool_max_uses,
+                idle_timeout=self.config.pool_idle_seconds,
+            )
+            async with pool.context(browser_name, headless, **context_kwargs) as context:
+                result = await self._run_in_context(context, **run)
+        else:
+            from playwright.async_api import async_playwright
 
-                context = await browser_instance.new_context(**context_kwargs)
+            async with async_playwright() as playwright:
+                browser_instance = await getattr(playwright, browser_name).launch(headless=headless)
                 try:
-                    await context.route("**/*", self._apply_network_guard)
+                    context = await browser_instance.new_context(**context_kwargs)
+                    try:
+                        result = await self._run_in_context(context, **run)
+                    finally:
+                        await context.close()
+                finally:
+                    await browser_instance.close()
 
-                    page = await context.new_page()
+        return {
+            "ok": True,
+            "browser": browser_name,
+            "headless": headless,
+            **result,
+            "error": None,
+        }
 
-                    if start_url:
-                        response = await page.goto(
-                            start_url,
-                            wait_until="domcontentloaded",
-                            timeout=timeout_ms,
-                        )
-                        steps.append(
-                            {
-                                "index": 0,
-                                "type": "goto",
-                                "source": "startUrl",
-                                "url": start_url,
-                                "status": response.status if response else None,
-                            }
-                        )
+    async def _run_in_context(
+        self,
+        context: Any,
+        *,
+        actions: list[dict[str, Any]],
+        start_url: str | None,
+        timeout_ms: int,
+        state_path: Path | None,
+        save_state: bool,
+    ) -> dict[str, Any]:
+        artifacts: list[str] = []
+        steps: list[dict[str, Any]] = []
 
-                    for index, action in enumerate(actions, start=1):
-                        step_result = await self._execute_action(
-                            page=page,
-                            action=action,
-                            index=index,
-                            default_timeout_ms=timeout_ms,
-                            artifacts=artifacts,
-                        )
-                        steps.append(step_result)
+        await context.route("**/*", self._apply_network_guard)
+        page = await context.new_page()
+
+        if start_url:
+            response = await page.goto(
+                start_url,
+                wait_until="domcontentloaded",
+                timeout=timeout_ms,
+            )
+            steps.append(
+                {
+                    "index": 0,
+                    "type": "goto",
+                    "source": "startUrl",
+                    "url": start_url,
+                    "status": response.status if response else None,
+                }
+            )
 
-                    if save_state and state_path:
-                        state_path.parent.mkdir(parents=True, exist_ok=True)
-                        await context.storage_state(path=str(state_path))
+        for index, action in enumerate(actions, start=1):
+            step_result = await self._execute_action(
+                page=page,
+                action=action,
+                index=index,
+                default_timeout_ms=timeout_ms,
+                artifacts=artifacts,
+            )
+            steps.append(step_result)
 
-                    final_url = page.url
-                    title = await page.title()
-                finally:
-                    await context.close()
-            finally:
-                await browser_instance.close()
+        if save_state and state_path:
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            await context.storage_state(path=str(state_path))
 
         return {
-            "ok": True,
-            "browser": browser_name,
-            "headless": headless,
-            "finalUrl": final_url,
-            "title": title,
+            "finalUrl": page.url,
+            "title": await page.title(),
             "steps": steps,
             "artifacts": artifacts,
-            "error": None,
         }
 
     async def _apply_network_guard(self, route: Any, request: Any) -> None:
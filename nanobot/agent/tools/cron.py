@@ -1,6 +1,7 @@
 """Cron tool for scheduling reminders and tasks."""
 
 import time
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Any
 from zoneinfo import ZoneInfo
@@ -15,13 +16,12 @@ class CronTool(Tool):
 
     def __init__(self, cron_service: CronService):
         self._cron = cron_service
-        self._channel = ""
-        self._chat_id = ""
+        # Scoped to the running task so concurrent turns keep their own target.
+        self._context: ContextVar[tuple[str, str]] = ContextVar("cron_tool_context", default=("", ""))
 
     def set_context(self, channel: str, chat_id: str) -> None:
         """Set the current session context for delivery."""
-        self._channel = channel
-        self._chat_id = chat_id
+        self._context.set((channel, chat_id))
 
     @property
     def name(self) -> str:
@@ -111,7 +111,8 @@ class CronTool(Tool):
     ) -> str:
         if not message:
             return "Error: message is required for add"
-        if not self._channel or not self._chat_id:
+        channel, chat_id = self._context.get()
+        if not channel or not chat_id:
             return "Error: no session context (channel/chat_id)"
         if mode not in {"reminder", "task", "one_time"}:
             return "Error: mode must be 'reminder', 'task', or 'one_time'"
@@ -169,8 +170,8 @@ class CronTool(Tool):
             message=message,
             payload_kind=payload_kind,
             deliver=True,
-            channel=self._channel,
-            to=self._chat_id,
+            channel=channel,
+            to=chat_id,
             delete_after_run=delete_after_run,
         )
         schedule_label = "one-time" if mode == "one_time" else "recurring"
@@ -7,14 +7,22 @@ from nanobot.agent.tools.browser import BrowserRunTool
 from nanobot.agent.tools.codex import CodexMergeTool, CodexRunTool
 from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
+from nanobot.agent.tools.memory_search import MemorySearchTool
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.todo import TodoTool
 from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
+from nanobot.agent.tools.web_cache import get_web_cache
 from nanobot.bus.events import OutboundMessage
-from nanobot.config.schema import BrowserToolConfig, CodexToolConfig, ExecToolConfig, WebSearchConfig
+from nanobot.config.schema import (
+    BrowserToolConfig,
+    CodexToolConfig,
+    ExecToolConfig,
+    WebCacheConfig,
+    WebSearchConfig,
+)
 
 
 def _register_common_tools(
@@ -26,6 +34,7 @@ def _register_common_tools(
     codex_config: CodexToolConfig,
     web_search_config: WebSearchConfig,
     web_browser_config: BrowserToolConfig,
+    web_cache_config: WebCacheConfig,
 ) -> None:
     """Register tools shared by main agent and subagent."""
     allowed_dir = workspace if restrict_to_workspace else None
@@ -58,8 +67,21 @@ def _register_common_tools(
             )
         )
 
-    registry.register(WebSearchTool(web_search_config=web_search_config))
-    registry.register(WebFetchTool())
+    web_cache = get_web_cache(workspace, web_cache_config)
+    registry.register(
+        WebSearchTool(
+            web_search_config=web_search_config,
+            cache=web_cache,
+            cache_ttl=web_cache_config.search_ttl,
+        )
+    )
+    registry.register(
+        WebFetchTool(
+            cache=web_cache,
+            cache_ttl=web_cache_config.fetch_ttl,
+            max_cache_ttl=web_cache_config.max_ttl,
+        )
+    )
 
     if web_browser_config.enabled:
         registry.register(
@@ -69,6 +91,7 @@ def _register_common_tools(
             )
         )
 
+    registry.register(MemorySearchTool(workspace=workspace))
     registry.register(TodoTool(workspace=workspace))
 
 
@@ -80,6 +103,7 @@ def build_main_agent_tool_registry(
     codex_config: CodexToolConfig,
     web_search_config: WebSearchConfig,
     web_browser_config: BrowserToolConfig,
+    web_cache_config: WebCacheConfig,
     message_send_callback: Callable[[OutboundMessage], Awaitable[None]],
     spawn_manager: Any,
     cron_service: Any | None,
@@ -94,6 +118,7 @@ def build_main_agent_tool_registry(
         codex_config=codex_config,
         web_search_config=web_search_config,
         web_browser_config=web_browser_config,
+        web_cache_config=web_cache_config,
     )
 
     registry.register(MessageTool(send_callback=message_send_callback))
@@ -111,6 +136,7 @@ def build_subagent_tool_registry(
     codex_config: CodexToolConfig,
     web_search_config: WebSearchConfig,
     web_browser_config: BrowserToolConfig,
+    web_cache_config: WebCacheConfig,
 ) -> ToolRegistry:
     """Build tool registry for subagent runs."""
     registry = ToolRegistry()
@@ -122,5 +148,6 @@ def build_subagent_tool_registry(
         codex_config=codex_config,
         web_search_config=web_search_config,
         web_browser_config=web_browser_config,
+        web_cache_config=web_cache_config,
     )
     return registry
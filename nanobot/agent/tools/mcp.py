@@ -21,6 +21,9 @@ class MCPToolWrapper(Tool):
         self._description = tool_def.description or tool_def.name
         self._parameters = tool_def.inputSchema or {"type": "object", "properties": {}}
         self._tool_timeout = tool_timeout
+        # Servers can mark tools read-only; those are safe to run in parallel.
+        annotations = getattr(tool_def, "annotations", None)
+        self.parallel_safe = bool(getattr(annotations, "readOnlyHint", False))
 
     @property
     def name(self) -> str:
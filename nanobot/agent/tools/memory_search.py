@@ -0,0 +1,76 @@
+"""Memory search tool: ranked full-text recall over HISTORY.md and past sessions."""
+
+import asyncio
+import threading
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.memory_index import MemoryHit, MemoryIndex
+from nanobot.agent.tools.base import Tool
+
+
+class MemorySearchTool(Tool):
+    """Search the history log and archived session messages."""
+
+    name = "memory_search"
+    description = (
+        "Search past events in memory/HISTORY.md and earlier conversation messages. "
+        "Returns the best-matching entries with timestamps. Prefer this over grep for recall."
+    )
+    parallel_safe = True
+    parameters = {
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "Keywords to search for"},
+            "since": {"type": "string", "description": "Only entries on or after this date (YYYY-MM-DD)"},
+            "until": {"type": "string", "description": "Only entries on or before this date (YYYY-MM-DD)"},
+            "session": {"type": "string", "description": "Only messages from sessions whose key contains this"},
+            "source": {"type": "string", "enum": ["history", "session"], "description": "Limit to one source"},
+            "limit": {"type": "integer", "description": "Results (1-20)", "minimum": 1, "maximum": 20},
+        },
+        "required": ["query"],
+    }
+
+    def __init__(self, workspace: Path):
+        self.workspace = workspace
+        self._index: MemoryIndex | None = None
+        self._lock = threading.Lock()
+
+    async def execute(
+        self,
+        query: str,
+        since: str | None = None,
+        until: str | None = None,
+        session: str | None = None,
+        source: str | None = None,
+        limit: int = 8,
+        **kwargs: Any,
+    ) -> str:
+        try:
+            hits = await asyncio.to_thread(
+                self._search,
+                query,
+                limit=min(max(limit, 1), 20),
+                since=since,
+                until=until,
+                session=session,
+                source=source,
+            )
+        except Exception as e:
+            return f"Error searching memory: {e}"
+
+        if not hits:
+            return f"No memory entries match: {query}"
+        lines = [f"Memory results for: {query}\n"]
+        for i, hit in enumerate(hits, 1):
+            where = "history" if hit.source == "history" else f"{hit.session} ({hit.role})"
+            lines.append(f"{i}. [{hit.ts or '?'}] {where}\n   {hit.snippet}")
+        return "\n".join(lines)
+
+    def _search(self, query: str, **filters: Any) -> list[MemoryHit]:
+        """Bring the index up to date and query it; blocking, so run off the event loop."""
+        with self._lock:
+            if self._index is None:
+                self._index = MemoryIndex(self.workspace)
+            self._index.refresh()
+            return self._index.search(query, **filters)
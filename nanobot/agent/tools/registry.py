@@ -1,8 +1,11 @@
 """Tool registry for dynamic tool management."""
 
+import asyncio
+import time
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils import metrics, tracing
 
 
 class ToolRegistry:
@@ -14,6 +17,7 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        self._slots: dict[str, asyncio.Semaphore] = {}
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
@@ -43,17 +47,65 @@ class ToolRegistry:
         if not tool:
             return f"Error: Tool '{name}' not found. Available: {', '.join(self.tool_names)}"
 
-        try:
-            errors = tool.validate_params(params)
-            if errors:
-                return f"Error: Invalid parameters for tool '{name}': " + "; ".join(errors) + _HINT
-            result = await tool.execute(**params)
-            if isinstance(result, str) and result.startswith("Error"):
-                return result + _HINT
-            return result
-        except Exception as e:
-            return f"Error executing {name}: {str(e)}" + _HINT
+        start = time.perf_counter()
+        failed = True
+        with tracing.span("tool.execute", tool=name) as span:
+            try:
+                errors = tool.validate_params(params)
+                if errors:
+                    return f"Error: Invalid parameters for tool '{name}': " + "; ".join(errors) + _HINT
+                result = await tool.execute(**params)
+                if isinstance(result, str) and result.startswith("Error"):
+                    return result + _HINT
+                failed = False
+                return result
+            except Exception as e:
+                return f"Error executing {name}: {str(e)}" + _HINT
+            finally:
+                metrics.TOOL_SECONDS.observe(time.perf_counter() - start, name)
+                if failed:
+                    metrics.TOOL_ERRORS.inc(name)
+                    span.set(failed=True)
     
+    async def execute_many(self, calls: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        """
+        Execute several tool calls, running parallel-safe ones concurrently.
+
+        Consecutive calls to parallel-safe tools run together; any other call
+        waits for everything before it and runs alone, so ordering between
+        side effects is preserved. Results are returned in call order.
+        """
+        results: list[str] = []
+        batch: list[tuple[str, dict[str, Any]]] = []
+        for name, params in calls:
+            tool = self._tools.get(name)
+            if tool is not None and tool.parallel_safe:
+                batch.append((name, params))
+                continue
+            results.extend(await self._execute_batch(batch))
+            batch = []
+            results.append(await self.execute(name, params))
+        results.extend(await self._execute_batch(batch))
+        return results
+
+    async def _execute_batch(self, batch: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        if len(batch) <= 1:
+            return [await self.execute(name, params) for name, params in batch]
+        return list(await asyncio.gather(*(self._execute_capped(name, params) for name, params in batch)))
+
+    async def _execute_capped(self, name: str, params: dict[str, Any]) -> str:
+        """Execute a tool while holding one of its concurrency slots."""
+        tool = self._tools.get(name)
+        limit = tool.max_concurrency if tool else None
+        if not limit:
+            return await self.execute(name, params)
+        slots = self._slots.get(name)
+        if slots is None:
+            slots = asyncio.Semaphore(limit)
+            self._slots[name] = slots
+        async with slots:
+            return await self.execute(name, params)
+
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
@@ -3,13 +3,17 @@
 import html
 import json
 import re
+from dataclasses import asdict
 from typing import Any
 from urllib.parse import urlparse
 
 import httpx
 
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.web_cache import WebCache, cache_key, http_ttl, normalize_query
 from nanobot.agent.tools.websearch import WebSearchClient, WebSearchError
+from nanobot.agent.tools.websearch.models import SearchHit
+from nanobot.utils.http_pool import get_http_client
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
@@ -48,6 +52,8 @@ class WebSearchTool(Tool):
     
     name = "web_search"
     description = "Search the web. Returns titles, URLs, and snippets."
+    parallel_safe = True
+    max_concurrency = 4
     parameters = {
         "type": "object",
         "properties": {
@@ -57,18 +63,25 @@ class WebSearchTool(Tool):
         "required": ["query"]
     }
     
-    def __init__(self, web_search_config: "WebSearchConfig | None" = None):
+    def __init__(
+        self,
+        web_search_config: "WebSearchConfig | None" = None,
+        cache: WebCache | None = None,
+        cache_ttl: int = 3600,
+    ):
         from nanobot.config.schema import WebSearchConfig
 
         self.config = web_search_config or WebSearchConfig()
         self.max_results = self.config.max_results
         self.client = WebSearchClient(self.config)
+        self.cache = cache
+        self.cache_ttl = cache_ttl
     
     async def execute(self, query: str, count: int | None = None, **kwargs: Any) -> str:
         n = min(max(self.max_results if count is None else count, 1), 10)
 
         try:
-            results = await self.client.search(query=query, count=n)
+            results = await self._search(query, n)
             if not results:
                 return f"No results for: {query}"
 
@@ -81,12 +94,30 @@ class WebSearchTool(Tool):
         except WebSearchError as e:
             return f"Error: {e}"
 
+    async def _search(self, query: str, count: int) -> list[SearchHit]:
+        """Search through the cache, keyed on provider, normalized query and count."""
+        if self.cache is None:
+            return await self.client.search(query=query, count=count)
+
+        provider = (self.config.provider or "brave").lower()
+        key = cache_key("search", provider, normalize_query(query), count)
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh:
+            return [SearchHit(**hit) for hit in entry.value]
+
+        results = await self.client.search(query=query, count=count)
+        if results:  # An empty page may be a transient provider hiccup; ask again next time
+            self.cache.put(key, [asdict(hit) for hit in results], self.cache_ttl)
+        return results
+
 
 class WebFetchTool(Tool):
     """Fetch and extract content from a URL using Readability."""
     
     name = "web_fetch"
     description = "Fetch URL and extract readable content (HTML → markdown/text)."
+    parallel_safe = True
+    max_concurrency = 4
     parameters = {
         "type": "object",
         "properties": {
@@ -97,8 +128,17 @@ class WebFetchTool(Tool):
         "required": ["url"]
     }
     
-    def __init__(self, max_chars: int = 50000):
+    def __init__(
+        self,
+        max_chars: int = 50000,
+        cache: WebCache | None = None,
+        cache_ttl: int = 900,
+        max_cache_ttl: int = 86400,
+    ):
         self.max_chars = max_chars
+        self.cache = cache
+        self.cache_ttl = cache_ttl  # Used when the response has no cache headers
+        self.max_cache_ttl = max_cache_ttl
     
     async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
         from readability import Document
@@ -110,14 +150,29 @@ class WebFetchTool(Tool):
         if not is_valid:
             return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url}, ensure_ascii=False)
 
+        key = cache_key("fetch", url, extractMode)
+        cached = self.cache.get(key) if self.cache else None
+        if cached is not None and cached.fresh:
+            return self._result(url, cached.value, max_chars, cached=True)
+
+        headers = {"User-Agent": USER_AGENT}
+        if cached is not None:  # Stale, but the origin can confirm it is unchanged
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=30.0
-            ) as client:
-                r = await client.get(url, headers={"User-Agent": USER_AGENT})
-                r.raise_for_status()
+            client = get_http_client(max_redirects=MAX_REDIRECTS)
+            r = await client.get(url, headers=headers, follow_redirects=True, timeout=30.0)
+            if r.status_code == 304 and cached is not None:
+                ttl = self._ttl(r)
+                if ttl is None:
+                    self.cache.delete(key)
+                else:
+                    self.cache.refresh(key, cached, ttl)
+                return self._result(url, cached.value, max_chars, cached=True)
+            r.raise_for_status()
             
             ctype = r.headers.get("content-type", "")
             
@@ -132,15 +187,38 @@ class WebFetchTool(Tool):
                 extractor = "readability"
             else:
                 text, extractor = r.text, "raw"
-            
-            truncated = len(text) > max_chars
-            if truncated:
-                text = text[:max_chars]
-            
-            return json.dumps({"url": url, "finalUrl": str(r.url), "status": r.status_code,
-                              "extractor": extractor, "truncated": truncated, "length": len(text), "text": text}, ensure_ascii=False)
+
+            page = {"finalUrl": str(r.url), "status": r.status_code, "extractor": extractor, "text": text}
+            if self.cache is not None:
+                ttl = self._ttl(r)
+                if ttl is not None:
+                    self.cache.put(
+                        key, page, ttl,
+                        etag=r.headers.get("etag", ""),
+                        last_modified=r.headers.get("last-modified", ""),
+                    )
+            return self._result(url, page, max_chars)
         except Exception as e:
             return json.dumps({"error": str(e), "url": url}, ensure_ascii=False)
+
+    def _ttl(self, r: httpx.Response) -> float | None:
+        """Cache lifetime of a fetched page, or None when other chats must not see it."""
+        if "cookie" in r.request.headers:
+            return None  # Personalized for whoever sent the cookie
+        return http_ttl(r.headers, self.cache_ttl, self.max_cache_ttl)
+
+    @staticmethod
+    def _result(url: str, page: dict[str, Any], max_chars: int, cached: bool = False) -> str:
+        """Serialize an extracted page (fresh or cached), truncated to max_chars."""
+        text = page["text"]
+        truncated = len(text) > max_chars
+        if truncated:
+            text = text[:max_chars]
+        result = {"url": url, "finalUrl": page["finalUrl"], "status": page["status"],
+                  "extractor": page["extractor"], "truncated": truncated, "length": len(text), "text": text}
+        if cached:
+            result["cached"] = True
+        return json.dumps(result, ensure_ascii=False)
     
     def _to_markdown(self, html: str) -> str:
         """Convert HTML to markdown."""
@@ -0,0 +1,327 @@
+"""Result cache for web_search and web_fetch: in-memory LRU backed by disk."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Mapping
+
+from loguru import logger
+
+from nanobot.utils import metrics
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import WebCacheConfig
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    """One cached result with its expiry and HTTP validators."""
+
+    value: Any
+    expires: float
+    etag: str = ""
+    last_modified: str = ""
+    size: int = 0
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "value": self.value,
+            "expires": self.expires,
+            "etag": self.etag,
+            "lastModified": self.last_modified,
+        }, ensure_ascii=False)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters and current tier sizes."""
+
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0  # Subset of hits served from disk after a memory miss
+    revalidated: int = 0  # Misses on stale entries that a 304 confirmed unchanged
+    stores: int = 0
+    evictions: int = 0
+    memory_bytes: int = 0
+    disk_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        """One-line breakdown for logs."""
+        return (
+            f"{self.hits} hits ({self.disk_hits} from disk), "
+            f"{self.misses} misses ({self.revalidated} revalidated), hit rate {self.hit_rate:.0%}, "
+            f"memory {self.memory_bytes} B, disk {self.disk_bytes} B, {self.evictions} evicted"
+        )
+
+
+def cache_key(kind: str, *parts: Any) -> str:
+    """Stable hex key for a cache lookup."""
+    raw = json.dumps([kind, *parts], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share an entry."""
+    return " ".join(query.split()).casefold()
+
+
+def http_ttl(headers: Mapping[str, str], default: float, max_ttl: float) -> float | None:
+    """
+    Derive a freshness lifetime from response cache headers.
+
+    Returns None when the response must not be stored in this shared cache
+    (``no-store``, or ``private`` because it was personalized), 0 when it
+    must be revalidated before every use (``no-cache``), otherwise the lifetime
+    from ``max-age``/``Expires`` capped at ``max_ttl``, or ``default`` when the
+    server sends neither.
+    """
+    directives: dict[str, str] = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"')
+
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    for name in ("s-maxage", "max-age"):
+        if name in directives:
+            try:
+                return min(max(0, int(directives[name])), max_ttl)
+            except ValueError:
+                break
+    if expires := headers.get("expires"):
+        try:
+            expires_at = parsedate_to_datetime(expires).timestamp()
+            date = headers.get("date")
+            now = parsedate_to_datetime(date).timestamp() if date else time.time()
+        except (TypeError, ValueError):
+            return 0  # Invalid Expires means "already expired"
+        return min(max(0.0, expires_at - now), max_ttl)
+    return min(default, max_ttl)
+
+
+class WebCache:
+    """
+    Two-tier cache for web tool results.
+
+    Entries live in an in-memory LRU bounded by ``memory_max_bytes`` and, when
+    a directory is given, in one JSON file per entry bounded by
+    ``disk_max_bytes``, so results survive restarts and are shared between the
+    main agent, subagents, heartbeat and cron runs. Both tiers evict the least
+    recently used entries first. Disk errors are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        memory_max_bytes: int = 16 * _MB,
+        disk_max_bytes: int = 128 * _MB,
+    ):
+        self.directory = directory
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._disk: OrderedDict[str, int] | None = None  # key -> file size, LRU order; loaded lazily
+
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        Look up an entry, fresh or stale.
+
+        Only fresh entries count as hits; callers may still use a stale entry's
+        validators to revalidate it. Stale entries without validators are dropped.
+        """
+        entry = self._memory.get(key)
+        from_disk = False
+        if entry is not None:
+            self._memory.move_to_end(key)
+        else:
+            entry = self._read_disk(key)
+            from_disk = entry is not None
+
+        if entry is not None and entry.fresh:
+            self.stats.hits += 1
+            self.stats.disk_hits += from_disk
+            metrics.WEB_CACHE_HITS.inc("disk" if from_disk else "memory")
+            if from_disk:
+                self._remember(key, entry)
+            self._touch_disk(key)
+            return entry
+
+        self.stats.misses += 1
+        metrics.WEB_CACHE_MISSES.inc()
+        if entry is not None and not entry.revalidatable:
+            self.delete(key)
+            return None
+        return entry
+
+    def put(self, key: str, value: Any, ttl: float, *, etag: str = "", last_modified: str = "") -> None:
+        """Store a result for ``ttl`` seconds (entries with validators are kept even at ttl 0)."""
+        entry = CacheEntry(value=value, expires=time.time() + ttl, etag=etag, last_modified=last_modified)
+        if ttl <= 0 and not entry.revalidatable:
+            return
+        data = entry.to_json()
+        entry.size = len(data.encode("utf-8"))
+        self.stats.stores += 1
+        self._remember(key, entry)
+        self._write_disk(key, data, entry.size)
+
+    def refresh(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        """Extend a stale entry after the origin confirmed it unchanged (HTTP 304)."""
+        self.stats.revalidated += 1
+        self.put(key, entry.value, ttl, etag=entry.etag, last_modified=entry.last_modified)
+
+    def delete(self, key: str) -> None:
+        """Drop an entry from both tiers."""
+        if (entry := self._memory.pop(key, None)) is not None:
+            self.stats.memory_bytes -= entry.size
+        self._remove_disk(key)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        for key in list(self._memory):
+            self.delete(key)
+        for key in list(self._disk_index()):
+            self._remove_disk(key)
+
+    # ---- memory tier -------------------------------------------------------
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        if (old := self._memory.pop(key, None)) is not None:
+            self.stats.memory_bytes -= old.size
+        if entry.size > self.memory_max_bytes:
+            return
+        self._memory[key] = entry
+        self.stats.memory_bytes += entry.size
+        while self.stats.memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self.stats.memory_bytes -= evicted.size
+            self.stats.evictions += 1
+
+    # ---- disk tier ---------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}.json"
+
+    def _disk_index(self) -> OrderedDict[str, int]:
+        if self._disk is None:
+            self._disk = OrderedDict()
+            if self.directory is not None and self.directory.is_dir():
+                files = []
+                for path in self.directory.glob("*.json"):
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    files.append((st.st_mtime, path.stem, st.st_size))
+                for _, key, size in sorted(files):
+                    self._disk[key] = size
+                self.stats.disk_bytes = sum(self._disk.values())
+        return self._disk
+
+    def _read_disk(self, key: str) -> CacheEntry | None:
+        if self.directory is None or key not in self._disk_index():
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_text(encoding="utf-8")
+            raw = json.loads(data)
+            return CacheEntry(
+                value=raw["value"],
+                expires=float(raw["expires"]),
+                etag=raw.get("etag", ""),
+                last_modified=raw.get("lastModified", ""),
+                size=len(data.encode("utf-8")),
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Web cache: dropping unreadable entry {}: {}", path.name, e)
+            self._remove_disk(key)
+            return None
+
+    def _write_disk(self, key: str, data: str, size: int) -> None:
+        if self.directory is None:
+            return
+        index = self._disk_index()
+        if size > self.disk_max_bytes:
+            self._remove_disk(key)
+            return
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(data, encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Web cache: failed to write {}: {}", path.name, e)
+            return
+        self.stats.disk_bytes += size - index.pop(key, 0)
+        index[key] = size
+        while self.stats.disk_bytes > self.disk_max_bytes and len(index) > 1:
+            self._remove_disk(next(iter(index)))
+            self.stats.evictions += 1
+
+    def _touch_disk(self, key: str) -> None:
+        if self.directory is None or key not in self._disk_index():
+            return
+        self._disk_index().move_to_end(key)
+        try:
+            os.utime(self._path(key))  # mtime doubles as last access for the LRU order after restart
+        except OSError:
+            pass
+
+    def _remove_disk(self, key: str) -> None:
+        if self.directory is None:
+            return
+        index = self._disk_index()
+        if key in index:
+            self.stats.disk_bytes -= index.pop(key)
+        try:
+            self._path(key).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Web cache: failed to remove {}: {}", key, e)
+
+
+_caches: dict[Path, WebCache] = {}
+
+
+def get_web_cache(workspace: Path, config: WebCacheConfig) -> WebCache | None:
+    """Return the shared cache for the configured directory, or None when disabled."""
+    if not config.enabled:
+        return None
+    directory = Path(config.dir).expanduser()
+    if not directory.is_absolute():
+        directory = workspace / directory
+    directory = directory.resolve()
+    cache = _caches.get(directory)
+    if cache is None:
+        cache = _caches[directory] = WebCache(
+            directory,
+            memory_max_bytes=config.memory_max_mb * _MB,
+            disk_max_bytes=config.disk_max_mb * _MB,
+        )
+    return cache
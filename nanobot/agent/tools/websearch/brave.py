@@ -1,8 +1,7 @@
 """Brave Search API adapter."""
 
-import httpx
-
 from nanobot.agent.tools.websearch.models import SearchHit
+from nanobot.utils.http_pool import get_http_client
 
 
 async def search_brave(
@@ -13,17 +12,16 @@ async def search_brave(
     base_url: str,
 ) -> list[SearchHit]:
     """Search with Brave API and normalize results."""
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            base_url,
-            params={"q": query, "count": count},
-            headers={
-                "Accept": "application/json",
-                "X-Subscription-Token": api_key,
-            },
-            timeout=10.0,
-        )
-        response.raise_for_status()
+    response = await get_http_client().get(
+        base_url,
+        params={"q": query, "count": count},
+        headers={
+            "Accept": "application/json",
+            "X-Subscription-Token": api_key,
+        },
+        timeout=10.0,
+    )
+    response.raise_for_status()
 
     results = response.json().get("web", {}).get("results", [])
     return [
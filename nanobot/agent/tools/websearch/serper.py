@@ -1,8 +1,7 @@
 """Serper Search API adapter."""
 
-import httpx
-
 from nanobot.agent.tools.websearch.models import SearchHit
+from nanobot.utils.http_pool import get_http_client
 
 
 async def search_serper(
@@ -13,17 +12,16 @@ async def search_serper(
     base_url: str,
 ) -> list[SearchHit]:
     """Search with Serper API and normalize results."""
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            base_url,
-            json={"q": query, "num": count},
-            headers={
-                "Content-Type": "application/json",
-                "X-API-KEY": api_key,
-            },
-            timeout=10.0,
-        )
-        response.raise_for_status()
+    response = await get_http_client().post(
+        base_url,
+        json={"q": query, "num": count},
+        headers={
+            "Content-Type": "application/json",
+            "X-API-KEY": api_key,
+        },
+        timeout=10.0,
+    )
+    response.raise_for_status()
 
     results = response.json().get("organic", [])
     return [
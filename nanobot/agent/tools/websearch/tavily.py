@@ -1,8 +1,7 @@
 """Tavily Search API adapter."""
 
-import httpx
-
 from nanobot.agent.tools.websearch.models import SearchHit
+from nanobot.utils.http_pool import get_http_client
 
 
 async def search_tavily(
@@ -13,18 +12,17 @@ async def search_tavily(
     base_url: str,
 ) -> list[SearchHit]:
     """Search with Tavily API and normalize results."""
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            base_url,
-            json={
-                "api_key": api_key,
-                "query": query,
-                "max_results": count,
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=10.0,
-        )
-        response.raise_for_status()
+    response = await get_http_client().post(
+        base_url,
+        json={
+            "api_key": api_key,
+            "query": query,
+            "max_results": count,
+        },
+        headers={"Content-Type": "application/json"},
+        timeout=10.0,
+    )
+    response.raise_for_status()
 
     results = response.json().get("results", [])
     hits: list[SearchHit] = []
@@ -3,6 +3,7 @@
 import asyncio
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.utils.tracing import current_traceparent
 
 
 class MessageBus:
@@ -27,6 +28,8 @@ class MessageBus:
 
     async def publish_outbound(self, msg: OutboundMessage) -> None:
         """Publish a response from the agent to channels."""
+        if "_traceparent" not in msg.metadata and (traceparent := current_traceparent()):
+            msg.metadata = {**msg.metadata, "_traceparent": traceparent}
         await self.outbound.put(msg)
 
     async def consume_outbound(self) -> OutboundMessage:
@@ -1,12 +1,129 @@
 """Base channel interface for chat platforms."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, TypeVar
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
+from nanobot.utils import metrics
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RateLimitProfile:
+    """A platform's send limits, in messages per second."""
+
+    global_rate: float
+    global_burst: int
+    chat_rate: float
+    chat_burst: int
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, now: float, need: int = 1) -> float:
+        """Seconds until ``need`` tokens are available."""
+        self._refill(now)
+        need = min(need, self.burst)
+        return 0.0 if self.tokens >= need else (need - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class RateLimiter:
+    """
+    Pace one channel's sends: a global bucket, a bucket per chat, and a pause
+    set by the platform's ``Retry-After``.
+
+    Replies and other urgent messages go first: a non-urgent (progress)
+    message only takes a global token when one is left over for every urgent
+    message waiting.
+    """
+
+    _MAX_CHATS = 1024
+
+    def __init__(self, profile: RateLimitProfile | None = None):
+        self.profile = profile
+        self._global = TokenBucket(profile.global_rate, profile.global_burst) if profile else None
+        self._chats: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._paused_until = 0.0
+        self._urgent_waiting = 0
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket | None:
+        if self.profile is None:
+            return None
+        bucket = self._chats.pop(chat_id, None) or TokenBucket(self.profile.chat_rate, self.profile.chat_burst)
+        self._chats[chat_id] = bucket
+        while len(self._chats) > self._MAX_CHATS:
+            self._chats.popitem(last=False)
+        return bucket
+
+    def _wait_time(self, chat_id: str, urgent: bool, now: float) -> float:
+        wait = self._paused_until - now
+        if self._global is not None:
+            need = 1 if urgent else 1 + self._urgent_waiting
+            wait = max(wait, self._global.wait_time(now, need))
+        if (bucket := self._chat_bucket(chat_id)) is not None:
+            wait = max(wait, bucket.wait_time(now))
+        return wait
+
+    async def acquire(self, chat_id: str, *, urgent: bool = True) -> float:
+        """Wait until a message to ``chat_id`` may be sent. Returns the time waited."""
+        start = time.monotonic()
+        if urgent:
+            self._urgent_waiting += 1
+        try:
+            while (wait := self._wait_time(chat_id, urgent, time.monotonic())) > 0:
+                await asyncio.sleep(wait)
+        finally:
+            if urgent:
+                self._urgent_waiting -= 1
+        if self._global is not None:
+            self._global.take()
+        if (bucket := self._chats.get(chat_id)) is not None:
+            bucket.take()
+        return time.monotonic() - start
+
+    def pause(self, seconds: float) -> None:
+        """Hold every send for ``seconds`` (the platform asked us to back off)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Return the back-off a rate-limit error asks for, or None if ``exc`` is not one."""
+    value = getattr(exc, "retry_after", None)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (int, float)):
+        return float(value)
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        header = (getattr(response, "headers", None) or {}).get("Retry-After")
+        try:
+            return float(header) if header is not None else 1.0
+        except (TypeError, ValueError):
+            return 1.0
+    return None
 
 
 class BaseChannel(ABC):
@@ -18,6 +135,16 @@ class BaseChannel(ABC):
     """
     
     name: str = "base"
+
+    # Channels that can edit a sent message set this and implement
+    # _stream_start/_stream_edit to receive replies as they are generated.
+    supports_streaming: bool = False
+    stream_max_chars: int | None = None
+    _MAX_STREAM_HANDLES = 64
+
+    # Platform send limits; None leaves sends unpaced (Retry-After is still honoured).
+    rate_limit: RateLimitProfile | None = None
+    _MAX_SEND_ATTEMPTS = 3
     
     def __init__(self, config: Any, bus: MessageBus):
         """
@@ -30,6 +157,8 @@ class BaseChannel(ABC):
         self.config = config
         self.bus = bus
         self._running = False
+        self._stream_handles: dict[str, Any] = {}
+        self.rate_limiter = RateLimiter(self.rate_limit)
     
     @abstractmethod
     async def start(self) -> None:
@@ -58,6 +187,126 @@ class BaseChannel(ABC):
         """
         pass
     
+    async def _send_streamed(self, msg: OutboundMessage) -> bool:
+        """
+        Deliver a streamed reply by editing the message it belongs to.
+
+        Partial updates (``_streaming`` metadata) create the platform message
+        on first use and edit it afterwards; the final reply for the same
+        ``_stream_id`` edits it one last time.
+
+        Args:
+            msg: The outbound message, possibly carrying stream metadata.
+
+        Returns:
+            True if the message was handled here. False means the caller
+            should send it normally: it is not part of a stream, the stream
+            never produced a message, or the final edit was not possible.
+            In the last case the partial message is retracted first (see
+            ``_retract_stream``), so the reply is not shown twice.
+        """
+        stream_id = (msg.metadata or {}).get("_stream_id")
+        if not stream_id or not self.supports_streaming:
+            return False
+
+        partial = bool(msg.metadata.get("_streaming"))
+        too_long = self.stream_max_chars is not None and len(msg.content or "") > self.stream_max_chars
+        if partial:
+            handle = self._stream_handles.get(stream_id)
+            if too_long:
+                return True
+        else:
+            handle = self._stream_handles.pop(stream_id, None)
+            if handle is None:
+                return False
+            if too_long or msg.media:
+                await self._retract_stream(handle, msg)
+                return False
+
+        try:
+            if handle is None:
+                handle = await self._stream_start(msg)
+                if handle is not None:
+                    self._stream_handles[stream_id] = handle
+                    while len(self._stream_handles) > self._MAX_STREAM_HANDLES:
+                        self._stream_handles.pop(next(iter(self._stream_handles)))
+            else:
+                await self._stream_edit(handle, msg)
+            return True
+        except Exception as e:
+            if (delay := retry_after(e)) is not None:
+                metrics.CHANNEL_RATE_LIMITED.inc(self.name)
+                self.rate_limiter.pause(delay)
+            logger.warning("Streamed update on {} failed: {}", self.name, e)
+            if not partial and handle is not None:
+                await self._retract_stream(handle, msg)
+            return partial
+
+    async def _retract_stream(self, handle: Any, msg: OutboundMessage) -> None:
+        """
+        Clear a streamed message before its final reply is sent normally.
+
+        The partial message is deleted. Where that is not possible, an
+        over-long reply is split instead: the streamed message is edited to
+        the first part and ``msg.content`` is cut down to the rest.
+        """
+        try:
+            await self._stream_delete(handle, msg)
+            return
+        except Exception as e:
+            logger.debug("Could not delete streamed message on {}: {}", self.name, e)
+
+        limit = self.stream_max_chars
+        content = msg.content or ""
+        if limit is None or len(content) <= limit:
+            logger.warning("Streamed message on {} left in place; the reply may repeat it", self.name)
+            return
+        cut = content.rfind("\n", 0, limit)
+        if cut <= 0:
+            cut = limit
+        try:
+            await self._stream_edit(handle, replace(msg, content=content[:cut]))
+        except Exception as e:
+            logger.warning("Streamed message on {} left in place; the reply may repeat it: {}", self.name, e)
+            return
+        msg.content = content[cut:].lstrip("\n")
+
+    async def throttle(self, msg: OutboundMessage) -> None:
+        """Wait for the platform's rate limits to allow sending ``msg``; replies go before progress."""
+        waited = await self.rate_limiter.acquire(msg.chat_id, urgent=not msg.metadata.get("_progress"))
+        if waited > 0:
+            metrics.CHANNEL_THROTTLE_SECONDS.observe(waited, self.name)
+
+    async def _backoff(self, seconds: float) -> None:
+        """Honour a platform ``Retry-After``: hold all sends on this channel and wait it out."""
+        logger.warning("{} rate limited, retrying in {}s", self.name, seconds)
+        metrics.CHANNEL_RATE_LIMITED.inc(self.name)
+        self.rate_limiter.pause(seconds)
+        await asyncio.sleep(seconds)
+
+    async def _call_with_retry(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Run one platform API call, retrying after rate-limit errors it raises."""
+        for _ in range(self._MAX_SEND_ATTEMPTS - 1):
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                if (delay := retry_after(e)) is None:
+                    raise
+                await self._backoff(delay)
+        return await fn(*args, **kwargs)
+
+    async def _stream_start(self, msg: OutboundMessage) -> Any:
+        """Send the first partial text of a stream; return a handle for later edits."""
+        raise NotImplementedError
+
+    async def _stream_edit(self, handle: Any, msg: OutboundMessage) -> None:
+        """Replace the text of a streamed message."""
+        raise NotImplementedError
+
+    async def _stream_delete(self, handle: Any, msg: OutboundMessage) -> None:
+        """Delete a streamed message whose final reply is sent another way."""
+        raise NotImplementedError
+
     def is_allowed(self, sender_id: str) -> bool:
         """
         Check if a sender is allowed to use this bot.
@@ -10,8 +10,9 @@ import httpx
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.channels.base import BaseChannel
+from nanobot.channels.base import BaseChannel, RateLimitProfile
 from nanobot.config.schema import DingTalkConfig
+from nanobot.utils.http_pool import get_http_client
 
 try:
     from dingtalk_stream import (
@@ -96,6 +97,8 @@ class DingTalkChannel(BaseChannel):
     """
 
     name = "dingtalk"
+    # Robot message APIs allow about 20 calls per second per app.
+    rate_limit = RateLimitProfile(global_rate=20, global_burst=20, chat_rate=1, chat_burst=5)
 
     def __init__(self, config: DingTalkConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -124,7 +127,7 @@ class DingTalkChannel(BaseChannel):
                 return
 
             self._running = True
-            self._http = httpx.AsyncClient()
+            self._http = get_http_client()
 
             logger.info(
                 "Initializing DingTalk Stream Client with Client ID: {}...",
@@ -155,10 +158,8 @@ class DingTalkChannel(BaseChannel):
     async def stop(self) -> None:
         """Stop the DingTalk bot."""
         self._running = False
-        # Close the shared HTTP client
-        if self._http:
-            await self._http.aclose()
-            self._http = None
+        # The HTTP client belongs to the shared pool; just drop the reference
+        self._http = None
         # Cancel outstanding background tasks
         for task in self._background_tasks:
             task.cancel()
@@ -218,7 +219,7 @@ class DingTalkChannel(BaseChannel):
             return
 
         try:
-            resp = await self._http.post(url, json=data, headers=headers)
+            resp = await self._call_with_retry(self._post, url, json=data, headers=headers)
             if resp.status_code != 200:
                 logger.error("DingTalk send failed: {}", resp.text)
             else:
@@ -226,6 +227,13 @@ class DingTalkChannel(BaseChannel):
         except Exception as e:
             logger.error("Error sending DingTalk message: {}", e)
 
+    async def _post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """POST to the DingTalk API, raising on 429 so the call can be retried."""
+        resp = await self._http.post(url, **kwargs)
+        if resp.status_code == 429:
+            resp.raise_for_status()
+        return resp
+
     async def _on_message(self, content: str, sender_id: str, sender_name: str) -> None:
         """Handle incoming message (called by NanobotDingTalkHandler).
 
@@ -11,13 +11,15 @@ from loguru import logger
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.channels.base import BaseChannel
+from nanobot.channels.base import BaseChannel, RateLimitProfile
 from nanobot.config.schema import DiscordConfig
+from nanobot.utils.http_pool import get_http_client
 
 
 DISCORD_API_BASE = "https://discord.com/api/v10"
 MAX_ATTACHMENT_BYTES = 20 * 1024 * 1024  # 20MB
 MAX_MESSAGE_LEN = 2000  # Discord message character limit
+HTTP_TIMEOUT_S = 30.0  # per request; the shared pool defaults to 60s
 
 
 def _split_message(content: str, max_len: int = MAX_MESSAGE_LEN) -> list[str]:
@@ -46,6 +48,10 @@ class DiscordChannel(BaseChannel):
     """Discord channel using Gateway websocket."""
 
     name = "discord"
+    supports_streaming = True
+    stream_max_chars = MAX_MESSAGE_LEN
+    # 50 requests/s per bot; 5 messages per 5 s in a channel.
+    rate_limit = RateLimitProfile(global_rate=50, global_burst=50, chat_rate=1, chat_burst=5)
 
     def __init__(self, config: DiscordConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -63,7 +69,7 @@ class DiscordChannel(BaseChannel):
             return
 
         self._running = True
-        self._http = httpx.AsyncClient(timeout=30.0)
+        self._http = get_http_client()
 
         while self._running:
             try:
@@ -91,9 +97,7 @@ class DiscordChannel(BaseChannel):
         if self._ws:
             await self._ws.close()
             self._ws = None
-        if self._http:
-            await self._http.aclose()
-            self._http = None
+        self._http = None  # Shared pool client; closed by close_http_pool()
 
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Discord REST API."""
@@ -105,6 +109,9 @@ class DiscordChannel(BaseChannel):
         headers = {"Authorization": f"Bot {self.config.token}"}
 
         try:
+            if await self._send_streamed(msg):
+                return
+
             chunks = _split_message(msg.content or "")
             if not chunks:
                 return
@@ -117,32 +124,56 @@ class DiscordChannel(BaseChannel):
                     payload["message_reference"] = {"message_id": msg.reply_to}
                     payload["allowed_mentions"] = {"replied_user": False}
 
-                if not await self._send_payload(url, headers, payload):
+                if await self._send_payload(url, headers, payload) is None:
                     break  # Abort remaining chunks on failure
         finally:
             await self._stop_typing(msg.chat_id)
 
+    async def _stream_start(self, msg: OutboundMessage) -> str | None:
+        url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
+        payload: dict[str, Any] = {"content": msg.content}
+        if msg.reply_to:
+            payload["message_reference"] = {"message_id": msg.reply_to}
+            payload["allowed_mentions"] = {"replied_user": False}
+        sent = await self._send_payload(url, {"Authorization": f"Bot {self.config.token}"}, payload)
+        return sent.get("id") if sent else None
+
+    async def _stream_edit(self, message_id: str, msg: OutboundMessage) -> None:
+        url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages/{message_id}"
+        headers = {"Authorization": f"Bot {self.config.token}"}
+        if await self._send_payload(url, headers, {"content": msg.content}, method="PATCH") is None:
+            raise RuntimeError(f"could not edit Discord message {message_id}")
+
+    async def _stream_delete(self, message_id: str, msg: OutboundMessage) -> None:
+        url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages/{message_id}"
+        headers = {"Authorization": f"Bot {self.config.token}"}
+        if await self._send_payload(url, headers, {}, method="DELETE") is None:
+            raise RuntimeError(f"could not delete Discord message {message_id}")
+
     async def _send_payload(
-        self, url: str, headers: dict[str, str], payload: dict[str, Any]
-    ) -> bool:
-        """Send a single Discord API payload with retry on rate-limit. Returns True on success."""
+        self, url: str, headers: dict[str, str], payload: dict[str, Any], method: str = "POST"
+    ) -> dict[str, Any] | None:
+        """Send a single Discord API payload with retry on rate-limit. Returns the message on success."""
         for attempt in range(3):
             try:
-                response = await self._http.post(url, headers=headers, json=payload)
+                response = await self._http.request(
+                    method, url, headers=headers, json=payload, timeout=HTTP_TIMEOUT_S,
+                )
                 if response.status_code == 429:
                     data = response.json()
-                    retry_after = float(data.get("retry_after", 1.0))
-                    logger.warning("Discord rate limited, retrying in {}s", retry_after)
-                    await asyncio.sleep(retry_after)
+                    await self._backoff(float(data.get("retry_after", 1.0)))
                     continue
                 response.raise_for_status()
-                return True
+                try:
+                    return response.json()
+                except ValueError:
+                    return {}
             except Exception as e:
                 if attempt == 2:
                     logger.error("Error sending Discord message: {}", e)
                 else:
                     await asyncio.sleep(1)
-        return False
+        return None
 
     async def _gateway_loop(self) -> None:
         """Main gateway loop: identify, heartbeat, dispatch events."""
@@ -250,7 +281,7 @@ class DiscordChannel(BaseChannel):
             try:
                 media_dir.mkdir(parents=True, exist_ok=True)
                 file_path = media_dir / f"{attachment.get('id', 'file')}_{filename.replace('/', '_')}"
-                resp = await self._http.get(url)
+                resp = await self._http.get(url, timeout=HTTP_TIMEOUT_S)
                 resp.raise_for_status()
                 file_path.write_bytes(resp.content)
                 media_paths.append(str(file_path))
@@ -284,7 +315,7 @@ class DiscordChannel(BaseChannel):
             headers = {"Authorization": f"Bot {self.config.token}"}
             while self._running:
                 try:
-                    await self._http.post(url, headers=headers)
+                    await self._http.post(url, headers=headers, timeout=HTTP_TIMEOUT_S)
                 except asyncio.CancelledError:
                     return
                 except Exception as e:
@@ -13,7 +13,7 @@ from loguru import logger
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.channels.base import BaseChannel
+from nanobot.channels.base import BaseChannel, RateLimitProfile
 from nanobot.config.schema import FeishuConfig
 
 try:
@@ -27,10 +27,13 @@ try:
         CreateMessageRequestBody,
         CreateMessageReactionRequest,
         CreateMessageReactionRequestBody,
+        DeleteMessageRequest,
         Emoji,
         GetFileRequest,
         GetMessageResourceRequest,
         P2ImMessageReceiveV1,
+        PatchMessageRequest,
+        PatchMessageRequestBody,
     )
     FEISHU_AVAILABLE = True
 except ImportError:
@@ -38,6 +41,9 @@ except ImportError:
     lark = None
     Emoji = None
 
+# Open Platform error code for "request trigger frequency limit"
+_RATE_LIMITED_CODE = 99991400
+
 # Message type display mapping
 MSG_TYPE_MAP = {
     "image": "[image]",
@@ -258,6 +264,9 @@ class FeishuChannel(BaseChannel):
     """
     
     name = "feishu"
+    supports_streaming = True
+    # im/v1/messages: 50 calls/s per app, 5/s to one user or group.
+    rate_limit = RateLimitProfile(global_rate=50, global_burst=50, chat_rate=5, chat_burst=5)
     
     def __init__(self, config: FeishuConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -604,6 +613,10 @@ class FeishuChannel(BaseChannel):
 
     def _send_message_sync(self, receive_id_type: str, receive_id: str, msg_type: str, content: str) -> bool:
         """Send a single message (text/image/file/interactive) synchronously."""
+        return self._create_message_sync(receive_id_type, receive_id, msg_type, content) is not None
+
+    def _create_message_sync(self, receive_id_type: str, receive_id: str, msg_type: str, content: str) -> Any:
+        """Create a message and return the API response, or None on failure."""
         try:
             request = CreateMessageRequest.builder() \
                 .receive_id_type(receive_id_type) \
@@ -615,17 +628,59 @@ class FeishuChannel(BaseChannel):
                     .build()
                 ).build()
             response = self._client.im.v1.message.create(request)
+            if response.code == _RATE_LIMITED_CODE and self._loop:
+                self._loop.call_soon_threadsafe(self.rate_limiter.pause, 1.0)
             if not response.success():
                 logger.error(
                     "Failed to send Feishu {} message: code={}, msg={}, log_id={}",
                     msg_type, response.code, response.msg, response.get_log_id()
                 )
-                return False
+                return None
             logger.debug("Feishu {} message sent to {}", msg_type, receive_id)
-            return True
+            return response
         except Exception as e:
             logger.error("Error sending Feishu {} message: {}", msg_type, e)
-            return False
+            return None
+
+    def _card_json(self, content: str, updatable: bool = False) -> str:
+        """Render markdown content as an interactive card payload."""
+        config: dict[str, Any] = {"wide_screen_mode": True}
+        if updatable:
+            config["update_multi"] = True  # required for later PATCH edits
+        return json.dumps({"config": config, "elements": self._build_card_elements(content)}, ensure_ascii=False)
+
+    def _patch_card_sync(self, message_id: str, content: str) -> None:
+        """Replace the card content of a sent message."""
+        request = PatchMessageRequest.builder() \
+            .message_id(message_id) \
+            .request_body(PatchMessageRequestBody.builder().content(content).build()) \
+            .build()
+        response = self._client.im.v1.message.patch(request)
+        if not response.success():
+            raise RuntimeError(f"code={response.code}, msg={response.msg}")
+
+    def _delete_message_sync(self, message_id: str) -> None:
+        """Recall a sent message."""
+        request = DeleteMessageRequest.builder().message_id(message_id).build()
+        response = self._client.im.v1.message.delete(request)
+        if not response.success():
+            raise RuntimeError(f"code={response.code}, msg={response.msg}")
+
+    async def _stream_start(self, msg: OutboundMessage) -> str | None:
+        receive_id_type = "chat_id" if msg.chat_id.startswith("oc_") else "open_id"
+        response = await asyncio.get_running_loop().run_in_executor(
+            None, self._create_message_sync,
+            receive_id_type, msg.chat_id, "interactive", self._card_json(msg.content, updatable=True),
+        )
+        return getattr(getattr(response, "data", None), "message_id", None)
+
+    async def _stream_edit(self, message_id: str, msg: OutboundMessage) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._patch_card_sync, message_id, self._card_json(msg.content, updatable=True),
+        )
+
+    async def _stream_delete(self, message_id: str, msg: OutboundMessage) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self._delete_message_sync, message_id)
 
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Feishu, including media (images/files) if present."""
@@ -634,6 +689,9 @@ class FeishuChannel(BaseChannel):
             return
 
         try:
+            if await self._send_streamed(msg):
+                return
+
             receive_id_type = "chat_id" if msg.chat_id.startswith("oc_") else "open_id"
             loop = asyncio.get_running_loop()
 
@@ -668,10 +726,9 @@ class FeishuChannel(BaseChannel):
                         )
 
             if msg.content and msg.content.strip():
-                card = {"config": {"wide_screen_mode": True}, "elements": self._build_card_elements(msg.content)}
                 await loop.run_in_executor(
                     None, self._send_message_sync,
-                    receive_id_type, msg.chat_id, "interactive", json.dumps(card, ensure_ascii=False),
+                    receive_id_type, msg.chat_id, "interactive", self._card_json(msg.content),
                 )
 
         except Exception as e:
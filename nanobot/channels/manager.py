@@ -10,7 +10,9 @@ from loguru import logger
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.outbox import ChannelOutbox
 from nanobot.config.schema import Config
+from nanobot.utils import metrics, tracing
 
 
 class ChannelManager:
@@ -20,7 +22,8 @@ class ChannelManager:
     Responsibilities:
     - Initialize enabled channels (Telegram, WhatsApp, etc.)
     - Start/stop channels
-    - Route outbound messages
+    - Route outbound messages, through one ChannelOutbox per channel so a
+      slow or rate-limited channel only delays its own deliveries
     """
     
     def __init__(self, config: Config, bus: MessageBus):
@@ -30,6 +33,20 @@ class ChannelManager:
         self._dispatch_task: asyncio.Task | None = None
         
         self._init_channels()
+        self.outboxes = {name: self._make_outbox(name) for name in self.channels}
+    
+    def _make_outbox(self, name: str) -> ChannelOutbox:
+        outbound = self.config.channels.outbound
+        outbox = ChannelOutbox(
+            name,
+            self._send,
+            concurrency=outbound.concurrency,
+            max_queue=outbound.max_queue,
+            coalesce_progress=outbound.coalesce_progress,
+            throttle=self.channels[name].throttle if outbound.rate_limit else None,
+        )
+        metrics.CHANNEL_OUTBOUND_QUEUE.set_function(lambda: outbox.depth, name)
+        return outbox
     
     def _init_channels(self) -> None:
         """Initialize channels based on config."""
@@ -173,6 +190,8 @@ class ChannelManager:
                 await self._dispatch_task
             except asyncio.CancelledError:
                 pass
+        for outbox in self.outboxes.values():
+            await outbox.close()
         
         # Stop all channels
         for name, channel in self.channels.items():
@@ -200,11 +219,14 @@ class ChannelManager:
                         continue
                 
                 channel = self.channels.get(msg.channel)
+                if msg.metadata.get("_status_id") and channel and channel.supports_streaming:
+                    if self.config.channels.edit_progress:
+                        msg = self._as_status_edit(msg)
+                if msg.metadata.get("_streaming") and not (channel and channel.supports_streaming):
+                    continue
+
                 if channel:
-                    try:
-                        await channel.send(msg)
-                    except Exception as e:
-                        logger.error("Error sending to {}: {}", msg.channel, e)
+                    self.outboxes[msg.channel].put(msg)
                 else:
                     logger.warning("Unknown channel: {}", msg.channel)
                     
@@ -213,6 +235,30 @@ class ChannelManager:
             except asyncio.CancelledError:
                 break
     
+    @staticmethod
+    def _as_status_edit(msg: OutboundMessage) -> OutboundMessage:
+        """Turn a progress update into an edit of the turn's status message."""
+        metadata = dict(msg.metadata)
+        metadata["_stream_id"] = metadata["_status_id"]
+        metadata["_streaming"] = True
+        return OutboundMessage(
+            channel=msg.channel,
+            chat_id=msg.chat_id,
+            content=metadata.get("_status_text") or msg.content,
+            metadata=metadata,
+        )
+
+    async def _send(self, msg: OutboundMessage) -> None:
+        """Deliver one message (called by the channel's outbox)."""
+        channel = self.channels[msg.channel]
+        try:
+            with tracing.span("channel.send", parent=msg.metadata.get("_traceparent"), channel=msg.channel):
+                await channel.send(msg)
+            metrics.CHANNEL_SENT.inc(msg.channel)
+        except Exception as e:
+            metrics.CHANNEL_SEND_FAILURES.inc(msg.channel)
+            logger.error("Error sending to {}: {}", msg.channel, e)
+
     def get_channel(self, name: str) -> BaseChannel | None:
         """Get a channel by name."""
         return self.channels.get(name)
@@ -17,6 +17,7 @@ from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import MochatConfig
 from nanobot.utils.helpers import get_data_path
+from nanobot.utils.http_pool import get_http_client
 
 try:
     import socketio
@@ -33,6 +34,7 @@ except ImportError:
 
 MAX_SEEN_MESSAGE_IDS = 2000
 CURSOR_SAVE_DEBOUNCE_S = 0.5
+HTTP_TIMEOUT_S = 30.0  # per request; the shared pool defaults to 60s
 
 
 # ---------------------------------------------------------------------------
@@ -255,7 +257,7 @@ class MochatChannel(BaseChannel):
             return
 
         self._running = True
-        self._http = httpx.AsyncClient(timeout=30.0)
+        self._http = get_http_client()
         self._state_dir.mkdir(parents=True, exist_ok=True)
         await self._load_session_cursors()
         self._seed_targets_from_config()
@@ -290,9 +292,7 @@ class MochatChannel(BaseChannel):
             self._cursor_save_task = None
         await self._save_session_cursors()
 
-        if self._http:
-            await self._http.aclose()
-            self._http = None
+        self._http = None  # Shared pool client; closed by close_http_pool()
         self._ws_connected = self._ws_ready = False
 
     async def send(self, msg: OutboundMessage) -> None:
@@ -862,7 +862,7 @@ class MochatChannel(BaseChannel):
         url = f"{self.config.base_url.strip().rstrip('/')}{path}"
         response = await self._http.post(url, headers={
             "Content-Type": "application/json", "X-Claw-Token": self.config.claw_token,
-        }, json=payload)
+        }, json=payload, timeout=HTTP_TIMEOUT_S)
         if not response.is_success:
             raise RuntimeError(f"Mochat HTTP {response.status_code}: {response.text[:200]}")
         try:
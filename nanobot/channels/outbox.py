@@ -0,0 +1,129 @@
+"""Per-channel outbound queues, so one slow channel cannot delay the others."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.utils import metrics
+
+
+def _is_partial(msg: OutboundMessage) -> bool:
+    return bool(msg.metadata.get("_streaming") and msg.metadata.get("_stream_id"))
+
+
+def _is_progress(msg: OutboundMessage) -> bool:
+    return bool(msg.metadata.get("_progress"))
+
+
+class ChannelOutbox:
+    """
+    Deliver one channel's outbound messages.
+
+    Each chat has its own lane so messages to a chat keep their order, while
+    up to ``concurrency`` chats are sent to at once. ``put`` never blocks:
+
+    - a partial stream update replaces a queued update of the same stream
+      (each carries the full text so far);
+    - with ``coalesce_progress``, a progress message replaces a queued
+      progress message for the same chat, unless a reply is queued after it;
+    - once ``max_queue`` messages are waiting, new progress messages are
+      dropped. Replies are always queued.
+
+    ``throttle``, if given, is awaited before a message takes a send slot, so
+    a chat held back by rate limits does not block the others.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        send: Callable[[OutboundMessage], Awaitable[None]],
+        *,
+        concurrency: int = 4,
+        max_queue: int = 100,
+        coalesce_progress: bool = True,
+        throttle: Callable[[OutboundMessage], Awaitable[None]] | None = None,
+    ):
+        self.name = name
+        self._send = send
+        self._throttle = throttle
+        self.max_queue = max(1, max_queue)
+        self.coalesce_progress = coalesce_progress
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self._lanes: dict[str, deque[OutboundMessage]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.depth = 0
+
+    def put(self, msg: OutboundMessage) -> bool:
+        """Queue ``msg`` for delivery. Returns False if it was dropped or merged into a queued message."""
+        lane = self._lanes.setdefault(msg.chat_id, deque())
+        if _is_partial(msg) or (self.coalesce_progress and _is_progress(msg)):
+            i = self._coalesce_index(lane, msg)
+            if i is not None:
+                lane[i] = msg
+                metrics.CHANNEL_OUTBOUND_DROPPED.inc(self.name, "coalesced")
+                return False
+        if _is_progress(msg) and self.depth >= self.max_queue:
+            metrics.CHANNEL_OUTBOUND_DROPPED.inc(self.name, "full")
+            logger.debug("Outbound queue for {} is full, dropping progress message", self.name)
+            return False
+
+        lane.append(msg)
+        self.depth += 1
+        if msg.chat_id not in self._tasks:
+            self._tasks[msg.chat_id] = asyncio.create_task(self._drain(msg.chat_id))
+        return True
+
+    @staticmethod
+    def _coalesce_index(lane: deque[OutboundMessage], msg: OutboundMessage) -> int | None:
+        """Index of the queued message ``msg`` may replace, if any."""
+        if _is_partial(msg):
+            stream_id = msg.metadata["_stream_id"]
+            for i, queued in enumerate(lane):
+                if _is_partial(queued) and queued.metadata["_stream_id"] == stream_id:
+                    return i
+            return None
+        # Progress only merges into the trailing run of progress and partial
+        # stream updates; jumping past a reply would reorder the chat.
+        tool_hint = bool(msg.metadata.get("_tool_hint"))
+        for i in range(len(lane) - 1, -1, -1):
+            queued = lane[i]
+            if _is_partial(queued):
+                continue
+            if not _is_progress(queued):
+                return None
+            if bool(queued.metadata.get("_tool_hint")) == tool_hint:
+                return i
+        return None
+
+    async def _drain(self, chat_id: str) -> None:
+        lane = self._lanes[chat_id]
+        try:
+            while lane:
+                msg = lane.popleft()
+                self.depth -= 1
+                if self._throttle is not None:
+                    await self._throttle(msg)
+                async with self._slots:
+                    try:
+                        await self._send(msg)
+                    except Exception as e:
+                        logger.error("Error sending to {}: {}", self.name, e)
+        finally:
+            self._tasks.pop(chat_id, None)
+            if lane:
+                # Cancelled mid-lane: forget what was left.
+                self.depth -= len(lane)
+                lane.clear()
+            self._lanes.pop(chat_id, None)
+
+    async def close(self) -> None:
+        """Cancel pending deliveries."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -8,7 +8,7 @@ from loguru import logger
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.channels.base import BaseChannel
+from nanobot.channels.base import BaseChannel, RateLimitProfile
 from nanobot.config.schema import QQConfig
 
 try:
@@ -49,6 +49,8 @@ class QQChannel(BaseChannel):
     """QQ channel using botpy SDK with WebSocket connection."""
 
     name = "qq"
+    # Bots get a handful of passive replies per user message; keep bursts small.
+    rate_limit = RateLimitProfile(global_rate=20, global_burst=20, chat_rate=1, chat_burst=5)
 
     def __init__(self, config: QQConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -100,7 +102,8 @@ class QQChannel(BaseChannel):
             logger.warning("QQ client not initialized")
             return
         try:
-            await self._client.api.post_c2c_message(
+            await self._call_with_retry(
+                self._client.api.post_c2c_message,
                 openid=msg.chat_id,
                 msg_type=0,
                 content=msg.content,
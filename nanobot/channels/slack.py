@@ -14,7 +14,7 @@ from slackify_markdown import slackify_markdown
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.channels.base import BaseChannel
+from nanobot.channels.base import BaseChannel, RateLimitProfile
 from nanobot.config.schema import SlackConfig
 
 
@@ -22,6 +22,10 @@ class SlackChannel(BaseChannel):
     """Slack channel using Socket Mode."""
 
     name = "slack"
+    supports_streaming = True
+    stream_max_chars = 40000
+    # chat.postMessage allows about one message per second per channel.
+    rate_limit = RateLimitProfile(global_rate=5, global_burst=10, chat_rate=1, chat_burst=3)
 
     def __init__(self, config: SlackConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -79,15 +83,14 @@ class SlackChannel(BaseChannel):
             logger.warning("Slack client not running")
             return
         try:
-            slack_meta = msg.metadata.get("slack", {}) if msg.metadata else {}
-            thread_ts = slack_meta.get("thread_ts")
-            channel_type = slack_meta.get("channel_type")
-            # Only reply in thread for channel/group messages; DMs don't use threads
-            use_thread = thread_ts and channel_type != "im"
-            thread_ts_param = thread_ts if use_thread else None
+            if await self._send_streamed(msg):
+                return
+
+            thread_ts_param = self._thread_ts(msg)
 
             if msg.content:
-                await self._web_client.chat_postMessage(
+                await self._call_with_retry(
+                    self._web_client.chat_postMessage,
                     channel=msg.chat_id,
                     text=self._to_mrkdwn(msg.content),
                     thread_ts=thread_ts_param,
@@ -105,6 +108,33 @@ class SlackChannel(BaseChannel):
         except Exception as e:
             logger.error("Error sending Slack message: {}", e)
 
+    @staticmethod
+    def _thread_ts(msg: OutboundMessage) -> str | None:
+        """Return the thread to reply in, if any."""
+        slack_meta = msg.metadata.get("slack", {}) if msg.metadata else {}
+        thread_ts = slack_meta.get("thread_ts")
+        channel_type = slack_meta.get("channel_type")
+        # Only reply in thread for channel/group messages; DMs don't use threads
+        return thread_ts if thread_ts and channel_type != "im" else None
+
+    async def _stream_start(self, msg: OutboundMessage) -> tuple[str, str] | None:
+        response = await self._web_client.chat_postMessage(
+            channel=msg.chat_id,
+            text=self._to_mrkdwn(msg.content),
+            thread_ts=self._thread_ts(msg),
+        )
+        # chat_update needs the resolved conversation ID, which differs from chat_id for DMs by user ID.
+        ts = response.get("ts")
+        return (response.get("channel") or msg.chat_id, ts) if ts else None
+
+    async def _stream_edit(self, handle: tuple[str, str], msg: OutboundMessage) -> None:
+        channel, ts = handle
+        await self._web_client.chat_update(channel=channel, ts=ts, text=self._to_mrkdwn(msg.content))
+
+    async def _stream_delete(self, handle: tuple[str, str], msg: OutboundMessage) -> None:
+        channel, ts = handle
+        await self._web_client.chat_delete(channel=channel, ts=ts)
+
     async def _on_socket_request(
         self,
         client: SocketModeClient,
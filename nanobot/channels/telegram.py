@@ -6,12 +6,13 @@ import asyncio
 import re
 from loguru import logger
 from telegram import BotCommand, Update, ReplyParameters
+from telegram.error import BadRequest
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 from telegram.request import HTTPXRequest
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.channels.base import BaseChannel
+from nanobot.channels.base import BaseChannel, RateLimitProfile
 from nanobot.config.schema import TelegramConfig
 
 
@@ -106,6 +107,10 @@ class TelegramChannel(BaseChannel):
     """
     
     name = "telegram"
+    supports_streaming = True
+    stream_max_chars = 4000
+    # Bot API: ~30 messages/s overall and about one per second in a chat.
+    rate_limit = RateLimitProfile(global_rate=30, global_burst=30, chat_rate=1, chat_burst=3)
     
     # Commands registered with Telegram's command menu
     BOT_COMMANDS = [
@@ -210,6 +215,49 @@ class TelegramChannel(BaseChannel):
             return "audio"
         return "document"
 
+    def _reply_parameters(self, msg: OutboundMessage) -> ReplyParameters | None:
+        """Reply to the triggering message when reply_to_message is enabled."""
+        if not self.config.reply_to_message:
+            return None
+        reply_to_message_id = msg.metadata.get("message_id")
+        if not reply_to_message_id:
+            return None
+        return ReplyParameters(
+            message_id=reply_to_message_id,
+            allow_sending_without_reply=True
+        )
+
+    async def _stream_start(self, msg: OutboundMessage) -> int:
+        sent = await self._app.bot.send_message(
+            chat_id=int(msg.chat_id),
+            text=msg.content,
+            reply_parameters=self._reply_parameters(msg),
+        )
+        return sent.message_id
+
+    async def _stream_edit(self, message_id: int, msg: OutboundMessage) -> None:
+        chat_id = int(msg.chat_id)
+        try:
+            await self._app.bot.edit_message_text(
+                chat_id=chat_id,
+                message_id=message_id,
+                text=_markdown_to_telegram_html(msg.content),
+                parse_mode="HTML",
+            )
+            return
+        except BadRequest as e:
+            if "not modified" in str(e).lower():
+                return
+            logger.debug("HTML edit failed, falling back to plain text: {}", e)
+        try:
+            await self._app.bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=msg.content)
+        except BadRequest as e:
+            if "not modified" not in str(e).lower():
+                raise
+
+    async def _stream_delete(self, message_id: int, msg: OutboundMessage) -> None:
+        await self._app.bot.delete_message(chat_id=int(msg.chat_id), message_id=message_id)
+
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Telegram."""
         if not self._app:
@@ -218,20 +266,16 @@ class TelegramChannel(BaseChannel):
 
         self._stop_typing(msg.chat_id)
 
+        if await self._send_streamed(msg):
+            return
+
         try:
             chat_id = int(msg.chat_id)
         except ValueError:
             logger.error("Invalid chat_id: {}", msg.chat_id)
             return
 
-        reply_params = None
-        if self.config.reply_to_message:
-            reply_to_message_id = msg.metadata.get("message_id")
-            if reply_to_message_id:
-                reply_params = ReplyParameters(
-                    message_id=reply_to_message_id,
-                    allow_sending_without_reply=True
-                )
+        reply_params = self._reply_parameters(msg)
 
         # Send media files
         for media_path in (msg.media or []):
@@ -263,7 +307,8 @@ class TelegramChannel(BaseChannel):
             for chunk in _split_message(msg.content):
                 try:
                     html = _markdown_to_telegram_html(chunk)
-                    await self._app.bot.send_message(
+                    await self._call_with_retry(
+                        self._app.bot.send_message,
                         chat_id=chat_id, 
                         text=html, 
                         parse_mode="HTML",
@@ -272,7 +317,8 @@ class TelegramChannel(BaseChannel):
                 except Exception as e:
                     logger.warning("HTML parse failed, falling back to plain text: {}", e)
                     try:
-                        await self._app.bot.send_message(
+                        await self._call_with_retry(
+                            self._app.bot.send_message,
                             chat_id=chat_id, 
                             text=chunk,
                             reply_parameters=reply_params
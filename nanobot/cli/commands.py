@@ -230,12 +230,49 @@ def _create_workspace_templates(workspace: Path):
 
 
 def _make_provider(config: Config):
-    """Create the appropriate LLM provider from config."""
+    """
+    Create the LLM provider from config, wrapped to record request metrics.
+
+    With fallback models configured, each model gets its own provider and the
+    chain is wrapped in a FailoverProvider. Each backend has its own adaptive
+    concurrency limit unless admission control is disabled. With hedging on,
+    the result is wrapped once more to duplicate slow requests.
+    """
+    from nanobot.providers.admission import AdmissionProvider
+    from nanobot.providers.failover import FailoverProvider
+    from nanobot.providers.hedging import HedgedProvider
+    from nanobot.providers.metered import MeteredProvider
+
+    defaults = config.agents.defaults
+
+    def backend(model: str):
+        provider = MeteredProvider(_build_provider(config, model), config.get_provider_name(model))
+        if defaults.admission.enabled:
+            provider = AdmissionProvider(provider, defaults.admission, model)
+        return provider
+
+    backends = {model: backend(model) for model in [defaults.model, *defaults.failover.models]}
+    if len(backends) == 1:
+        provider = backends[defaults.model]
+    else:
+        provider = FailoverProvider([(p, m) for m, p in backends.items()], defaults.failover)
+
+    hedging = defaults.hedging
+    if not hedging.enabled:
+        return provider
+    if not hedging.model:
+        return HedgedProvider(provider, hedging)
+    secondary = backends.get(hedging.model) or backend(hedging.model)
+    return HedgedProvider(provider, hedging, secondary, hedging.model)
+
+
+def _build_provider(config: Config, model: str | None = None):
+    """Create the appropriate LLM provider for ``model`` (default: the agent's model)."""
     from nanobot.providers.litellm_provider import LiteLLMProvider
     from nanobot.providers.openai_codex_provider import OpenAICodexProvider
     from nanobot.providers.custom_provider import CustomProvider
 
-    model = config.agents.defaults.model
+    model = model or config.agents.defaults.model
     provider_name = config.get_provider_name(model)
     p = config.get_provider(model)
 
@@ -286,6 +323,10 @@ def gateway(
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
+    from nanobot.agent.tools.browser import close_browser_pool
+    from nanobot.utils import metrics
+    from nanobot.utils.http_pool import close_http_pool, configure_http_pool
+    from nanobot.utils.tracing import configure_tracing, shutdown_tracing
     
     if verbose:
         import logging
@@ -294,6 +335,8 @@ def gateway(
     console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
     
     config = load_config()
+    configure_http_pool(config.http)
+    configure_tracing(config.tracing, get_data_dir() / "traces" / "spans.jsonl")
     bus = MessageBus()
     provider = _make_provider(config)
     session_manager = SessionManager(config.workspace_path)
@@ -312,9 +355,15 @@ def gateway(
         max_tokens=config.agents.defaults.max_tokens,
         max_iterations=config.agents.defaults.max_tool_iterations,
         memory_window=config.agents.defaults.memory_window,
+        context_window_tokens=config.agents.defaults.context_window_tokens,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        max_queued_per_session=config.agents.defaults.max_queued_per_session,
+        consolidation_config=config.agents.defaults.consolidation,
+        memory_recall_config=config.agents.defaults.memory_recall,
         brave_api_key=config.tools.web.search.providers.brave.api_key or config.tools.web.search.api_key or None,
         web_search_config=config.tools.web.search,
         web_browser_config=config.tools.web.browser,
+        web_cache_config=config.tools.web.cache,
         exec_config=config.tools.exec,
         codex_config=config.tools.codex,
         cron_service=cron,
@@ -408,9 +457,30 @@ def gateway(
         console.print(f"[green]✓[/green] Cron: {cron_status['jobs']} scheduled jobs")
     
     console.print(f"[green]✓[/green] Heartbeat: every {hb_cfg.interval_s}s")
+
+    metrics_server = None
+    if config.gateway.metrics_enabled:
+        metrics.BUS_INBOUND.set_function(lambda: bus.inbound_size)
+        metrics.BUS_OUTBOUND.set_function(lambda: bus.outbound_size)
+        metrics_server = metrics.MetricsServer(
+            config.gateway.metrics_host,
+            port,
+            health=lambda: {
+                "inbound": bus.inbound_size,
+                "outbound": bus.outbound_size,
+                "channels": channels.get_status(),
+                "cron": cron.status(),
+            },
+        )
+        console.print(f"[green]✓[/green] Metrics: http://{config.gateway.metrics_host}:{port}/metrics")
     
     async def run():
         try:
+            if metrics_server:
+                try:
+                    await metrics_server.start()
+                except OSError as e:
+                    console.print(f"[yellow]Warning: metrics endpoint not started: {e}[/yellow]")
             await cron.start()
             await heartbeat.start()
             await asyncio.gather(
@@ -425,6 +495,11 @@ def gateway(
             cron.stop()
             agent.stop()
             await channels.stop_all()
+            await shutdown_tracing()
+            await close_http_pool()
+            await close_browser_pool()
+            if metrics_server:
+                await metrics_server.stop()
     
     asyncio.run(run())
 
@@ -448,9 +523,14 @@ def agent(
     from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
     from nanobot.cron.service import CronService
+    from nanobot.agent.tools.browser import close_browser_pool
+    from nanobot.utils.http_pool import close_http_pool, configure_http_pool
+    from nanobot.utils.tracing import configure_tracing, shutdown_tracing
     from loguru import logger
     
     config = load_config()
+    configure_http_pool(config.http)
+    configure_tracing(config.tracing, get_data_dir() / "traces" / "spans.jsonl")
     
     bus = MessageBus()
     provider = _make_provider(config)
@@ -473,9 +553,15 @@ def agent(
         max_tokens=config.agents.defaults.max_tokens,
         max_iterations=config.agents.defaults.max_tool_iterations,
         memory_window=config.agents.defaults.memory_window,
+        context_window_tokens=config.agents.defaults.context_window_tokens,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        max_queued_per_session=config.agents.defaults.max_queued_per_session,
+        consolidation_config=config.agents.defaults.consolidation,
+        memory_recall_config=config.agents.defaults.memory_recall,
         brave_api_key=config.tools.web.search.providers.brave.api_key or config.tools.web.search.api_key or None,
         web_search_config=config.tools.web.search,
         web_browser_config=config.tools.web.browser,
+        web_cache_config=config.tools.web.cache,
         exec_config=config.tools.exec,
         codex_config=config.tools.codex,
         cron_service=cron,
@@ -508,6 +594,9 @@ def agent(
                 response = await agent_loop.process_direct(message, session_id, on_progress=_cli_progress)
             _print_agent_response(response, render_markdown=markdown)
             await agent_loop.close_mcp()
+            await shutdown_tracing()
+            await close_http_pool()
+            await close_browser_pool()
 
         asyncio.run(run_once())
     else:
@@ -603,6 +692,9 @@ def agent(
                 outbound_task.cancel()
                 await asyncio.gather(bus_task, outbound_task, return_exceptions=True)
                 await agent_loop.close_mcp()
+                await shutdown_tracing()
+                await close_http_pool()
+                await close_browser_pool()
 
         asyncio.run(run_interactive())
 
@@ -954,9 +1046,14 @@ def cron_run(
     from nanobot.cron.types import CronJob
     from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
+    from nanobot.agent.tools.browser import close_browser_pool
+    from nanobot.utils.http_pool import close_http_pool, configure_http_pool
+    from nanobot.utils.tracing import configure_tracing, shutdown_tracing
     logger.disable("nanobot")
 
     config = load_config()
+    configure_http_pool(config.http)
+    configure_tracing(config.tracing, get_data_dir() / "traces" / "spans.jsonl")
     provider = _make_provider(config)
     bus = MessageBus()
     agent_loop = AgentLoop(
@@ -968,9 +1065,15 @@ def cron_run(
         max_tokens=config.agents.defaults.max_tokens,
         max_iterations=config.agents.defaults.max_tool_iterations,
         memory_window=config.agents.defaults.memory_window,
+        context_window_tokens=config.agents.defaults.context_window_tokens,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        max_queued_per_session=config.agents.defaults.max_queued_per_session,
+        consolidation_config=config.agents.defaults.consolidation,
+        memory_recall_config=config.agents.defaults.memory_recall,
         brave_api_key=config.tools.web.search.providers.brave.api_key or config.tools.web.search.api_key or None,
         web_search_config=config.tools.web.search,
         web_browser_config=config.tools.web.browser,
+        web_cache_config=config.tools.web.cache,
         exec_config=config.tools.exec,
         codex_config=config.tools.codex,
         restrict_to_workspace=config.tools.restrict_to_workspace,
@@ -997,7 +1100,13 @@ def cron_run(
     service.on_job = on_job
 
     async def run():
-        return await service.run_job(job_id, force=force)
+        try:
+            return await service.run_job(job_id, force=force)
+        finally:
+            await agent_loop.close_mcp()
+            await shutdown_tracing()
+            await close_http_pool()
+            await close_browser_pool()
 
     if asyncio.run(run()):
         console.print("[green]✓[/green] Job executed")
@@ -1049,6 +1158,39 @@ def status():
                 console.print(f"{spec.label}: {'[green]✓[/green]' if has_key else '[dim]not set[/dim]'}")
 
 
+@app.command()
+def traces(
+    limit: int = typer.Option(5, "--limit", "-n", help="How many of the slowest turns to show"),
+    recent: int = typer.Option(100, "--recent", help="Only consider this many most recent turns"),
+    file: Path = typer.Option(None, "--file", "-f", help="Trace file (default: from config)"),
+):
+    """Show a flame-style time breakdown of the slowest recent turns."""
+    from datetime import datetime
+
+    from nanobot.config.loader import get_data_dir, load_config
+    from nanobot.utils.tracing import load_spans, render_flame, slowest_traces
+
+    if file is None:
+        cfg = load_config().tracing
+        file = Path(cfg.file).expanduser() if cfg.file else get_data_dir() / "traces" / "spans.jsonl"
+    if not file.exists():
+        console.print(
+            f"No trace file at {file}. Set \"tracing\": {{\"enabled\": true}} in the config "
+            "and traces are written while the agent or gateway runs."
+        )
+        return
+
+    turns = slowest_traces(load_spans(file), recent=recent, limit=limit)
+    if not turns:
+        console.print(f"No turns recorded in {file}.")
+        return
+    for turn in turns:
+        started = datetime.fromtimestamp(turn.start_ns / 1e9).strftime("%Y-%m-%d %H:%M:%S")
+        console.print(Text(f"\n{started}  {turn.attributes.get('session_key', '?')}  {turn.duration_ms / 1000:.2f}s", style="bold"))
+        for line in render_flame(turn, width=max(10, console.width - 56)):
+            console.print(Text(line), no_wrap=True, overflow="ignore")
+
+
 # ============================================================================
 # OAuth Login
 # ============================================================================
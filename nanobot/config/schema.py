@@ -166,11 +166,24 @@ class QQConfig(Base):
     allow_from: list[str] = Field(default_factory=list)  # Allowed user openids (empty = public access)
 
 
+class OutboundConfig(Base):
+    """Per-channel outbound delivery queues."""
+
+    concurrency: int = 4  # Chats sent to at once per channel; messages to one chat stay in order
+    max_queue: int = 100  # Waiting messages per channel before progress messages are dropped
+    coalesce_progress: bool = True  # A newer progress message replaces an unsent one for the same chat
+    rate_limit: bool = True  # Pace sends to each platform's limits; replies go before progress
+
+
 class ChannelsConfig(Base):
     """Configuration for chat channels."""
 
     send_progress: bool = True    # stream agent's text progress to the channel
     send_tool_hints: bool = False  # stream tool-call hints (e.g. read_file("…"))
+    stream_replies: bool = False  # edit replies in place as they are generated (Telegram, Discord, Slack, Feishu)
+    progress_debounce_s: float = 2.0  # merge progress updates sent within this window; 0 = send each one
+    edit_progress: bool = True  # keep progress in one status message edited in place, where the channel can edit
+    outbound: OutboundConfig = Field(default_factory=OutboundConfig)
     whatsapp: WhatsAppConfig = Field(default_factory=WhatsAppConfig)
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
     discord: DiscordConfig = Field(default_factory=DiscordConfig)
@@ -182,6 +195,64 @@ class ChannelsConfig(Base):
     qq: QQConfig = Field(default_factory=QQConfig)
 
 
+class ConsolidationConfig(Base):
+    """Background memory consolidation."""
+
+    max_queue: int = 64  # Sessions waiting for consolidation before new ones are deferred
+    max_concurrent: int = 1
+    max_retries: int = 3
+    retry_backoff_s: float = 5.0  # Doubles after each failed attempt
+    max_defer_s: float = 600.0  # Longest wait for interactive turns to finish; 0 = wait indefinitely
+    chunk_chars: int = 40000  # Conversation characters summarized per LLM call
+
+
+class MemoryRecallConfig(Base):
+    """Which MEMORY.md sections are put into each request."""
+
+    enabled: bool = True
+    max_tokens: int = 2000  # Memory injected per request; smaller MEMORY.md files go in whole
+    top_k: int = 6  # Sections recalled per message once memory outgrows max_tokens
+    pinned: list[str] = Field(default_factory=lambda: ["User Information", "Preferences"])  # Always included
+    history_messages: int = 4  # Recent messages that also count toward relevance
+    embedding_model: str = ""  # e.g. "openai/text-embedding-3-small"; empty = BM25 only
+
+
+class FailoverConfig(Base):
+    """Fallback models and the circuit breaker that decides when to use them."""
+
+    models: list[str] = Field(default_factory=list)  # Tried in order after the main model; each uses its own provider
+    failure_threshold: int = 3  # Failures in a row that open a backend's circuit (a 429/5xx opens it at once)
+    max_error_rate: float = 0.5  # Error rate over window_s that opens the circuit
+    min_requests: int = 10  # Requests in the window before max_error_rate applies
+    window_s: float = 60.0  # Rolling window for error rate and latency
+    open_s: float = 30.0  # How long an open circuit skips its backend before one trial request
+
+
+class AdmissionConfig(Base):
+    """Adaptive cap on concurrent LLM requests, per backend."""
+
+    enabled: bool = True
+    initial_concurrency: int = 8  # Starting in-flight limit
+    min_concurrency: int = 1
+    max_concurrency: int = 32
+    backoff: float = 0.5  # Limit multiplier on a 429/503/529 response
+    cooldown_s: float = 2.0  # Minimum time between two cuts
+    tokens_per_minute: int = 0  # Prompt-token budget per minute; 0 = unlimited
+
+
+class HedgingConfig(Base):
+    """Duplicate slow LLM requests and keep whichever answers first (opt-in)."""
+
+    enabled: bool = False
+    model: str = ""  # Send hedges to this model; empty = the same model and backend
+    percentile: float = 0.95  # Hedge requests still running after this latency percentile
+    min_samples: int = 20  # Latencies observed per model before hedging starts
+    min_delay_s: float = 2.0  # Never hedge earlier than this
+    max_rate: float = 0.05  # Long-run share of requests that may be hedged
+    max_burst: int = 3  # Hedges allowed back to back before max_rate applies
+    max_wasted_tokens_per_hour: int = 200000  # Prompt tokens that hedging may duplicate per hour
+
+
 class AgentDefaults(Base):
     """Default agent configuration."""
 
@@ -191,6 +262,14 @@ class AgentDefaults(Base):
     temperature: float = 0.1
     max_tool_iterations: int = 40
     memory_window: int = 100
+    context_window_tokens: int = 0  # Request token budget; 0 = the model's window from the provider registry
+    max_concurrent_turns: int = 4  # Sessions processed in parallel by the gateway
+    max_queued_per_session: int = 8  # Pending messages per session before new ones are rejected
+    consolidation: ConsolidationConfig = Field(default_factory=ConsolidationConfig)
+    memory_recall: MemoryRecallConfig = Field(default_factory=MemoryRecallConfig)
+    failover: FailoverConfig = Field(default_factory=FailoverConfig)
+    admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
+    hedging: HedgingConfig = Field(default_factory=HedgingConfig)
 
 
 class AgentsConfig(Base):
@@ -241,6 +320,8 @@ class GatewayConfig(Base):
 
     host: str = "0.0.0.0"
     port: int = 18790
+    metrics_enabled: bool = False  # Serve /metrics (Prometheus) and /health on metrics_host:port
+    metrics_host: str = "127.0.0.1"  # Unauthenticated endpoint; widen only behind a firewall or proxy
     heartbeat: HeartbeatConfig = Field(default_factory=HeartbeatConfig)
 
 
@@ -294,6 +375,21 @@ class BrowserToolConfig(Base):
     block_file_scheme: bool = True
     state_dir: str = ".nanobot/browser/state"
     artifacts_dir: str = ".nanobot/browser/artifacts"
+    pool_enabled: bool = True  # Keep browsers warm between calls instead of launching per call
+    pool_max_uses: int = 50  # Contexts served before a browser process is recycled
+    pool_idle_seconds: int = 300  # Close pooled browsers unused for this long
+
+
+class WebCacheConfig(Base):
+    """Result cache for web_search and web_fetch."""
+
+    enabled: bool = True
+    dir: str = ".nanobot/cache/web"  # Relative to workspace
+    search_ttl: int = 3600  # Seconds
+    fetch_ttl: int = 900  # Seconds, when the response has no Cache-Control/Expires
+    max_ttl: int = 86400  # Upper bound for server-provided lifetimes
+    memory_max_mb: int = 16
+    disk_max_mb: int = 128
 
 
 class WebToolsConfig(Base):
@@ -301,6 +397,7 @@ class WebToolsConfig(Base):
 
     search: WebSearchConfig = Field(default_factory=WebSearchConfig)
     browser: BrowserToolConfig = Field(default_factory=BrowserToolConfig)
+    cache: WebCacheConfig = Field(default_factory=WebCacheConfig)
 
 
 class ExecToolConfig(Base):
@@ -342,6 +439,26 @@ class ToolsConfig(Base):
     mcp_servers: dict[str, MCPServerConfig] = Field(default_factory=dict)
 
 
+class HttpConfig(Base):
+    """Shared outbound HTTP client pool."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept open
+    connect_timeout: float = 10.0
+    timeout: float = 60.0  # Default read/write timeout; callers may override per request
+    http2: bool = True  # Only takes effect when the optional h2 package is installed
+
+
+class TracingConfig(Base):
+    """Per-turn tracing spans."""
+
+    enabled: bool = False  # Opt-in: spans are written to disk on every turn
+    file: str = ""  # OTLP/JSON lines file; defaults to ~/.nanobot/traces/spans.jsonl
+    max_file_mb: int = 16  # Rotated to <file>.1 when exceeded
+    otlp_endpoint: str = ""  # Optional OTLP/HTTP collector, e.g. http://localhost:4318/v1/traces
+
+
 class SecurityConfig(Base):
     """Security configuration."""
 
@@ -356,6 +473,8 @@ class Config(BaseSettings):
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
     security: SecurityConfig = Field(default_factory=SecurityConfig)
 
     @property
@@ -12,6 +12,7 @@ from zoneinfo import ZoneInfo
 from loguru import logger
 
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from nanobot.utils import metrics
 
 
 def _now_ms() -> int:
@@ -246,6 +247,7 @@ class CronService:
         ]
         
         for job in due_jobs:
+            metrics.CRON_LAG_SECONDS.observe(max(0, _now_ms() - job.state.next_run_at_ms) / 1000)
             await self._execute_job(job)
         
         self._save_store()
@@ -263,11 +265,13 @@ class CronService:
             job.state.last_status = "ok"
             job.state.last_error = None
             logger.info("Cron: job '{}' completed", job.name)
+            metrics.CRON_RUNS.inc("ok")
             
         except Exception as e:
             job.state.last_status = "error"
             job.state.last_error = str(e)
             logger.error("Cron: job '{}' failed: {}", job.name, e)
+            metrics.CRON_RUNS.inc("error")
         
         job.state.last_run_at_ms = start_ms
         job.updated_at_ms = _now_ms()
@@ -0,0 +1,207 @@
+"""Adaptive admission control for LLM requests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk, estimate_prompt_tokens
+from nanobot.utils import metrics
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import AdmissionConfig
+
+_background: ContextVar[bool] = ContextVar("nanobot_llm_background", default=False)
+
+# Statuses that mean "slow down": rate limited, overloaded (Anthropic 529), unavailable.
+_OVERLOAD_STATUSES = frozenset({429, 503, 529})
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Mark LLM requests made inside this block as background work."""
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+def in_background() -> bool:
+    """True inside ``background_priority()``."""
+    return _background.get()
+
+
+class AdaptiveLimiter:
+    """
+    Cap one backend's in-flight requests and token throughput.
+
+    The concurrency limit follows AIMD: every success adds ``1 / limit`` (about
+    one slot per round of requests) up to ``max_concurrency``; an overload
+    response multiplies it by ``backoff`` down to ``min_concurrency``, at most
+    once per ``cooldown_s`` so a burst of 429s counts as one signal.
+
+    With ``tokens_per_minute`` set, a request also waits for its estimated
+    prompt tokens; the estimate is corrected from the reported usage. Waiting
+    interactive requests are always admitted before background ones.
+    """
+
+    def __init__(self, config: AdmissionConfig):
+        self.config = config
+        self.limit = float(max(config.min_concurrency, min(config.initial_concurrency, config.max_concurrency)))
+        self.in_flight = 0
+        self._changed = asyncio.Event()
+        self._waiting_interactive = 0
+        self._last_cut = 0.0
+        self._tokens = float(config.tokens_per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        tpm = self.config.tokens_per_minute
+        self._tokens = min(tpm, self._tokens + (now - self._updated) * tpm / 60)
+        self._updated = now
+
+    def _token_wait(self, tokens: int) -> float:
+        """Seconds until ``tokens`` fit the per-minute budget (0 if they do now)."""
+        tpm = self.config.tokens_per_minute
+        if tpm <= 0:
+            return 0.0
+        self._refill()
+        need = min(tokens, tpm)
+        return 0.0 if self._tokens >= need else (need - self._tokens) * 60 / tpm
+
+    def _notify(self) -> None:
+        """Wake every waiter to re-check; the event is replaced so later waits block again."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _blocked(self, tokens: int, background: bool) -> tuple[bool, float | None]:
+        if self.in_flight >= int(self.limit) or (background and self._waiting_interactive):
+            return True, None  # Woken by a release
+        wait = self._token_wait(tokens)
+        return wait > 0, wait or None
+
+    async def acquire(self, tokens: int = 0, *, background: bool = False) -> None:
+        """Wait for a slot (and token budget) for one request."""
+        if not background:
+            self._waiting_interactive += 1
+        try:
+            while True:
+                blocked, timeout = self._blocked(tokens, background)
+                if not blocked:
+                    break
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if not background:
+                self._waiting_interactive -= 1
+                self._notify()  # Background waiters may go now
+        self.in_flight += 1
+        if self.config.tokens_per_minute > 0:
+            self._tokens -= tokens
+
+    def release(self, response: LLMResponse | None, estimated: int = 0) -> None:
+        """Free the slot and adapt the limit to how the request went."""
+        self.in_flight -= 1
+        if response is not None:
+            self._adapt(response)
+            used = response.usage.get("total_tokens")
+            if self.config.tokens_per_minute > 0 and used:
+                self._tokens -= used - estimated
+        self._notify()
+
+    def _adapt(self, response: LLMResponse) -> None:
+        if response.finish_reason == "error":
+            if response.error_status not in _OVERLOAD_STATUSES:
+                return
+            now = time.monotonic()
+            if now - self._last_cut < self.config.cooldown_s:
+                return
+            self._last_cut = now
+            self.limit = max(float(self.config.min_concurrency), self.limit * self.config.backoff)
+            logger.warning("LLM backend overloaded (HTTP {}), concurrency limit cut to {}",
+                           response.error_status, int(self.limit))
+        else:
+            self.limit = min(float(self.config.max_concurrency), self.limit + 1 / self.limit)
+
+
+class AdmissionProvider(LLMProvider):
+    """
+    Wrap a provider so every request passes its AdaptiveLimiter first.
+
+    Requests made under ``background_priority()`` (subagents, heartbeat,
+    memory consolidation) wait behind interactive turns.
+    """
+
+    def __init__(self, inner: LLMProvider, config: AdmissionConfig, name: str | None = None):
+        # LLMProvider.__init__ is skipped on purpose, as in MeteredProvider.
+        self.inner = inner
+        self.name = name or inner.get_default_model()
+        self.limiter = AdaptiveLimiter(config)
+        self.supports_streaming = inner.supports_streaming
+        metrics.LLM_CONCURRENCY_LIMIT.set_function(lambda: int(self.limiter.limit), self.name)
+        metrics.LLM_IN_FLIGHT.set_function(lambda: self.limiter.in_flight, self.name)
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.inner, item)
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
+
+    def secrets(self) -> list[str]:
+        return self.inner.secrets()
+
+    async def _admit(self, messages: list[dict[str, Any]]) -> int:
+        estimated = estimate_prompt_tokens(messages) if self.limiter.config.tokens_per_minute > 0 else 0
+        background = in_background()
+        start = time.perf_counter()
+        await self.limiter.acquire(estimated, background=background)
+        metrics.LLM_ADMISSION_WAIT_SECONDS.observe(
+            time.perf_counter() - start, "background" if background else "interactive",
+        )
+        return estimated
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        estimated = await self._admit(messages)
+        response = None
+        try:
+            response = await self.inner.chat(
+                messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+            )
+            return response
+        finally:
+            self.limiter.release(response, estimated)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        estimated = await self._admit(messages)
+        response = None
+        try:
+            async for chunk in self.inner.chat_stream(
+                messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+            ):
+                response = chunk.response or response
+                yield chunk
+        finally:
+            self.limiter.release(response, estimated)
@@ -1,8 +1,12 @@
 """Base LLM provider interface."""
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
+
+_cache_session: ContextVar[str | None] = ContextVar("nanobot_llm_cache_session", default=None)
 
 
 @dataclass
@@ -21,6 +25,7 @@ class LLMResponse:
     finish_reason: str = "stop"
     usage: dict[str, int] = field(default_factory=dict)
     reasoning_content: str | None = None  # Kimi, DeepSeek-R1 etc.
+    error_status: int | None = None  # HTTP status of a failed request, when known
     
     @property
     def has_tool_calls(self) -> bool:
@@ -28,6 +33,82 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
+@contextmanager
+def cache_session(key: str | None) -> Iterator[None]:
+    """Tag LLM requests made inside this block with a conversation identity for prompt caching."""
+    token = _cache_session.set(key)
+    try:
+        yield
+    finally:
+        _cache_session.reset(token)
+
+
+def current_cache_session() -> str | None:
+    """The key set by the innermost ``cache_session()``, if any."""
+    return _cache_session.get()
+
+
+def error_status(exc: BaseException) -> int | None:
+    """Return the HTTP status carried by a provider SDK exception, if any."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def usage_dict(usage: Any) -> dict[str, int]:
+    """
+    Normalize an OpenAI-style usage object into LLMResponse.usage.
+
+    Prompt-cache counts are added when reported: ``cache_read_tokens`` from
+    Anthropic's ``cache_read_input_tokens`` or OpenAI's
+    ``prompt_tokens_details.cached_tokens``, ``cache_write_tokens`` from
+    ``cache_creation_input_tokens``.
+    """
+    if not usage:
+        return {}
+    result = {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+    }
+    cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+    if not cache_read:
+        cache_read = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", 0) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    if cache_read:
+        result["cache_read_tokens"] = cache_read
+    if cache_write:
+        result["cache_write_tokens"] = cache_write
+    return result
+
+
+def estimate_prompt_tokens(messages: list[dict[str, Any]]) -> int:
+    """Rough prompt size (4 characters per token) without serializing the conversation."""
+    chars = 0
+    for msg in messages:
+        content = msg.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            chars += sum(len(block.get("text") or "") for block in content if isinstance(block, dict))
+    return chars // 4
+
+
+@dataclass
+class LLMStreamChunk:
+    """
+    One increment of a streamed chat completion.
+
+    Text arrives as ``delta``; a tool call is reported once its arguments are
+    complete. The last chunk of every stream carries the assembled ``response``
+    (the same value ``chat()`` would return, errors included).
+    """
+    delta: str = ""
+    tool_call: ToolCallRequest | None = None
+    response: LLMResponse | None = None
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -35,6 +116,9 @@ class LLMProvider(ABC):
     Implementations should handle the specifics of each provider's API
     while maintaining a consistent interface.
     """
+
+    # True when chat_stream() yields text incrementally rather than all at once.
+    supports_streaming: bool = False
     
     def __init__(self, api_key: str | None = None, api_base: str | None = None):
         self.api_key = api_key
@@ -108,3 +192,44 @@ class LLMProvider(ABC):
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
         pass
+
+    def secrets(self) -> list[str]:
+        """Credentials and endpoints that must never appear in replies."""
+        return [value for value in (self.api_key, self.api_base) if value]
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """
+        Stream a chat completion as incremental chunks.
+
+        The default implementation wraps ``chat()`` and yields the whole reply
+        in one piece, so callers can consume every provider the same way.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions.
+            model: Model identifier (provider-specific).
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+
+        Yields:
+            LLMStreamChunk items; the last one carries the complete LLMResponse.
+        """
+        response = await self.chat(
+            messages=messages,
+            tools=tools,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        if response.content and response.finish_reason != "error":
+            yield LLMStreamChunk(delta=response.content)
+        for tool_call in response.tool_calls:
+            yield LLMStreamChunk(tool_call=tool_call)
+        yield LLMStreamChunk(response=response)
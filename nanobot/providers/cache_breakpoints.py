@@ -0,0 +1,107 @@
+"""Place prompt-cache breakpoints on a chat request."""
+
+from __future__ import annotations
+
+from typing import Any
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+# Anthropic looks back this many content blocks from a breakpoint for an earlier cache entry.
+_LOOKBACK = 20
+
+
+def _cacheable(msg: dict[str, Any]) -> bool:
+    """True when the message has content a cache_control marker can attach to."""
+    content = msg.get("content")
+    if isinstance(content, str):
+        return bool(content)
+    if not isinstance(content, list) or not content or not isinstance(content[-1], dict):
+        return False
+    # Empty text blocks are dropped before sending, and the marker with them.
+    return content[-1].get("type") != "text" or bool(content[-1].get("text"))
+
+
+def _mark(msg: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of msg whose last content block carries cache_control."""
+    content = msg["content"]
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content, "cache_control": _EPHEMERAL}]
+    else:
+        blocks = list(content)
+        blocks[-1] = {**blocks[-1], "cache_control": _EPHEMERAL}
+    return {**msg, "content": blocks}
+
+
+def _nearest_cacheable(messages: list[dict[str, Any]], index: int, floor: int) -> int | None:
+    """Walk back from index to the first message that can hold a marker."""
+    for i in range(index, floor - 1, -1):
+        if _cacheable(messages[i]):
+            return i
+    return None
+
+
+def plan_breakpoints(messages: list[dict[str, Any]], limit: int = 4) -> list[int]:
+    """
+    Choose up to ``limit`` message indexes to mark, most valuable first.
+
+    In order: the system prompt, the newest message (so the next tool-loop
+    iteration reads everything up to here), the end of the history before the
+    current user message (stable for the whole turn), then points every
+    ``_LOOKBACK`` messages further back so a long history stays within reach.
+    """
+    if limit <= 0 or not messages:
+        return []
+
+    chosen: list[int] = []
+
+    def take(index: int | None) -> None:
+        if index is not None and index not in chosen and len(chosen) < limit:
+            chosen.append(index)
+
+    system = [i for i, m in enumerate(messages) if m.get("role") == "system" and _cacheable(m)]
+    if system:
+        take(system[-1])
+    floor = (system[-1] + 1) if system else 0
+
+    last = _nearest_cacheable(messages, len(messages) - 1, floor)
+    take(last)
+    if last is None:
+        return sorted(chosen)
+
+    user = next((i for i in range(len(messages) - 1, floor - 1, -1) if messages[i].get("role") == "user"), None)
+    anchor = _nearest_cacheable(messages, user - 1, floor) if user else None
+    if anchor is None or anchor >= last:
+        anchor = last
+    take(anchor)
+
+    point = anchor - _LOOKBACK
+    while point >= floor and len(chosen) < limit:
+        found = _nearest_cacheable(messages, point, floor)
+        take(found)
+        if found is None:
+            break
+        point = found - _LOOKBACK
+    return sorted(chosen)
+
+
+def apply_breakpoints(
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    limit: int = 4,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
+    """
+    Return copies of messages and tools with ``cache_control`` markers placed.
+
+    The last tool definition takes one marker (tools precede the system prompt
+    in the cached prefix); the rest go to the messages chosen by
+    ``plan_breakpoints``. The inputs are never modified.
+    """
+    new_tools = tools
+    if tools and limit > 0:
+        new_tools = list(tools)
+        new_tools[-1] = {**new_tools[-1], "cache_control": _EPHEMERAL}
+        limit -= 1
+
+    marked = set(plan_breakpoints(messages, limit))
+    new_messages = [_mark(m) if i in marked else m for i, m in enumerate(messages)]
+    return new_messages, new_tools
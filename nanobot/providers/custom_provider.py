@@ -2,23 +2,33 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, AsyncIterator
 
 import json_repair
 from openai import AsyncOpenAI
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    LLMStreamChunk,
+    ToolCallRequest,
+    error_status,
+    usage_dict,
+)
+from nanobot.providers.streaming import ChatCompletionStream
 
 
 class CustomProvider(LLMProvider):
 
+    supports_streaming = True
+
     def __init__(self, api_key: str = "no-key", api_base: str = "http://localhost:8000/v1", default_model: str = "default"):
         super().__init__(api_key, api_base)
         self.default_model = default_model
         self._client = AsyncOpenAI(api_key=api_key, base_url=api_base)
 
-    async def chat(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
-                   model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7) -> LLMResponse:
+    def _build_kwargs(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None,
+                      model: str | None, max_tokens: int, temperature: float) -> dict[str, Any]:
         kwargs: dict[str, Any] = {
             "model": model or self.default_model,
             "messages": self._sanitize_empty_content(messages),
@@ -27,10 +37,36 @@ class CustomProvider(LLMProvider):
         }
         if tools:
             kwargs.update(tools=tools, tool_choice="auto")
+        return kwargs
+
+    async def chat(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
+                   model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7) -> LLMResponse:
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
         try:
             return self._parse(await self._client.chat.completions.create(**kwargs))
         except Exception as e:
-            return LLMResponse(content=f"Error: {e}", finish_reason="error")
+            return LLMResponse(content=f"Error: {e}", finish_reason="error", error_status=error_status(e))
+
+    async def chat_stream(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
+                          model: str | None = None, max_tokens: int = 4096,
+                          temperature: float = 0.7) -> AsyncIterator[LLMStreamChunk]:
+        # stream_options is left out on purpose: not every OpenAI-compatible server accepts it.
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        stream = ChatCompletionStream()
+        try:
+            async for chunk in await self._client.chat.completions.create(**kwargs, stream=True):
+                if text := stream.feed(chunk):
+                    yield LLMStreamChunk(delta=text)
+        except Exception as e:
+            yield LLMStreamChunk(response=LLMResponse(
+                content=f"Error: {e}", finish_reason="error", error_status=error_status(e),
+            ))
+            return
+
+        response = stream.response()
+        for tool_call in response.tool_calls:
+            yield LLMStreamChunk(tool_call=tool_call)
+        yield LLMStreamChunk(response=response)
 
     def _parse(self, response: Any) -> LLMResponse:
         choice = response.choices[0]
@@ -40,10 +76,9 @@ class CustomProvider(LLMProvider):
                             arguments=json_repair.loads(tc.function.arguments) if isinstance(tc.function.arguments, str) else tc.function.arguments)
             for tc in (msg.tool_calls or [])
         ]
-        u = response.usage
         return LLMResponse(
             content=msg.content, tool_calls=tool_calls, finish_reason=choice.finish_reason or "stop",
-            usage={"prompt_tokens": u.prompt_tokens, "completion_tokens": u.completion_tokens, "total_tokens": u.total_tokens} if u else {},
+            usage=usage_dict(response.usage),
             reasoning_content=getattr(msg, "reasoning_content", None) or None,
         )
 
@@ -0,0 +1,219 @@
+"""Provider wrapper that fails over along a chain of backends."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk
+from nanobot.utils import metrics
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import FailoverConfig
+
+
+def is_backend_failure(response: LLMResponse) -> bool:
+    """
+    True when an error response is the backend's fault and worth retrying elsewhere.
+
+    Rate limits, timeouts, 5xx and connection errors (no status) qualify; other
+    4xx mean the request itself was rejected and would fail anywhere.
+    """
+    if response.finish_reason != "error":
+        return False
+    status = response.error_status
+    return status is None or status in (408, 409, 429) or status >= 500
+
+
+class CircuitBreaker:
+    """
+    Health of one backend: rolling error rate and latency, plus a circuit.
+
+    The circuit opens after ``failure_threshold`` failures in a row, on a 429
+    or 5xx, or when the error rate over ``window_s`` reaches ``max_error_rate``
+    (once ``min_requests`` were seen). An open circuit skips the backend for
+    ``open_s``; then a single trial request decides whether it closes again.
+    """
+
+    def __init__(self, config: FailoverConfig):
+        self.config = config
+        self._samples: deque[tuple[float, bool, float]] = deque()
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def available(self, now: float) -> bool:
+        """Whether a request may go to this backend now."""
+        if self.opened_at is None:
+            return True
+        return not self._trial and now - self.opened_at >= self.config.open_s
+
+    def begin(self) -> None:
+        """Note that a request is starting; on an open circuit it is the trial."""
+        if self.opened_at is not None:
+            self._trial = True
+
+    def release(self) -> None:
+        """Give up the trial slot without a verdict (the request was abandoned)."""
+        self._trial = False
+
+    def record(self, ok: bool, seconds: float, status: int | None = None) -> None:
+        now = time.monotonic()
+        self._samples.append((now, ok, seconds))
+        while self._samples and now - self._samples[0][0] > self.config.window_s:
+            self._samples.popleft()
+        self._trial = False
+        if ok:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            return
+        self.consecutive_failures += 1
+        overloaded = status is not None and (status == 429 or status >= 500)
+        tripped = self.consecutive_failures >= self.config.failure_threshold or (
+            len(self._samples) >= self.config.min_requests and self.error_rate >= self.config.max_error_rate
+        )
+        if overloaded or tripped or self.opened_at is not None:
+            self.opened_at = now
+
+    @property
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok, _ in self._samples if not ok) / len(self._samples)
+
+    def latency(self, quantile: float) -> float | None:
+        """Latency at ``quantile`` over the window, or None without samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(seconds for _, _, seconds in self._samples)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+@dataclass
+class Backend:
+    """One link of the chain: a provider and the model to ask it for."""
+
+    provider: LLMProvider
+    model: str
+    breaker: CircuitBreaker = field(repr=False)
+
+
+class FailoverProvider(LLMProvider):
+    """
+    Try an ordered chain of backends, moving on when one is failing.
+
+    Each request goes to the first backend whose circuit is closed (or due a
+    trial); a backend failure (see ``is_backend_failure``) moves the same
+    request on to the next one, so a brown-out costs latency instead of an
+    error reply. Requests the backend rejected as invalid are returned as-is.
+    Backends whose circuit is open are still tried, last, once every other
+    backend has failed the request.
+
+    The first backend is the primary: it gets the caller's ``model``, the
+    others always use their own. Other attributes are read from the primary.
+    """
+
+    def __init__(self, backends: list[tuple[LLMProvider, str]], config: FailoverConfig):
+        # LLMProvider.__init__ is skipped on purpose, as in MeteredProvider.
+        self.backends = [Backend(provider, model, CircuitBreaker(config)) for provider, model in backends]
+        self.primary = self.backends[0].provider
+        self.supports_streaming = self.primary.supports_streaming
+        for backend in self.backends:
+            metrics.LLM_CIRCUIT_OPEN.set_function(lambda b=backend: int(b.breaker.is_open), backend.model)
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.primary, item)
+
+    def get_default_model(self) -> str:
+        return self.primary.get_default_model()
+
+    def secrets(self) -> list[str]:
+        return [secret for backend in self.backends for secret in backend.provider.secrets()]
+
+    def _chain(self) -> list[Backend]:
+        now = time.monotonic()
+        ready = [backend for backend in self.backends if backend.breaker.available(now)]
+        return ready + [backend for backend in self.backends if backend not in ready]
+
+    def _model_for(self, backend: Backend, model: str | None) -> str:
+        return (model or backend.model) if backend is self.backends[0] else backend.model
+
+    @staticmethod
+    def _record(backend: Backend, start: float, response: LLMResponse) -> bool:
+        """Update the backend's health; return True if it failed."""
+        failed = is_backend_failure(response)
+        backend.breaker.record(not failed, time.perf_counter() - start, response.error_status)
+        if failed:
+            logger.warning("LLM backend {} failed: {}", backend.model, response.content)
+        return failed
+
+    @staticmethod
+    def _fail_over(backend: Backend, next_backend: Backend) -> None:
+        metrics.LLM_FAILOVERS.inc(backend.model)
+        logger.info("Failing over from {} to {}", backend.model, next_backend.model)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        chain = self._chain()
+        for backend, next_backend in zip(chain, [*chain[1:], None]):
+            start = time.perf_counter()
+            backend.breaker.begin()
+            try:
+                response = await backend.provider.chat(
+                    messages=messages, tools=tools, model=self._model_for(backend, model),
+                    max_tokens=max_tokens, temperature=temperature,
+                )
+            except BaseException:
+                backend.breaker.release()
+                raise
+            if not self._record(backend, start, response) or next_backend is None:
+                return response
+            self._fail_over(backend, next_backend)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        chain = self._chain()
+        for backend, next_backend in zip(chain, [*chain[1:], None]):
+            start = time.perf_counter()
+            emitted = False
+            backend.breaker.begin()
+            try:
+                async for chunk in backend.provider.chat_stream(
+                    messages=messages, tools=tools, model=self._model_for(backend, model),
+                    max_tokens=max_tokens, temperature=temperature,
+                ):
+                    if chunk.response is None:
+                        emitted = True
+                        yield chunk
+                        continue
+                    failed = self._record(backend, start, chunk.response)
+                    # Fail over only if nothing was streamed yet; the caller cannot take text back.
+                    if not failed or emitted or next_backend is None:
+                        yield chunk
+                        return
+                    break
+            finally:
+                backend.breaker.release()
+            if next_backend is None:
+                return
+            self._fail_over(backend, next_backend)
@@ -0,0 +1,172 @@
+"""Provider wrapper that hedges slow requests with a duplicate."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.providers.admission import in_background
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk, estimate_prompt_tokens
+from nanobot.utils import metrics
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import HedgingConfig
+
+
+def _succeeded(task: asyncio.Task[LLMResponse]) -> bool:
+    """True when a finished request returned a non-error response."""
+    return task.exception() is None and task.result().finish_reason != "error"
+
+
+class LatencyTracker:
+    """Recent request latencies for one model."""
+
+    def __init__(self, size: int = 200):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class HedgedProvider(LLMProvider):
+    """
+    Send a second copy of a slow ``chat()`` request and keep the first answer.
+
+    Once ``min_samples`` latencies are known for a model, a request still
+    running after the ``percentile`` latency (at least ``min_delay_s``) is
+    duplicated to ``secondary`` (or the same provider); the first successful
+    reply wins and the other request is cancelled. Hedges are limited to
+    ``max_rate`` of requests and to ``max_wasted_tokens_per_hour`` prompt
+    tokens, since one of the two prompts is always paid for nothing.
+    Background requests and streams are never hedged.
+    """
+
+    def __init__(
+        self,
+        primary: LLMProvider,
+        config: HedgingConfig,
+        secondary: LLMProvider | None = None,
+        secondary_model: str | None = None,
+    ):
+        # LLMProvider.__init__ is skipped on purpose, as in MeteredProvider.
+        self.primary = primary
+        self.secondary = secondary or primary
+        self.secondary_model = secondary_model
+        self.config = config
+        self.supports_streaming = primary.supports_streaming
+        self._latency: dict[str, LatencyTracker] = {}
+        self._credit = 1.0
+        self._wasted: deque[tuple[float, int]] = deque()
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.primary, item)
+
+    def get_default_model(self) -> str:
+        return self.primary.get_default_model()
+
+    def secrets(self) -> list[str]:
+        if self.secondary is self.primary:
+            return self.primary.secrets()
+        return self.primary.secrets() + self.secondary.secrets()
+
+    def hedge_delay(self, model: str) -> float | None:
+        """Seconds to wait before hedging a request to ``model``; None until enough is known."""
+        tracker = self._latency.get(model)
+        if tracker is None or len(tracker) < self.config.min_samples:
+            return None
+        return max(self.config.min_delay_s, tracker.percentile(self.config.percentile))
+
+    def _may_hedge(self, model: str, tokens: int) -> bool:
+        """Spend hedge credit and token budget, or say why not."""
+        now = time.monotonic()
+        while self._wasted and now - self._wasted[0][0] > 3600:
+            self._wasted.popleft()
+        if self._credit < 1:
+            metrics.LLM_HEDGES_SKIPPED.inc(model, "rate")
+            return False
+        if sum(spent for _, spent in self._wasted) + tokens > self.config.max_wasted_tokens_per_hour:
+            metrics.LLM_HEDGES_SKIPPED.inc(model, "budget")
+            return False
+        self._credit -= 1
+        self._wasted.append((now, tokens))
+        metrics.LLM_HEDGE_WASTED_TOKENS.inc(model, amount=tokens)
+        return True
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        key = model or self.primary.get_default_model()
+        tracker = self._latency.setdefault(key, LatencyTracker())
+        self._credit = min(self.config.max_burst, self._credit + self.config.max_rate)
+        kwargs = dict(messages=messages, tools=tools, max_tokens=max_tokens, temperature=temperature)
+
+        start = time.perf_counter()
+        first = asyncio.create_task(self.primary.chat(model=model, **kwargs))
+        delay = None if in_background() else self.hedge_delay(key)
+        hedge: asyncio.Task[LLMResponse] | None = None
+        try:
+            if delay is not None:
+                await asyncio.wait({first}, timeout=delay)
+                if not first.done() and self._may_hedge(key, estimate_prompt_tokens(messages)):
+                    logger.debug("Hedging request to {} after {:.2f}s", key, delay)
+                    hedge = asyncio.create_task(self.secondary.chat(model=self.secondary_model or model, **kwargs))
+            if hedge is None:
+                response = await first
+                if response.finish_reason != "error":
+                    tracker.add(time.perf_counter() - start)
+                return response
+
+            pending: set[asyncio.Task[LLMResponse]] = {first, hedge}
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer a success; a failure only wins if the other request failed too.
+                finished = [task for task in (first, hedge) if task in done]
+                succeeded = [task for task in finished if _succeeded(task)]
+                if succeeded:
+                    winner = succeeded[0]
+                    break
+                if not pending:
+                    # Both failed: an error response beats a raised exception, the primary's first.
+                    answered = [task for task in (first, hedge) if task.exception() is None]
+                    winner = (answered or [first])[0]
+                    break
+            response = winner.result()
+            # Only a successful primary's full latency is a sample: a lost race is cut
+            # short, and counting the hedge's time would pull the percentile down.
+            if winner is first and _succeeded(first):
+                tracker.add(time.perf_counter() - start)
+            metrics.LLM_HEDGES.inc(key, "primary" if winner is first else "hedge")
+            return response
+        finally:
+            for task in (first, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        async for chunk in self.primary.chat_stream(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        ):
+            yield chunk
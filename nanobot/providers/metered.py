@@ -0,0 +1,80 @@
+"""Provider wrapper that records request metrics."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, AsyncIterator
+
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk
+from nanobot.utils import metrics
+
+
+class MeteredProvider(LLMProvider):
+    """
+    Wrap a provider and record latency, token usage and errors per request.
+
+    Every other attribute is read from the wrapped provider, so the wrapper
+    can stand in wherever the provider was used.
+    """
+
+    def __init__(self, inner: LLMProvider, name: str | None = None):
+        # LLMProvider.__init__ is skipped on purpose: api_key/api_base come from inner.
+        self.inner = inner
+        self.name = name or type(inner).__name__
+        self.supports_streaming = inner.supports_streaming
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.inner, item)
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
+
+    def secrets(self) -> list[str]:
+        return self.inner.secrets()
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        start = time.perf_counter()
+        response = await self.inner.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        )
+        self._record(model, time.perf_counter() - start, response)
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        start = time.perf_counter()
+        first_token = True
+        async for chunk in self.inner.chat_stream(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        ):
+            if chunk.delta and first_token:
+                first_token = False
+                metrics.LLM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - start, self.name, self._model(model))
+            if chunk.response is not None:
+                self._record(model, time.perf_counter() - start, chunk.response)
+            yield chunk
+
+    def _model(self, model: str | None) -> str:
+        return model or self.inner.get_default_model()
+
+    def _record(self, model: str | None, seconds: float, response: LLMResponse) -> None:
+        labels = (self.name, self._model(model))
+        metrics.LLM_REQUEST_SECONDS.observe(seconds, *labels)
+        if response.finish_reason == "error":
+            metrics.LLM_ERRORS.inc(*labels)
+        for kind in ("prompt", "completion", "cache_read", "cache_write"):
+            if tokens := response.usage.get(f"{kind}_tokens"):
+                metrics.LLM_TOKENS.inc(*labels, kind, amount=tokens)
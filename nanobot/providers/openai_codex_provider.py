@@ -5,13 +5,22 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
+from functools import lru_cache
 from typing import Any, AsyncGenerator
 
 import httpx
 from loguru import logger
 
 from oauth_cli_kit import get_token as get_codex_token
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    LLMStreamChunk,
+    ToolCallRequest,
+    current_cache_session,
+    error_status,
+)
+from nanobot.utils.http_pool import get_http_client
 
 DEFAULT_CODEX_URL = "https://chatgpt.com/backend-api/codex/responses"
 DEFAULT_ORIGINATOR = "nanobot"
@@ -20,6 +29,8 @@ DEFAULT_ORIGINATOR = "nanobot"
 class OpenAICodexProvider(LLMProvider):
     """Use Codex OAuth to call the Responses API."""
 
+    supports_streaming = True
+
     def __init__(self, default_model: str = "openai-codex/gpt-5.1-codex"):
         super().__init__(api_key=None, api_base=None)
         self.default_model = default_model
@@ -32,6 +43,20 @@ class OpenAICodexProvider(LLMProvider):
         max_tokens: int = 4096,
         temperature: float = 0.7,
     ) -> LLMResponse:
+        response = LLMResponse(content="Error calling Codex: empty stream", finish_reason="error")
+        async for chunk in self.chat_stream(messages, tools, model, max_tokens, temperature):
+            if chunk.response is not None:
+                response = chunk.response
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncGenerator[LLMStreamChunk, None]:
         model = model or self.default_model
         system_prompt, input_items = _convert_messages(messages)
 
@@ -46,7 +71,7 @@ class OpenAICodexProvider(LLMProvider):
             "input": input_items,
             "text": {"verbosity": "medium"},
             "include": ["reasoning.encrypted_content"],
-            "prompt_cache_key": _prompt_cache_key(messages),
+            "prompt_cache_key": _prompt_cache_key(model, system_prompt, input_items),
             "tool_choice": "auto",
             "parallel_tool_calls": True,
         }
@@ -55,25 +80,26 @@ class OpenAICodexProvider(LLMProvider):
             body["tools"] = _convert_tools(tools)
 
         url = DEFAULT_CODEX_URL
+        started = False
 
         try:
             try:
-                content, tool_calls, finish_reason = await _request_codex(url, headers, body, verify=True)
+                async for chunk in _stream_codex(url, headers, body, verify=True):
+                    started = True
+                    yield chunk
             except Exception as e:
-                if "CERTIFICATE_VERIFY_FAILED" not in str(e):
+                # Only retry before anything was yielded; a retry after that would duplicate text.
+                if started or "CERTIFICATE_VERIFY_FAILED" not in str(e):
                     raise
                 logger.warning("SSL certificate verification failed for Codex API; retrying with verify=False")
-                content, tool_calls, finish_reason = await _request_codex(url, headers, body, verify=False)
-            return LLMResponse(
-                content=content,
-                tool_calls=tool_calls,
-                finish_reason=finish_reason,
-            )
+                async for chunk in _stream_codex(url, headers, body, verify=False):
+                    yield chunk
         except Exception as e:
-            return LLMResponse(
+            yield LLMStreamChunk(response=LLMResponse(
                 content=f"Error calling Codex: {str(e)}",
                 finish_reason="error",
-            )
+                error_status=error_status(e),
+            ))
 
     def get_default_model(self) -> str:
         return self.default_model
@@ -97,18 +123,23 @@ def _build_headers(account_id: str, token: str) -> dict[str, str]:
     }
 
 
-async def _request_codex(
+async def _stream_codex(
     url: str,
     headers: dict[str, str],
     body: dict[str, Any],
     verify: bool,
-) -> tuple[str, list[ToolCallRequest], str]:
-    async with httpx.AsyncClient(timeout=60.0, verify=verify) as client:
-        async with client.stream("POST", url, headers=headers, json=body) as response:
-            if response.status_code != 200:
-                text = await response.aread()
-                raise RuntimeError(_friendly_error(response.status_code, text.decode("utf-8", "ignore")))
-            return await _consume_sse(response)
+) -> AsyncGenerator[LLMStreamChunk, None]:
+    client = get_http_client(verify=verify)
+    async with client.stream("POST", url, headers=headers, json=body, timeout=60.0) as response:
+        if response.status_code != 200:
+            text = await response.aread()
+            raise httpx.HTTPStatusError(
+                _friendly_error(response.status_code, text.decode("utf-8", "ignore")),
+                request=response.request,
+                response=response,
+            )
+        async for chunk in _stream_sse(response):
+            yield chunk
 
 
 def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -217,9 +248,39 @@ def _split_tool_call_id(tool_call_id: Any) -> tuple[str, str | None]:
     return "call_0", None
 
 
-def _prompt_cache_key(messages: list[dict[str, Any]]) -> str:
-    raw = json.dumps(messages, ensure_ascii=True, sort_keys=True)
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+def _prompt_cache_key(model: str, system_prompt: str, input_items: list[dict[str, Any]]) -> str:
+    """
+    Key that stays the same for every request of one conversation.
+
+    Inside ``cache_session()`` the key comes from the session; otherwise from
+    the stable start of the prompt (instructions and first input item), so
+    appending tool results or new turns never changes it.
+    """
+    session = current_cache_session()
+    if session:
+        return _digest("session", model, session)
+    first = json.dumps(input_items[0], ensure_ascii=True, sort_keys=True) if input_items else ""
+    return _digest("prefix", model, system_prompt, first)
+
+
+@lru_cache(maxsize=256)
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def _usage(usage: Any) -> dict[str, int]:
+    """Map Responses API usage to LLMResponse.usage, including cached prompt tokens."""
+    if not isinstance(usage, dict):
+        return {}
+    result = {
+        "prompt_tokens": usage.get("input_tokens") or 0,
+        "completion_tokens": usage.get("output_tokens") or 0,
+        "total_tokens": usage.get("total_tokens") or 0,
+    }
+    cached = (usage.get("input_tokens_details") or {}).get("cached_tokens") or 0
+    if cached:
+        result["cache_read_tokens"] = cached
+    return result
 
 
 async def _iter_sse(response: httpx.Response) -> AsyncGenerator[dict[str, Any], None]:
@@ -242,11 +303,12 @@ async def _iter_sse(response: httpx.Response) -> AsyncGenerator[dict[str, Any],
         buffer.append(line)
 
 
-async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequest], str]:
+async def _stream_sse(response: httpx.Response) -> AsyncGenerator[LLMStreamChunk, None]:
     content = ""
     tool_calls: list[ToolCallRequest] = []
     tool_call_buffers: dict[str, dict[str, Any]] = {}
     finish_reason = "stop"
+    usage: dict[str, int] = {}
 
     async for event in _iter_sse(response):
         event_type = event.get("type")
@@ -262,7 +324,10 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                     "arguments": item.get("arguments") or "",
                 }
         elif event_type == "response.output_text.delta":
-            content += event.get("delta") or ""
+            delta = event.get("delta") or ""
+            if delta:
+                content += delta
+                yield LLMStreamChunk(delta=delta)
         elif event_type == "response.function_call_arguments.delta":
             call_id = event.get("call_id")
             if call_id and call_id in tool_call_buffers:
@@ -283,20 +348,26 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                     args = json.loads(args_raw)
                 except Exception:
                     args = {"raw": args_raw}
-                tool_calls.append(
-                    ToolCallRequest(
-                        id=f"{call_id}|{buf.get('id') or item.get('id') or 'fc_0'}",
-                        name=buf.get("name") or item.get("name"),
-                        arguments=args,
-                    )
+                tool_call = ToolCallRequest(
+                    id=f"{call_id}|{buf.get('id') or item.get('id') or 'fc_0'}",
+                    name=buf.get("name") or item.get("name"),
+                    arguments=args,
                 )
+                tool_calls.append(tool_call)
+                yield LLMStreamChunk(tool_call=tool_call)
         elif event_type == "response.completed":
-            status = (event.get("response") or {}).get("status")
-            finish_reason = _map_finish_reason(status)
+            completed = event.get("response") or {}
+            finish_reason = _map_finish_reason(completed.get("status"))
+            usage = _usage(completed.get("usage"))
         elif event_type in {"error", "response.failed"}:
             raise RuntimeError("Codex response failed")
 
-    return content, tool_calls, finish_reason
+    yield LLMStreamChunk(response=LLMResponse(
+        content=content,
+        tool_calls=tool_calls,
+        finish_reason=finish_reason,
+        usage=usage,
+    ))
 
 
 _FINISH_REASON_MAP = {"completed": "stop", "incomplete": "length", "failed": "error", "cancelled": "error"}
@@ -59,6 +59,12 @@ class ProviderSpec:
 
     # Provider supports cache_control on content blocks (e.g. Anthropic prompt caching)
     supports_prompt_caching: bool = False
+    max_cache_breakpoints: int = 4           # cache_control markers allowed per request
+
+    # context window in tokens (0 = unknown); per-model refinements, first match wins,
+    # e.g. (("qwen-max", 32_000),)
+    context_window: int = 0
+    model_context_windows: tuple[tuple[str, int], ...] = ()
 
     @property
     def label(self) -> str:
@@ -101,6 +107,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         strip_model_prefix=False,
         model_overrides=(),
         supports_prompt_caching=True,
+        max_cache_breakpoints=4,
     ),
 
     # AiHubMix: global gateway, OpenAI-compatible interface.
@@ -178,6 +185,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         strip_model_prefix=False,
         model_overrides=(),
         supports_prompt_caching=True,
+        max_cache_breakpoints=4,
+        context_window=200_000,
     ),
 
     # OpenAI: LiteLLM recognizes "gpt-*" natively, no prefix needed.
@@ -196,6 +205,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=128_000,
+        model_context_windows=(("gpt-5", 400_000), ("gpt-4.1", 1_000_000)),
     ),
 
     # OpenAI Codex: uses OAuth, not API key.
@@ -215,6 +226,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         strip_model_prefix=False,
         model_overrides=(),
         is_oauth=True,                      # OAuth-based authentication
+        context_window=400_000,
     ),
 
     # Github Copilot: uses OAuth, not API key.
@@ -234,6 +246,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         strip_model_prefix=False,
         model_overrides=(),
         is_oauth=True,                      # OAuth-based authentication
+        context_window=128_000,
     ),
 
     # DeepSeek: needs "deepseek/" prefix for LiteLLM routing.
@@ -252,6 +265,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=128_000,
     ),
 
     # Gemini: needs "gemini/" prefix for LiteLLM.
@@ -270,6 +284,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=1_000_000,
     ),
 
     # Zhipu: LiteLLM uses "zai/" prefix.
@@ -292,6 +307,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=128_000,
     ),
 
     # DashScope: Qwen models, needs "dashscope/" prefix.
@@ -310,6 +326,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=128_000,
+        model_context_windows=(("qwen-max", 32_000), ("qwen-turbo", 1_000_000)),
     ),
 
     # Moonshot: Kimi models, needs "moonshot/" prefix.
@@ -334,6 +352,8 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         model_overrides=(
             ("kimi-k2.5", {"temperature": 1.0}),
         ),
+        context_window=128_000,
+        model_context_windows=(("kimi-k2", 256_000),),
     ),
 
     # MiniMax: needs "minimax/" prefix for LiteLLM routing.
@@ -353,6 +373,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="https://api.minimax.io/v1",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=200_000,
     ),
 
     # === Local deployment (matched by config key, NOT by api_base) =========
@@ -423,6 +444,18 @@ def find_by_model(model: str) -> ProviderSpec | None:
     return None
 
 
+def find_context_window(model: str) -> int:
+    """Return the model's context window in tokens from the registry, or 0 if unknown."""
+    spec = find_by_model(model)
+    if not spec:
+        return 0
+    model_lower = model.lower()
+    for pattern, window in spec.model_context_windows:
+        if pattern in model_lower:
+            return window
+    return spec.context_window
+
+
 def find_gateway(
     provider_name: str | None = None,
     api_key: str | None = None,
@@ -0,0 +1,88 @@
+"""Assemble streamed OpenAI-style chat completion chunks."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import json_repair
+
+from nanobot.providers.base import LLMResponse, ToolCallRequest, usage_dict
+
+
+class ChatCompletionStream:
+    """
+    Fold ``chat.completion.chunk`` objects into a single LLMResponse.
+
+    LiteLLM and the OpenAI SDK emit the same chunk shape: ``choices[0].delta``
+    carries content and tool-call fragments (keyed by ``index``), and the last
+    chunk may carry ``usage`` when ``stream_options.include_usage`` is set.
+    """
+
+    def __init__(self) -> None:
+        self._content: list[str] = []
+        self._reasoning: list[str] = []
+        self._tool_calls: dict[int, dict[str, str]] = {}
+        self.finish_reason = "stop"
+        self.usage: dict[str, int] = {}
+
+    def feed(self, chunk: Any) -> str:
+        """Absorb one chunk and return the text it added (may be empty)."""
+        usage = getattr(chunk, "usage", None)
+        if usage:
+            self.usage = usage_dict(usage)
+
+        choices = getattr(chunk, "choices", None) or []
+        if not choices:
+            return ""
+        choice = choices[0]
+        if getattr(choice, "finish_reason", None):
+            self.finish_reason = choice.finish_reason
+
+        delta = getattr(choice, "delta", None)
+        if delta is None:
+            return ""
+
+        reasoning = getattr(delta, "reasoning_content", None)
+        if reasoning:
+            self._reasoning.append(reasoning)
+
+        for tc in getattr(delta, "tool_calls", None) or []:
+            index = getattr(tc, "index", None)
+            if index is None:
+                index = len(self._tool_calls)
+            buf = self._tool_calls.setdefault(index, {"id": "", "name": "", "arguments": ""})
+            if getattr(tc, "id", None):
+                buf["id"] = tc.id
+            fn = getattr(tc, "function", None)
+            if fn is not None:
+                if getattr(fn, "name", None):
+                    buf["name"] = fn.name
+                if getattr(fn, "arguments", None):
+                    buf["arguments"] += fn.arguments
+
+        text = getattr(delta, "content", None) or ""
+        if text:
+            self._content.append(text)
+        return text
+
+    def tool_calls(self) -> list[ToolCallRequest]:
+        """Return the tool calls assembled so far, in index order."""
+        return [
+            ToolCallRequest(
+                id=buf["id"] or f"call_{index}",
+                name=buf["name"],
+                arguments=json_repair.loads(buf["arguments"] or "{}"),
+            )
+            for index, buf in sorted(self._tool_calls.items())
+            if buf["name"]
+        ]
+
+    def response(self) -> LLMResponse:
+        """Build the final response from everything fed so far."""
+        return LLMResponse(
+            content="".join(self._content) or None,
+            tool_calls=self.tool_calls(),
+            finish_reason=self.finish_reason,
+            usage=self.usage,
+            reasoning_content="".join(self._reasoning) or None,
+        )
@@ -1,6 +1,7 @@
 """Session management for conversation history."""
 
 import json
+import os
 import shutil
 from pathlib import Path
 from dataclasses import dataclass, field
@@ -9,6 +10,7 @@ from typing import Any
 
 from loguru import logger
 
+from nanobot.utils import tracing
 from nanobot.utils.helpers import ensure_dir, safe_filename
 
 
@@ -69,18 +71,44 @@ class Session:
         self.updated_at = datetime.now()
 
 
+@dataclass
+class _PersistState:
+    """What the session file on disk currently holds for one session."""
+
+    message_count: int  # Messages already written to the file
+    size: int  # File size in bytes after the last write
+    tail: dict[str, Any] | None  # Last persisted message object (identity check)
+    records: int = 0  # Metadata records appended since the last full rewrite
+
+
 class SessionManager:
     """
     Manages conversation sessions.
 
     Sessions are stored as JSONL files in the sessions directory.
+
+    In append-only mode (the default) ``save()`` only appends the messages
+    added since the previous save plus a fresh metadata record, so save cost
+    does not grow with conversation length. The last metadata record in a
+    file wins on load. Files are rewritten in full when the in-memory history
+    no longer extends what is on disk (e.g. after ``/new``), and compacted
+    back to a single header once enough metadata records have piled up.
     """
 
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        append_only: bool = True,
+        compact_threshold: int = 200,
+    ):
         self.workspace = workspace
         self.sessions_dir = ensure_dir(self.workspace / "sessions")
         self.legacy_sessions_dir = Path.home() / ".nanobot" / "sessions"
+        self.append_only = append_only
+        self.compact_threshold = max(1, compact_threshold)
         self._cache: dict[str, Session] = {}
+        self._persisted: dict[str, _PersistState] = {}
+        self._pending_compaction: set[str] = set()
     
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
@@ -105,7 +133,8 @@ class SessionManager:
         if key in self._cache:
             return self._cache[key]
         
-        session = self._load(key)
+        with tracing.span("session.load", session_key=key):
+            session = self._load(key)
         if session is None:
             session = Session(key=key)
         
@@ -131,7 +160,10 @@ class SessionManager:
             messages = []
             metadata = {}
             created_at = None
+            updated_at = None
             last_consolidated = 0
+            records = 0
+            torn = False
 
             with open(path, encoding="utf-8") as f:
                 for line in f:
@@ -139,45 +171,143 @@ class SessionManager:
                     if not line:
                         continue
 
-                    data = json.loads(line)
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash mid-append can leave a partial last line.
+                        logger.warning("Skipping unreadable line in session {}", key)
+                        torn = True
+                        continue
 
                     if data.get("_type") == "metadata":
+                        records += 1
                         metadata = data.get("metadata", {})
                         created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
+                        updated_at = datetime.fromisoformat(data["updated_at"]) if data.get("updated_at") else None
                         last_consolidated = data.get("last_consolidated", 0)
                     else:
                         messages.append(data)
 
-            return Session(
+            session = Session(
                 key=key,
                 messages=messages,
                 created_at=created_at or datetime.now(),
+                updated_at=updated_at or datetime.now(),
                 metadata=metadata,
                 last_consolidated=last_consolidated
             )
         except Exception as e:
             logger.warning("Failed to load session {}: {}", key, e)
             return None
+
+        if torn:
+            # Force a full rewrite on the next save.
+            self._persisted.pop(key, None)
+        else:
+            self._persisted[key] = _PersistState(
+                message_count=len(messages),
+                size=path.stat().st_size,
+                tail=messages[-1] if messages else None,
+                records=max(0, records - 1),
+            )
+            if records > self.compact_threshold:
+                self._pending_compaction.add(key)
+        return session
     
+    @staticmethod
+    def _metadata_line(session: Session) -> str:
+        record = {
+            "_type": "metadata",
+            "key": session.key,
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata,
+            "last_consolidated": session.last_consolidated
+        }
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+    def _can_append(self, session: Session, path: Path) -> _PersistState | None:
+        """Return the persist state if the file can be extended in place."""
+        state = self._persisted.get(session.key)
+        if not self.append_only or state is None:
+            return None
+        count = state.message_count
+        if len(session.messages) < count:
+            return None
+        # The history must still start with what was written (clear() swaps the list).
+        if count and session.messages[count - 1] is not state.tail:
+            return None
+        try:
+            if path.stat().st_size != state.size:
+                return None  # Modified outside this manager
+        except OSError:
+            return None
+        return state
+
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
+        """Save a session to disk, appending only what changed when possible."""
+        with tracing.span("session.save", session_key=session.key):
+            self._save(session)
+
+    def _save(self, session: Session) -> None:
         path = self._get_session_path(session.key)
 
-        with open(path, "w", encoding="utf-8") as f:
-            metadata_line = {
-                "_type": "metadata",
-                "key": session.key,
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata,
-                "last_consolidated": session.last_consolidated
-            }
-            f.write(json.dumps(metadata_line, ensure_ascii=False) + "\n")
+        state = self._can_append(session, path)
+        if state is None:
+            self._rewrite(session, path)
+        else:
+            new_messages = session.messages[state.message_count:]
+            with open(path, "a", encoding="utf-8") as f:
+                for msg in new_messages:
+                    f.write(json.dumps(msg, ensure_ascii=False) + "\n")
+                f.write(self._metadata_line(session))
+            state.message_count = len(session.messages)
+            state.size = path.stat().st_size
+            if new_messages:
+                state.tail = new_messages[-1]
+            state.records += 1
+            if state.records >= self.compact_threshold:
+                self._pending_compaction.add(session.key)
+
+        self._cache[session.key] = session
+
+    def _rewrite(self, session: Session, path: Path) -> None:
+        """Write the whole session (header + messages) atomically."""
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self._metadata_line(session))
             for msg in session.messages:
                 f.write(json.dumps(msg, ensure_ascii=False) + "\n")
+        os.replace(tmp, path)
+
+        self._persisted[session.key] = _PersistState(
+            message_count=len(session.messages),
+            size=path.stat().st_size,
+            tail=session.messages[-1] if session.messages else None,
+        )
+        self._pending_compaction.discard(session.key)
+
+    def compact(self, key: str) -> bool:
+        """Fold appended metadata records back into a single header line."""
+        self._pending_compaction.discard(key)
+        session = self._cache.get(key) or self._load(key)
+        if session is None:
+            return False
+        self._rewrite(session, self._get_session_path(key))
+        logger.debug("Compacted session {}", key)
+        return True
+
+    def compact_pending(self) -> int:
+        """Compact sessions that crossed the threshold. Returns how many were compacted."""
+        done = 0
+        for key in list(self._pending_compaction):
+            try:
+                if self.compact(key):
+                    done += 1
+            except Exception:
+                logger.exception("Failed to compact session {}", key)
+        return done
 
-        self._cache[session.key] = session
-    
     def invalidate(self, key: str) -> None:
         """Remove a session from the in-memory cache."""
         self._cache.pop(key, None)
@@ -199,14 +329,33 @@ class SessionManager:
                     if first_line:
                         data = json.loads(first_line)
                         if data.get("_type") == "metadata":
+                            latest = self._read_last_metadata(path) or data
                             key = data.get("key") or path.stem.replace("_", ":", 1)
                             sessions.append({
                                 "key": key,
                                 "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
+                                "updated_at": latest.get("updated_at"),
                                 "path": str(path)
                             })
             except Exception:
                 continue
         
         return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+
+    @staticmethod
+    def _read_last_metadata(path: Path, chunk: int = 65536) -> dict[str, Any] | None:
+        """Return the trailing metadata record appended by save(), if any."""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - chunk))
+            lines = f.read().splitlines()
+        for raw in reversed(lines):
+            if not raw.strip():
+                continue
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                return None
+            return data if data.get("_type") == "metadata" else None
+        return None
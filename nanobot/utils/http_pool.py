@@ -0,0 +1,110 @@
+"""Process-wide pool of shared HTTP clients."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import weakref
+from http.cookiejar import CookieJar
+from typing import TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import HttpConfig
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+DEFAULT_MAX_REDIRECTS = 20  # httpx default
+
+
+class _DiscardingCookieJar(CookieJar):
+    """
+    Cookie jar that never stores anything.
+
+    The pooled clients are shared by every chat and user, so a ``Set-Cookie``
+    from one fetch must not be replayed on another.
+    """
+
+    def set_cookie(self, cookie) -> None:
+        pass
+
+    def extract_cookies(self, response, request) -> None:
+        pass
+
+
+class HttpClientPool:
+    """
+    Long-lived ``httpx.AsyncClient`` instances shared by tools, providers and channels.
+
+    Each event loop gets one client per connection profile (TLS verification and
+    redirect cap). Keep-alive connections then stay open per host across calls, so
+    repeated requests skip the TCP and TLS handshakes. HTTP/2 is negotiated when
+    the optional ``h2`` package is installed.
+
+    The clients keep no cookies between requests. Callers must not close the
+    clients they get; use ``close_http_pool()`` on shutdown.
+    """
+
+    def __init__(self, config: HttpConfig | None = None):
+        from nanobot.config.schema import HttpConfig
+
+        self.config = config or HttpConfig()
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[tuple[bool, int], httpx.AsyncClient]
+        ] = weakref.WeakKeyDictionary()
+
+    def get(self, *, verify: bool = True, max_redirects: int = DEFAULT_MAX_REDIRECTS) -> httpx.AsyncClient:
+        """Return the shared client for this profile on the running event loop."""
+        clients = self._clients.setdefault(asyncio.get_running_loop(), {})
+        key = (verify, max_redirects)
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = clients[key] = self._build(verify, max_redirects)
+        return client
+
+    def _build(self, verify: bool, max_redirects: int) -> httpx.AsyncClient:
+        cfg = self.config
+        return httpx.AsyncClient(
+            http2=cfg.http2 and HTTP2_AVAILABLE,
+            verify=verify,
+            max_redirects=max_redirects,
+            cookies=_DiscardingCookieJar(),
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=cfg.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(cfg.timeout, connect=cfg.connect_timeout),
+        )
+
+    async def aclose(self) -> None:
+        """Close the clients bound to the running loop; other loops' clients go with their loop."""
+        clients = self._clients.pop(asyncio.get_running_loop(), {})
+        await asyncio.gather(*(client.aclose() for client in clients.values()), return_exceptions=True)
+
+
+_pool: HttpClientPool | None = None
+
+
+def get_http_pool() -> HttpClientPool:
+    """Return the process-wide pool, creating it with default settings if needed."""
+    global _pool
+    if _pool is None:
+        _pool = HttpClientPool()
+    return _pool
+
+
+def configure_http_pool(config: HttpConfig) -> None:
+    """Apply connection limits and timeouts to clients created from now on."""
+    get_http_pool().config = config
+
+
+def get_http_client(*, verify: bool = True, max_redirects: int = DEFAULT_MAX_REDIRECTS) -> httpx.AsyncClient:
+    """Shortcut for ``get_http_pool().get(...)``."""
+    return get_http_pool().get(verify=verify, max_redirects=max_redirects)
+
+
+async def close_http_pool() -> None:
+    """Close all pooled clients of the running loop (call on shutdown)."""
+    if _pool is not None:
+        await _pool.aclose()
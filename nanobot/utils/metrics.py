@@ -0,0 +1,331 @@
+"""In-process metrics exposed in the Prometheus text format."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import time
+from typing import Any, Callable
+
+from loguru import logger
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+class _Metric:
+    """A named metric family with a fixed set of label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def _key(self, values: tuple[Any, ...]) -> tuple[str, ...]:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values!r}")
+        return tuple(str(v) for v in values)
+
+    def _lines(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self._lines()]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _lines(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """A value that can go up and down, set directly or read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._functions: dict[tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, *labels: Any) -> None:
+        self._values[self._key(labels)] = value
+
+    def set_function(self, fn: Callable[[], float], *labels: Any) -> None:
+        self._functions[self._key(labels)] = fn
+
+    def value(self, *labels: Any) -> float:
+        key = self._key(labels)
+        fn = self._functions.get(key)
+        return float(fn()) if fn else self._values.get(key, 0.0)
+
+    def _lines(self) -> list[str]:
+        values = dict(self._values)
+        for key, fn in self._functions.items():
+            try:
+                values[key] = float(fn())
+            except Exception as e:
+                logger.debug("Metrics: gauge {} callback failed: {}", self.name, e)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], list[float]] = {}  # bucket counts..., sum, count
+
+    def observe(self, value: float, *labels: Any) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def count(self, *labels: Any) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[-1]) if series else 0
+
+    def _lines(self) -> list[str]:
+        lines = []
+        names = self.labelnames + ("le",)
+        for key, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{_format_labels(names, key + (_format_value(bound),))} {_format_value(count)}")
+            lines.append(f"{self.name}_bucket{_format_labels(names, key + ('+Inf',))} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metric families rendered together on each scrape."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> Any:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} is already registered differently")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+BUS_INBOUND = registry.gauge("nanobot_bus_inbound_size", "Messages waiting in the inbound queue.")
+BUS_OUTBOUND = registry.gauge("nanobot_bus_outbound_size", "Messages waiting in the outbound queue.")
+LLM_REQUEST_SECONDS = registry.histogram(
+    "nanobot_llm_request_seconds", "LLM request latency, to the last streamed chunk.", ("provider", "model"),
+)
+LLM_FIRST_TOKEN_SECONDS = registry.histogram(
+    "nanobot_llm_first_token_seconds", "Time to the first streamed text chunk.", ("provider", "model"),
+)
+LLM_TOKENS = registry.counter("nanobot_llm_tokens_total", "Tokens reported by the provider.", ("provider", "model", "type"))
+LLM_ERRORS = registry.counter("nanobot_llm_errors_total", "LLM requests that ended in an error.", ("provider", "model"))
+LLM_FAILOVERS = registry.counter(
+    "nanobot_llm_failovers_total", "Requests moved on to the next backend after this one failed.", ("model",),
+)
+LLM_CIRCUIT_OPEN = registry.gauge("nanobot_llm_circuit_open", "1 while a backend's circuit breaker is open.", ("model",))
+LLM_CONCURRENCY_LIMIT = registry.gauge(
+    "nanobot_llm_concurrency_limit", "Current adaptive in-flight limit per backend.", ("model",),
+)
+LLM_IN_FLIGHT = registry.gauge("nanobot_llm_in_flight", "LLM requests in flight per backend.", ("model",))
+LLM_HEDGES = registry.counter(
+    "nanobot_llm_hedges_total", "Hedged LLM requests, by which copy answered first.", ("model", "winner"),
+)
+LLM_HEDGES_SKIPPED = registry.counter(
+    "nanobot_llm_hedges_skipped_total", "Slow requests not hedged because a cap was reached.", ("model", "reason"),
+)
+LLM_HEDGE_WASTED_TOKENS = registry.counter(
+    "nanobot_llm_hedge_wasted_tokens_total", "Estimated prompt tokens sent twice by hedging.", ("model",),
+)
+LLM_ADMISSION_WAIT_SECONDS = registry.histogram(
+    "nanobot_llm_admission_wait_seconds", "Time a request waited for an LLM slot.", ("priority",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0),
+)
+TOOL_SECONDS = registry.histogram("nanobot_tool_seconds", "Tool execution time.", ("tool",))
+TOOL_ERRORS = registry.counter("nanobot_tool_errors_total", "Tool calls that returned an error.", ("tool",))
+CONSOLIDATION_SECONDS = registry.histogram(
+    "nanobot_consolidation_seconds", "Memory consolidation duration.", ("status",),
+)
+CRON_LAG_SECONDS = registry.histogram(
+    "nanobot_cron_lag_seconds", "Delay between a cron job's scheduled and actual start.",
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+CRON_RUNS = registry.counter("nanobot_cron_runs_total", "Cron job runs.", ("status",))
+CHANNEL_SENT = registry.counter("nanobot_channel_messages_sent_total", "Outbound messages delivered.", ("channel",))
+CHANNEL_SEND_FAILURES = registry.counter(
+    "nanobot_channel_send_failures_total", "Outbound messages a channel failed to deliver.", ("channel",),
+)
+CHANNEL_OUTBOUND_QUEUE = registry.gauge(
+    "nanobot_channel_outbound_queue_size", "Messages waiting for delivery per channel.", ("channel",),
+)
+CHANNEL_OUTBOUND_DROPPED = registry.counter(
+    "nanobot_channel_outbound_dropped_total",
+    "Progress messages dropped on a full queue or merged into a newer one.", ("channel", "reason"),
+)
+CHANNEL_RATE_LIMITED = registry.counter(
+    "nanobot_channel_rate_limited_total", "Rate-limit responses (429 / Retry-After) from a channel.", ("channel",),
+)
+CHANNEL_THROTTLE_SECONDS = registry.histogram(
+    "nanobot_channel_throttle_seconds", "Time a message waited for a channel's rate limits.", ("channel",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+WEB_CACHE_HITS = registry.counter(
+    "nanobot_web_cache_hits_total", "web_search/web_fetch results served from the cache.", ("tier",),
+)
+WEB_CACHE_MISSES = registry.counter(
+    "nanobot_web_cache_misses_total", "web_search/web_fetch lookups that found no fresh entry.",
+)
+
+
+class MetricsServer:
+    """
+    Minimal HTTP server for ``/metrics`` (Prometheus text) and ``/health`` (JSON).
+
+    ``health`` returns extra fields for the health document; it runs on every
+    request, so it should only read in-memory state.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        metrics: MetricsRegistry | None = None,
+        health: Callable[[], dict[str, Any]] | None = None,
+    ):
+        self.host = host
+        self.port = port
+        self.metrics = metrics or registry
+        self.health = health
+        self._server: asyncio.Server | None = None
+        self._started = time.monotonic()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self._started = time.monotonic()
+        sockets = self._server.sockets or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+        logger.info("Metrics: serving /metrics and /health on {}:{}", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def health_document(self) -> dict[str, Any]:
+        doc: dict[str, Any] = {"status": "ok", "uptime_s": round(time.monotonic() - self._started, 1)}
+        if self.health:
+            doc.update(self.health())
+        return doc
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            while await asyncio.wait_for(reader.readline(), timeout=5) not in (b"\r\n", b"\n", b""):
+                pass  # Headers are not needed
+            parts = request.decode("latin-1").split()
+            method, path = (parts[0], parts[1].split("?", 1)[0]) if len(parts) >= 2 else ("", "")
+            if method not in ("GET", "HEAD"):
+                status, content_type, body = "405 Method Not Allowed", "text/plain", b"method not allowed\n"
+            elif path == "/metrics":
+                status, content_type, body = "200 OK", CONTENT_TYPE, self.metrics.render().encode()
+            elif path in ("/health", "/healthz"):
+                body = json.dumps(self.health_document(), ensure_ascii=False).encode()
+                status, content_type = "200 OK", "application/json"
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", b"not found\n"
+            head = (
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+            )
+            writer.write(head.encode() + (body if method != "HEAD" else b""))
+            await writer.drain()
+        except Exception as e:
+            logger.debug("Metrics: request failed: {}", e)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
@@ -4,7 +4,24 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, NamedTuple
+
+# re.IGNORECASE lets these non-ASCII letters match ASCII ones ("\u212a" matches "k").
+_ASCII_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+
+
+def _fold(text: str) -> str:
+    """Lower-case text so that every case-insensitive match of an ASCII literal is a substring."""
+    return (text if text.isascii() else text.translate(_ASCII_FOLD)).lower()
+
+
+class _Rule(NamedTuple):
+    """One redaction pass and the substrings it cannot match without."""
+
+    pattern: re.Pattern[str] | None  # None: replace each trigger literal with repl
+    repl: str | Callable[[re.Match[str]], str]
+    triggers: tuple[str, ...] = ()  # Case-sensitive, checked against the text
+    folded: tuple[str, ...] = ()  # Lower-case, checked against _fold(text)
 
 
 class SensitiveOutputRedactor:
@@ -92,6 +109,7 @@ class SensitiveOutputRedactor:
 
         self._add_default_paths(workspace, config_path)
         self._add_extra_secrets(extra_secrets)
+        self._rules = self._compile_rules()
 
     def redact(self, text: str) -> str:
         """Redact sensitive values from text."""
@@ -99,48 +117,87 @@ class SensitiveOutputRedactor:
             return text
 
         sanitized = text
+        folded_src, folded = None, ""
+        for rule in self._rules:
+            if not any(t in sanitized for t in rule.triggers):
+                if not rule.folded:
+                    continue
+                if folded_src is not sanitized:
+                    folded_src, folded = sanitized, _fold(sanitized)
+                if not any(t in folded for t in rule.folded):
+                    continue
+            sanitized = self._apply(rule, sanitized)
+        return sanitized
 
-        sanitized = self._WORKSPACE_LINE_RE.sub(
-            rf"\1{self.PATH_PLACEHOLDER}", sanitized
-        )
-        sanitized = self._CHAT_ID_LINE_RE.sub(
-            rf"\1{self.CHAT_ID_PLACEHOLDER}", sanitized
-        )
-        sanitized = self._CHAT_ID_FIELD_RE.sub(
-            rf"\1{self.CHAT_ID_PLACEHOLDER}", sanitized
-        )
-        sanitized = self._SESSION_KEY_RE.sub(
-            lambda m: f"{m.group(1)}:{self.CHAT_ID_PLACEHOLDER}", sanitized
-        )
-
-        sanitized = self._replace_literals(
-            sanitized, self._literal_secrets, self.SECRET_PLACEHOLDER
-        )
-        sanitized = self._replace_literals(
-            sanitized, self._literal_endpoints, self.ENDPOINT_PLACEHOLDER
-        )
-        sanitized = self._replace_literals(
-            sanitized, self._literal_paths, self.PATH_PLACEHOLDER
-        )
+    def _compile_rules(self) -> list[_Rule]:
+        """
+        Build the ordered redaction passes.
 
-        sanitized = self._KV_SECRET_RE.sub(rf"\1{self.SECRET_PLACEHOLDER}", sanitized)
-        sanitized = self._BEARER_RE.sub(
-            f"Bearer {self.SECRET_PLACEHOLDER}", sanitized
+        Each pass lists literals that any match must contain, so redact() can
+        skip a pass with a substring check instead of a regex scan. Skipping
+        a pass that cannot match leaves the output unchanged.
+        """
+        path, endpoint = self.PATH_PLACEHOLDER, self.ENDPOINT_PLACEHOLDER
+        secret, chat_id = self.SECRET_PLACEHOLDER, self.CHAT_ID_PLACEHOLDER
+        session_prefixes = tuple(
+            f"{name}:"
+            for name in ("cli", "telegram", "discord", "whatsapp", "feishu", "dingtalk", "slack", "email", "qq")
         )
-        sanitized = self._GENERIC_SK_RE.sub(self.SECRET_PLACEHOLDER, sanitized)
-        sanitized = self._SLACK_TOKEN_RE.sub(self.SECRET_PLACEHOLDER, sanitized)
+        private_hosts = ("127.", "0.0.0.0", "10.", "192.168", "172.")
+        private_urls = tuple(f"://{host}" for host in private_hosts)
+        return [
+            _Rule(self._WORKSPACE_LINE_RE, rf"\1{path}", folded=("your workspace is at:",)),
+            _Rule(self._CHAT_ID_LINE_RE, rf"\1{chat_id}", folded=("chat id:",)),
+            _Rule(self._CHAT_ID_FIELD_RE, rf"\1{chat_id}", folded=("chat",)),
+            _Rule(self._SESSION_KEY_RE, lambda m: f"{m.group(1)}:{chat_id}", triggers=session_prefixes),
+            self._literal_rule(self._literal_secrets, secret),
+            self._literal_rule(self._literal_endpoints, endpoint),
+            self._literal_rule(self._literal_paths, path),
+            _Rule(
+                self._KV_SECRET_RE,
+                rf"\1{secret}",
+                folded=("api", "token", "secret", "password", "authorization"),
+            ),
+            _Rule(self._BEARER_RE, f"Bearer {secret}", folded=("bearer",)),
+            _Rule(self._GENERIC_SK_RE, secret, triggers=("sk-",)),
+            _Rule(self._SLACK_TOKEN_RE, secret, triggers=("xox", "xapp-")),
+            _Rule(self._PRIVATE_ENDPOINT_RE, endpoint, triggers=private_urls, folded=("://localhost",)),
+            _Rule(self._PRIVATE_HOSTPORT_RE, endpoint, triggers=private_hosts, folded=("localhost",)),
+            # Only private or configured endpoint URLs are rewritten; other URLs are kept.
+            _Rule(
+                self._URL_RE,
+                self._replace_url_if_private,
+                triggers=private_urls + tuple(self._literal_endpoints),
+                folded=("://localhost",),
+            ),
+            _Rule(self._TILDE_NANOBOT_PATH_RE, path, triggers=("~/", "~\\")),
+            _Rule(self._WINDOWS_ABS_PATH_RE, path, triggers=(":\\", ":/")),
+            _Rule(
+                self._UNIX_ABS_PATH_RE,
+                path,
+                triggers=("/home", "/Users", "/root", "/etc", "/var", "/opt", "/tmp"),
+            ),
+        ]
 
-        sanitized = self._PRIVATE_ENDPOINT_RE.sub(self.ENDPOINT_PLACEHOLDER, sanitized)
-        sanitized = self._PRIVATE_HOSTPORT_RE.sub(self.ENDPOINT_PLACEHOLDER, sanitized)
-        sanitized = self._URL_RE.sub(self._replace_url_if_private, sanitized)
-
-        sanitized = self._TILDE_NANOBOT_PATH_RE.sub(self.PATH_PLACEHOLDER, sanitized)
-        sanitized = self._WINDOWS_ABS_PATH_RE.sub(
-            self.PATH_PLACEHOLDER, sanitized
-        )
-        sanitized = self._UNIX_ABS_PATH_RE.sub(self.PATH_PLACEHOLDER, sanitized)
+    @staticmethod
+    def _literal_rule(values: Iterable[str], placeholder: str) -> _Rule:
+        """Replace literal values longest first, including their JSON-escaped form."""
+        literals: list[str] = []
+        for value in sorted(set(values), key=len, reverse=True):
+            if not value:
+                continue
+            literals.append(value)
+            if "\\" in value:
+                literals.append(value.replace("\\", "\\\\"))
+        return _Rule(None, placeholder, triggers=tuple(literals))
 
-        return sanitized
+    @staticmethod
+    def _apply(rule: _Rule, text: str) -> str:
+        if rule.pattern is not None:
+            return rule.pattern.sub(rule.repl, text)
+        for literal in rule.triggers:
+            text = text.replace(literal, rule.repl)
+        return text
 
     def _add_default_paths(self, workspace: Path | None, config_path: Path | None) -> None:
         home = Path.home().expanduser()
@@ -179,17 +236,6 @@ class SensitiveOutputRedactor:
         self._literal_paths.add(resolved)
         self._literal_paths.add(resolved.replace("\\", "/"))
 
-    @staticmethod
-    def _replace_literals(text: str, values: Iterable[str], placeholder: str) -> str:
-        sanitized = text
-        for value in sorted(set(values), key=len, reverse=True):
-            if not value:
-                continue
-            sanitized = sanitized.replace(value, placeholder)
-            if "\\" in value:
-                sanitized = sanitized.replace(value.replace("\\", "\\\\"), placeholder)
-        return sanitized
-
     @staticmethod
     def _looks_like_endpoint(value: str) -> bool:
         lower = value.lower()
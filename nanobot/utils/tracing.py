@@ -0,0 +1,394 @@
+"""Lightweight tracing with OTLP-compatible export.
+
+Spans nest through a context variable, so a span opened inside another one
+(in the same task, or in a task created from it) becomes its child. Finished
+spans are appended to a JSON Lines file where each line is an OTLP/JSON
+``TracesData`` document. An OpenTelemetry collector's ``otlpjsonfile``
+receiver can read that file, and spans can also be posted straight to an
+OTLP/HTTP endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import TracingConfig
+
+SERVICE_NAME = "nanobot"
+
+# Attributes holding a chat identity; exported with the chat id pseudonymized.
+_SESSION_ATTRIBUTES = frozenset({"session_key"})
+# Per process, so spans of one run still group by session but ids cannot be looked up.
+_PSEUDONYM_KEY = os.urandom(16)
+
+
+def _pseudonymize(session_key: str) -> str:
+    """Keep the channel of a session key and replace the chat id with a keyed digest."""
+    channel, sep, chat_id = session_key.partition(":")
+    if not sep:
+        channel, chat_id = "", session_key
+    digest = hashlib.blake2b(chat_id.encode("utf-8"), key=_PSEUDONYM_KEY, digest_size=6).hexdigest()
+    return f"{channel}{sep}{digest}"
+
+
+@dataclass(eq=False)
+class Span:
+    """One timed operation within a trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str = ""
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        """Add or replace attributes."""
+        self.attributes.update(attributes)
+
+    @property
+    def traceparent(self) -> str:
+        """W3C ``traceparent`` value that makes a later span a child of this one."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otlp(self) -> dict[str, Any]:
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": k, "value": _otlp_value(_pseudonymize(str(v)) if k in _SESSION_ATTRIBUTES else v)}
+                for k, v in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error is not None else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Stand-in yielded while tracing is disabled."""
+
+    traceparent = ""
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+_current: ContextVar[Span | None] = ContextVar("nanobot_current_span", default=None)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _traces_data(spans: list[Span]) -> dict[str, Any]:
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "nanobot"}, "spans": [s.to_otlp() for s in spans]}],
+        }]
+    }
+
+
+def _parse_traceparent(value: str | None) -> tuple[str, str] | None:
+    parts = (value or "").split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+class Tracer:
+    """
+    Create spans and export them when they finish.
+
+    With no file and no OTLP endpoint the tracer is disabled and ``span()``
+    costs one attribute check.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_bytes: int = 16 * 1024 * 1024,
+        otlp_endpoint: str = "",
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.otlp_endpoint = otlp_endpoint
+        self.enabled = bool(path or otlp_endpoint)
+        self._file = None
+        self._size = 0
+        self._pending: list[Span] = []
+        self._flush_task: asyncio.Task | None = None
+
+    @contextmanager
+    def span(self, name: str, parent: str | None = None, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+        """
+        Time the enclosed block as a span.
+
+        ``parent`` is a ``traceparent`` string for work that continues a trace
+        from elsewhere (e.g. an outbound message sent after its turn ended).
+        Exceptions mark the span as failed and propagate.
+        """
+        if not self.enabled:
+            yield _NOOP
+            return
+        current = _current.get()
+        remote = _parse_traceparent(parent)
+        if remote:
+            trace_id, parent_id = remote
+        elif current is not None:
+            trace_id, parent_id = current.trace_id, current.span_id
+        else:
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", ""
+        span = Span(name, trace_id, f"{random.getrandbits(64):016x}", parent_id, attributes=attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            self._export(span)
+
+    def _export(self, span: Span) -> None:
+        if self.path is not None:
+            try:
+                self._write(json.dumps(_traces_data([span]), ensure_ascii=False, separators=(",", ":")) + "\n")
+            except OSError as e:
+                logger.warning("Tracing: cannot write {}: {}", self.path, e)
+                self.path = None
+        if self.otlp_endpoint:
+            self._pending.append(span)
+            if not span.parent_id or len(self._pending) >= 256:
+                self._schedule_flush()
+
+    def _write(self, line: str) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._size = self._file.tell()
+        if self._size + len(line.encode("utf-8")) > self.max_bytes and self._size:
+            # Keep one rotated file so recent history survives a rollover.
+            self._file.close()
+            self.path.replace(self.path.with_name(self.path.name + ".1"))
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._size = 0
+        self._file.write(line)
+        self._file.flush()
+        self._size += len(line.encode("utf-8"))
+
+    def _schedule_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self.flush())
+
+    async def flush(self) -> None:
+        """Post pending spans to the OTLP endpoint."""
+        from nanobot.utils.http_pool import get_http_client
+
+        while self._pending:
+            batch, self._pending = self._pending[:512], self._pending[512:]
+            try:
+                response = await get_http_client().post(self.otlp_endpoint, json=_traces_data(batch), timeout=10)
+                if response.status_code >= 400:
+                    logger.debug("Tracing: OTLP export returned HTTP {}", response.status_code)
+            except Exception as e:
+                logger.debug("Tracing: OTLP export failed: {}", e)
+
+    async def shutdown(self) -> None:
+        """Flush pending spans and close the trace file."""
+        if self.otlp_endpoint:
+            await self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer (disabled until configured)."""
+    return _tracer
+
+
+def configure_tracing(config: TracingConfig, default_path: Path) -> Tracer:
+    """Replace the process-wide tracer according to config."""
+    global _tracer
+    if _tracer._file is not None:
+        _tracer._file.close()
+        _tracer._file = None
+    if not config.enabled:
+        _tracer = Tracer()
+    else:
+        path = Path(config.file).expanduser() if config.file else default_path
+        _tracer = Tracer(path, config.max_file_mb * 1024 * 1024, config.otlp_endpoint)
+    return _tracer
+
+
+def span(name: str, parent: str | None = None, **attributes: Any):
+    """Shortcut for ``get_tracer().span(...)``."""
+    return _tracer.span(name, parent, **attributes)
+
+
+def current_traceparent() -> str | None:
+    """``traceparent`` of the active span, if any."""
+    current = _current.get()
+    return current.traceparent if current is not None else None
+
+
+async def shutdown_tracing() -> None:
+    """Flush and close the process-wide tracer (call on shutdown)."""
+    await _tracer.shutdown()
+
+
+# ---------------------------------------------------------------------------
+# Reading traces back
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SpanRecord:
+    """A finished span read from a trace file."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str
+    start_ns: int
+    end_ns: int
+    attributes: dict[str, Any]
+    error: str | None = None
+    children: list[SpanRecord] = field(default_factory=list)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+def _attr_value(value: dict[str, Any]) -> Any:
+    if "intValue" in value:
+        return int(value["intValue"])
+    for key in ("stringValue", "doubleValue", "boolValue"):
+        if key in value:
+            return value[key]
+    return None
+
+
+def load_spans(path: Path) -> list[SpanRecord]:
+    """Read spans from a trace file and its rotated predecessor, oldest first."""
+    records: list[SpanRecord] = []
+    for file in (path.with_name(path.name + ".1"), path):
+        if not file.exists():
+            continue
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partial line from a crash
+                for resource in data.get("resourceSpans", []):
+                    for scope in resource.get("scopeSpans", []):
+                        for s in scope.get("spans", []):
+                            status = s.get("status") or {}
+                            records.append(SpanRecord(
+                                name=s.get("name", ""),
+                                trace_id=s.get("traceId", ""),
+                                span_id=s.get("spanId", ""),
+                                parent_id=s.get("parentSpanId", ""),
+                                start_ns=int(s.get("startTimeUnixNano", 0)),
+                                end_ns=int(s.get("endTimeUnixNano", 0)),
+                                attributes={a["key"]: _attr_value(a.get("value", {})) for a in s.get("attributes", [])},
+                                error=status.get("message") if status.get("code") == 2 else None,
+                            ))
+    return records
+
+
+def slowest_traces(
+    spans: list[SpanRecord], root_name: str = "agent.turn", recent: int = 100, limit: int = 5,
+) -> list[SpanRecord]:
+    """Link spans into trees and return the slowest of the most recent ``recent`` root spans."""
+    by_id = {s.span_id: s for s in spans}
+    roots = []
+    for s in spans:
+        parent = by_id.get(s.parent_id) if s.parent_id else None
+        if parent is not None:
+            parent.children.append(s)
+        elif s.name == root_name and not s.parent_id:
+            roots.append(s)
+    for s in spans:
+        s.children.sort(key=lambda c: c.start_ns)
+    roots.sort(key=lambda r: r.start_ns)
+    return sorted(roots[-recent:], key=lambda r: r.duration_ms, reverse=True)[:limit]
+
+
+def _label(span: SpanRecord) -> str:
+    attrs = span.attributes
+    detail = attrs.get("tool") or attrs.get("session_key") or attrs.get("channel") or ""
+    if "iteration" in attrs:
+        detail = f"#{attrs['iteration']}" + (f" {attrs['model']}" if attrs.get("model") else "")
+    label = f"{span.name} {detail}".strip()
+    return label + (" !" if span.error else "")
+
+
+def render_flame(root: SpanRecord, width: int = 40) -> list[str]:
+    """
+    Render a span tree as indented rows with a timeline bar per span.
+
+    Each bar starts at the span's offset from the root and its length is the
+    span's share of the root's duration, so slow steps stand out.
+    """
+    total_ns = max(root.end_ns - root.start_ns, 1)
+    rows: list[tuple[str, SpanRecord]] = []
+
+    def walk(span: SpanRecord, depth: int) -> None:
+        rows.append(("  " * depth + _label(span), span))
+        for child in span.children:
+            walk(child, depth + 1)
+
+    walk(root, 0)
+    name_width = min(max(len(label) for label, _ in rows), 32)
+    lines = []
+    for label, span in rows:
+        start = max(0, min(width - 1, int((span.start_ns - root.start_ns) / total_ns * width)))
+        length = max(1, round((span.end_ns - span.start_ns) / total_ns * width))
+        bar = " " * start + "█" * min(length, width - start)
+        share = (span.end_ns - span.start_ns) / total_ns * 100
+        lines.append(f"{label[:name_width]:<{name_width}} {span.duration_ms:>9.1f} ms {share:>5.1f}% |{bar:<{width}}|")
+    return lines
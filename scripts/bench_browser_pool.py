@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark browser_run with a cold launch per call against the warm browser pool.
+
+Serves a small page from a local HTTP server and runs the same browser_run
+call (goto + extract_text) --calls times, first with the pool disabled (the
+old behaviour: start Playwright, launch the browser, create a context, tear
+everything down) and then with the pool enabled. Needs Playwright browsers:
+
+    playwright install chromium
+    python scripts/bench_browser_pool.py [--calls 10] [--browser chromium]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import http.server
+import json
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from nanobot.agent.tools.browser import BrowserRunTool, close_browser_pool
+from nanobot.config.schema import BrowserToolConfig
+
+_PAGE = b"<html><head><title>bench</title></head><body><h1>Hello</h1><p>pooled browsers</p></body></html>"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(_PAGE)))
+        self.end_headers()
+        self.wfile.write(_PAGE)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+async def bench(tool: BrowserRunTool, url: str, calls: int, browser: str) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        raw = await tool.execute(
+            browser=browser,
+            actions=[{"type": "goto", "url": url}, {"type": "extract_text", "selector": "p"}],
+        )
+        samples.append((time.perf_counter() - t0) * 1000)
+        payload = json.loads(raw)
+        if not payload["ok"]:
+            raise SystemExit(f"browser_run failed: {payload['error']}")
+    return samples
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{args.calls} sequential browser_run calls ({args.browser}, headless)")
+        print(f"{'mode':>7}  {'first (ms)':>10}  {'median (ms)':>11}  {'total (ms)':>10}")
+        for label, pooled in (("cold", False), ("pooled", True)):
+            config = BrowserToolConfig(
+                pool_enabled=pooled,
+                allow_private_network=True,
+                auto_install_browsers=False,
+            )
+            tool = BrowserRunTool(workspace=Path(tmp), web_browser_config=config)
+            samples = await bench(tool, url, args.calls, args.browser)
+            print(f"{label:>7}  {samples[0]:>10.0f}  {statistics.median(samples):>11.0f}  {sum(samples):>10.0f}")
+        await close_browser_pool()
+    server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--browser", choices=["chromium", "firefox"], default="chromium")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Benchmark pooled HTTP clients against a fresh client per request.
+
+Runs 100 sequential Brave-style searches against a local stub server. The
+fresh client is what the search adapters did before the shared pool existed.
+With --tls, the stub serves a self-signed certificate (needs `cryptography`),
+so each fresh connection also pays for a TLS handshake.
+
+    python scripts/bench_http_pool.py [--tls] [--requests 100]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import ipaddress
+import json
+import os
+import ssl
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from nanobot.agent.tools.websearch.brave import search_brave
+from nanobot.utils.http_pool import close_http_pool
+
+_BODY = json.dumps({"web": {"results": [{"title": "t", "url": "https://example.com", "description": "d"}]}}).encode()
+
+
+class StubServer:
+    """Minimal HTTP/1.1 keep-alive server that counts accepted connections."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(_BODY)}\r\nConnection: keep-alive\r\n\r\n".encode()
+                    + _BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _self_signed(tmp: Path) -> tuple[Path, Path]:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(hours=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = tmp / "cert.pem", tmp / "key.pem"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    ))
+    return cert_path, key_path
+
+
+async def _fresh_search(url: str) -> None:
+    async with httpx.AsyncClient() as client:
+        response = await client.get(url, params={"q": "q", "count": 1}, timeout=10.0)
+        response.raise_for_status()
+
+
+async def _pooled_search(url: str) -> None:
+    await search_brave(query="q", count=1, api_key="bench", base_url=url)
+
+
+async def bench(search, url: str, server: StubServer, requests: int) -> tuple[float, float, int]:
+    """Return (total ms, median ms per request, connections opened)."""
+    server.connections = 0
+    samples = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        await search(url)
+        samples.append((time.perf_counter() - t0) * 1000)
+    total = (time.perf_counter() - start) * 1000
+    return total, statistics.median(samples), server.connections
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    server = StubServer()
+    ssl_ctx = None
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.tls:
+            cert, key = _self_signed(Path(tmp))
+            ssl_ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            ssl_ctx.load_cert_chain(cert, key)
+            os.environ["SSL_CERT_FILE"] = str(cert)  # Trusted by both client styles
+
+        srv = await asyncio.start_server(server.handle, "127.0.0.1", 0, ssl=ssl_ctx)
+        port = srv.sockets[0].getsockname()[1]
+        url = f"{'https' if args.tls else 'http'}://127.0.0.1:{port}/search"
+
+        print(f"{args.requests} sequential searches over {'HTTPS' if args.tls else 'HTTP'}")
+        print(f"{'client':>8}  {'total (ms)':>11}  {'median (ms)':>12}  {'connections':>11}")
+        for label, search in (("fresh", _fresh_search), ("pooled", _pooled_search)):
+            await search(url)  # warm imports and the pool
+            total, median, conns = await bench(search, url, server, args.requests)
+            print(f"{label:>8}  {total:>11.1f}  {median:>12.3f}  {conns:>11}")
+
+        await close_http_pool()
+        srv.close()
+        await srv.wait_closed()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--tls", action="store_true", help="Serve HTTPS with a self-signed certificate")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
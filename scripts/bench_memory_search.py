@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark memory_search recall against grep over a large synthetic history.
+
+Writes --years of HISTORY.md entries (--per-day paragraphs a day) plus one
+session log per month. It then times the first full index build, a no-op
+refresh, an incremental refresh after one more consolidation, and ranked
+queries against `grep -i` over HISTORY.md, which is what the agent ran
+before.
+
+    python scripts/bench_memory_search.py [--years 3] [--per-day 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.memory_index import MemoryIndex
+from nanobot.session.manager import SessionManager
+
+_TOPICS = (
+    "deploy database migration invoice meeting alice bob berlin flight router password budget "
+    "release review billing postgres kubernetes dashboard newsletter dentist birthday contract "
+    "roadmap hiring laptop backup certificate vacation report customer outage latency"
+).split()
+_QUERIES = ["database migration", "berlin flight", "router password", "invoice contract", "postgres outage"]
+
+
+def _vocabulary(rng: random.Random, size: int = 20_000) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocab = ["".join(rng.choices(letters, k=rng.randint(3, 9))) for _ in range(size)]
+    for i, topic in enumerate(_TOPICS):
+        vocab[100 + 60 * i] = topic  # Mid-frequency words, like names and topics in real notes
+    return vocab
+
+
+def _sentence(rng: random.Random, vocab: list[str]) -> str:
+    # Zipf-like word frequencies, roughly like natural text
+    words = (vocab[min(int(rng.paretovariate(1.1)) - 1, len(vocab) - 1)] for _ in range(rng.randint(12, 30)))
+    return " ".join(words).capitalize() + "."
+
+
+def build_workspace(root: Path, years: int, per_day: int) -> int:
+    rng = random.Random(7)
+    vocab = _vocabulary(rng)
+    store = MemoryStore(root)
+    sessions = SessionManager(root)
+    start = datetime.datetime(2023, 1, 1)
+    entries = 0
+    with open(store.history_file, "w", encoding="utf-8") as f:
+        for day in range(365 * years):
+            date = start + datetime.timedelta(days=day)
+            for i in range(per_day):
+                stamp = (date + datetime.timedelta(minutes=90 * i)).strftime("%Y-%m-%d %H:%M")
+                f.write(f"[{stamp}] {_sentence(rng, vocab)} {_sentence(rng, vocab)}\n\n")
+                entries += 1
+            if date.day == 1:
+                session = sessions.get_or_create(f"telegram:{date:%Y%m}")
+                for _ in range(40):
+                    session.add_message(rng.choice(["user", "assistant"]), _sentence(rng, vocab))
+                sessions.save(session)
+                entries += 40
+    return entries
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--per-day", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        entries = build_workspace(root, args.years, args.per_day)
+        history = root / "memory" / "HISTORY.md"
+        print(f"{entries} entries, HISTORY.md {history.stat().st_size / 1e6:.1f} MB")
+
+        index = MemoryIndex(root)
+        print(f"initial index build   {_timed(index.refresh):>9.1f} ms")
+        print(f"no-op refresh         {_timed(index.refresh):>9.2f} ms")
+        MemoryStore(root).append_history("[2026-01-01 10:00] Renewed the TLS certificate for the billing dashboard.")
+        print(f"incremental refresh   {_timed(index.refresh):>9.2f} ms")
+
+        search_ms, grep_ms = [], []
+        grep = shutil.which("grep")
+        for _ in range(args.rounds):
+            for query in _QUERIES:
+                search_ms.append(_timed(lambda: (index.refresh(), index.search(query, limit=8))))
+                if grep:
+                    pattern = "|".join(query.split())
+                    grep_ms.append(_timed(lambda: subprocess.run(
+                        [grep, "-iE", pattern, str(history)], capture_output=True, check=False,
+                    )))
+
+        def _stats(samples: list[float]) -> str:
+            p95 = statistics.quantiles(samples, n=20)[-1]
+            return f"median {statistics.median(samples):>7.2f} ms  p95 {p95:>7.2f} ms"
+
+        print(f"memory_search (refresh + top 8)  {_stats(search_ms)}")
+        if grep_ms:
+            print(f"grep -iE over HISTORY.md         {_stats(grep_ms)}  (unranked, every match)")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Benchmark ContextBuilder.build_system_prompt() with many installed skills.
+
+Creates a throwaway workspace with N skills (default 200) and reports the
+cold build time, the cached build time, and the rebuild time after one
+SKILL.md changes.
+
+    python scripts/bench_prompt_build.py --skills 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from nanobot.agent.context import ContextBuilder
+
+
+def _make_workspace(root: Path, skills: int) -> Path:
+    workspace = root / "workspace"
+    for name in ("AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md"):
+        (workspace / name).parent.mkdir(parents=True, exist_ok=True)
+        (workspace / name).write_text(f"# {name}\n\n" + "Guidance line.\n" * 40, encoding="utf-8")
+    (workspace / "memory").mkdir()
+    (workspace / "memory" / "MEMORY.md").write_text("- fact\n" * 200, encoding="utf-8")
+    for i in range(skills):
+        skill_dir = workspace / "skills" / f"skill-{i:03d}"
+        skill_dir.mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text(
+            f"---\nname: skill-{i:03d}\ndescription: Benchmark skill {i}\n"
+            'metadata: {"nanobot":{"requires":{"bins":["git"]}}}\n---\n\n# Skill\n\nBody.\n',
+            encoding="utf-8",
+        )
+    return workspace
+
+
+def _time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = _make_workspace(Path(tmp), args.skills)
+
+        cold = _time_ms(lambda: ContextBuilder(workspace).build_system_prompt(), 5)
+
+        ctx = ContextBuilder(workspace)
+        ctx.build_system_prompt()
+        warm = _time_ms(ctx.build_system_prompt, args.repeat)
+
+        skill_file = workspace / "skills" / "skill-000" / "SKILL.md"
+        counter = iter(range(1_000_000))
+
+        def _touch_and_build() -> None:
+            skill_file.write_text(skill_file.read_text(encoding="utf-8") + f"{next(counter)}\n", encoding="utf-8")
+            ctx.build_system_prompt()
+
+        changed = _time_ms(_touch_and_build, 5)
+
+    print(f"skills installed:        {args.skills}")
+    print(f"cold build (ms):         {cold:.2f}")
+    print(f"cached build (ms):       {warm:.2f}")
+    print(f"one skill changed (ms):  {changed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark SensitiveOutputRedactor throughput on large tool outputs.
+
+Compares redact(), which skips passes whose required literals are absent,
+with running every pass over the text, which is what redact() used to do.
+Inputs are a 10k-char exec result and a 50k-char web_fetch result, and
+both paths are checked to produce the same output.
+
+    python scripts/bench_redaction.py [--rounds 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from nanobot.utils.redaction import SensitiveOutputRedactor
+
+_WORDS = (
+    "the release notes describe how the scheduler retries failed jobs and why the cache "
+    "keeps recent results for a while before the worker pool drains its queue"
+).split()
+
+
+def exec_output(size: int) -> str:
+    lines = [f"-rw-r--r-- 1 dev staff {i * 37:>7} Jan  1 12:{i % 60:02d} module_{i}.py" for i in range(size // 40)]
+    lines += [f"tests/test_module_{i}.py::test_case_{i} PASSED [{i % 100:>3}%]" for i in range(size // 60)]
+    return "\n".join(lines)[:size]
+
+
+def web_page(size: int, rng: random.Random) -> str:
+    parts = []
+    while sum(map(len, parts)) < size:
+        parts.append(" ".join(rng.choice(_WORDS) for _ in range(40)).capitalize() + ".")
+        if rng.random() < 0.3:
+            parts.append(f"See https://docs.example.com/guide/{rng.randint(1, 999)}#section for details.")
+    return "\n\n".join(parts)[:size]
+
+
+def every_pass(redactor: SensitiveOutputRedactor, text: str) -> str:
+    for rule in redactor._rules:
+        text = redactor._apply(rule, text)
+    return text
+
+
+def _mb_per_s(fn, text: str, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn(text)
+    return len(text) * rounds / (time.perf_counter() - t0) / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    redactor = SensitiveOutputRedactor(
+        workspace=Path.home() / ".nanobot" / "workspace",
+        extra_secrets=["sk-proj-abcdefghijklmnop", "http://10.0.0.5:8080/v1"],
+    )
+    inputs = {
+        "exec 10k": exec_output(10_000),
+        "web_fetch 50k": web_page(50_000, random.Random(7)),
+    }
+    print(f"{'input':>14}  {'every pass':>12}  {'redact()':>12}  {'speedup':>8}")
+    for label, text in inputs.items():
+        assert redactor.redact(text) == every_pass(redactor, text)
+        before = _mb_per_s(lambda t: every_pass(redactor, t), text, args.rounds)
+        after = _mb_per_s(redactor.redact, text, args.rounds)
+        print(f"{label:>14}  {before:>7.1f} MB/s  {after:>7.1f} MB/s  {after / before:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark SessionManager.save() latency as a session grows.
+
+Compares append-only persistence with the legacy full rewrite for sessions of
+100 to 100k messages. Each sample saves one new turn (user + assistant).
+
+    python scripts/bench_session_save.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from nanobot.session.manager import Session, SessionManager
+
+
+def _fill(session: Session, count: int) -> None:
+    for i in range(count):
+        role = "user" if i % 2 == 0 else "assistant"
+        session.add_message(role, f"message {i} " + "lorem ipsum " * 8)
+
+
+def bench(size: int, append_only: bool, turns: int) -> float:
+    """Return the median save latency in milliseconds."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SessionManager(Path(tmp), append_only=append_only, compact_threshold=turns + 1)
+        session = manager.get_or_create("bench:session")
+        _fill(session, size)
+        manager.save(session)
+
+        samples = []
+        for i in range(turns):
+            session.add_message("user", f"turn {i}")
+            session.add_message("assistant", f"reply {i}")
+            start = time.perf_counter()
+            manager.save(session)
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20, help="Saves measured per size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'messages':>10}  {'append (ms)':>12}  {'rewrite (ms)':>13}")
+    for size in args.sizes:
+        append_ms = bench(size, append_only=True, turns=args.turns)
+        rewrite_ms = bench(size, append_only=False, turns=args.turns)
+        print(f"{size:>10}  {append_ms:>12.3f}  {rewrite_ms:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Tests for concurrent per-session dispatch in AgentLoop.run."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import BrowserToolConfig
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+class GatedProvider(LLMProvider):
+    """Provider stub that blocks each call until released by the test."""
+
+    def __init__(self):
+        super().__init__(api_key=None, api_base=None)
+        self.started: asyncio.Queue[str] = asyncio.Queue()
+        self.release: dict[str, asyncio.Event] = {}
+        self.active = 0
+        self.max_active = 0
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        text = ContextBuilder.strip_runtime_context(messages[-1]["content"])
+        gate = self.release.setdefault(text, asyncio.Event())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await self.started.put(text)
+        try:
+            await gate.wait()
+        finally:
+            self.active -= 1
+        return LLMResponse(content=f"reply:{text}")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+    def open(self, text: str) -> None:
+        self.release.setdefault(text, asyncio.Event()).set()
+
+
+def _build_loop(tmp_path: Path, provider: LLMProvider, bus: MessageBus, **kwargs: Any) -> AgentLoop:
+    return AgentLoop(
+        bus=bus,
+        provider=provider,
+        workspace=tmp_path,
+        web_browser_config=BrowserToolConfig(enabled=False),
+        **kwargs,
+    )
+
+
+def _inbound(chat_id: str, content: str) -> InboundMessage:
+    return InboundMessage(channel="telegram", sender_id="u", chat_id=chat_id, content=content)
+
+
+async def _next_started(provider: GatedProvider) -> str:
+    return await asyncio.wait_for(provider.started.get(), timeout=2.0)
+
+
+async def _next_outbound(bus: MessageBus) -> str:
+    return (await asyncio.wait_for(bus.consume_outbound(), timeout=2.0)).content
+
+
+@pytest.mark.asyncio
+async def test_different_sessions_run_concurrently(tmp_path: Path) -> None:
+    bus = MessageBus()
+    provider = GatedProvider()
+    loop = _build_loop(tmp_path, provider, bus)
+    runner = asyncio.create_task(loop.run())
+    try:
+        await bus.publish_inbound(_inbound("a", "slow"))
+        await bus.publish_inbound(_inbound("b", "fast"))
+        assert {await _next_started(provider), await _next_started(provider)} == {"slow", "fast"}
+
+        provider.open("fast")
+        assert await _next_outbound(bus) == "reply:fast"
+        provider.open("slow")
+        assert await _next_outbound(bus) == "reply:slow"
+    finally:
+        loop.stop()
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_same_session_is_serialized(tmp_path: Path) -> None:
+    bus = MessageBus()
+    provider = GatedProvider()
+    loop = _build_loop(tmp_path, provider, bus)
+    runner = asyncio.create_task(loop.run())
+    try:
+        await bus.publish_inbound(_inbound("a", "first"))
+        await bus.publish_inbound(_inbound("a", "second"))
+        assert await _next_started(provider) == "first"
+        await asyncio.sleep(0.05)
+        assert provider.started.empty()
+
+        provider.open("second")
+        provider.open("first")
+        assert await _next_outbound(bus) == "reply:first"
+        assert await _next_outbound(bus) == "reply:second"
+    finally:
+        loop.stop()
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_global_concurrency_limit(tmp_path: Path) -> None:
+    bus = MessageBus()
+    provider = GatedProvider()
+    loop = _build_loop(tmp_path, provider, bus, max_concurrent_turns=2)
+    runner = asyncio.create_task(loop.run())
+    try:
+        for chat in ("a", "b", "c"):
+            await bus.publish_inbound(_inbound(chat, f"m-{chat}"))
+        first = {await _next_started(provider), await _next_started(provider)}
+        await asyncio.sleep(0.05)
+        assert provider.started.empty()
+
+        for text in first:
+            provider.open(text)
+        third = await _next_started(provider)
+        provider.open(third)
+        for _ in range(3):
+            await _next_outbound(bus)
+        assert provider.max_active == 2
+    finally:
+        loop.stop()
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_session_queue_depth_rejects_overflow(tmp_path: Path) -> None:
+    bus = MessageBus()
+    provider = GatedProvider()
+    loop = _build_loop(tmp_path, provider, bus, max_queued_per_session=2)
+    runner = asyncio.create_task(loop.run())
+    try:
+        for text in ("one", "two", "three"):
+            await bus.publish_inbound(_inbound("a", text))
+        assert await _next_started(provider) == "one"
+        assert "still working" in await _next_outbound(bus)
+
+        provider.open("one")
+        provider.open("two")
+        assert await _next_outbound(bus) == "reply:one"
+        assert await _next_outbound(bus) == "reply:two"
+        assert loop._session_pending == {}
+        assert loop._session_locks == {}
+    finally:
+        loop.stop()
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
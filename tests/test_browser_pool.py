@@ -0,0 +1,155 @@
+"""Tests for the warm browser pool behind browser_run."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from nanobot.agent.tools.browser.pool import BrowserPool
+from nanobot.agent.tools.browser.tool import BrowserRunTool
+from nanobot.config.schema import BrowserToolConfig
+
+
+class FakePage:
+    url = "https://example.com/"
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        self.url = url
+        return SimpleNamespace(status=200)
+
+    async def title(self):
+        return "Example"
+
+
+class FakeContext:
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.contexts: list[FakeContext] = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        if not self.connected:
+            raise RuntimeError("Target closed")
+        self.contexts.append(FakeContext(kwargs))
+        return self.contexts[-1]
+
+    async def close(self):
+        self.closed = True
+        self.connected = False
+
+
+class FakeDriver:
+    def __init__(self):
+        self.browsers: list[FakeBrowser] = []
+        self.stopped = False
+        self.chromium = self.firefox = self
+
+    async def launch(self, headless=True, **kwargs):
+        self.browsers.append(FakeBrowser())
+        return self.browsers[-1]
+
+    async def stop(self):
+        self.stopped = True
+
+
+def _pool(**kwargs) -> tuple[BrowserPool, FakeDriver]:
+    driver = FakeDriver()
+    pool = BrowserPool(**kwargs)
+
+    async def start_driver():
+        driver.stopped = False
+        return driver
+
+    pool._start_driver = start_driver
+    return pool, driver
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_browser_with_fresh_context_per_call() -> None:
+    pool, driver = _pool()
+
+    async with pool.context("chromium", True, storage_state="a.json") as first:
+        pass
+    async with pool.context("chromium", True) as second:
+        pass
+    async with pool.context("firefox", True):
+        pass
+
+    assert len(driver.browsers) == 2
+    assert first is not second and first.closed and second.closed
+    assert first.kwargs == {"storage_state": "a.json"} and second.kwargs == {}
+    assert pool.stats.launches == 2 and pool.stats.reuses == 1
+    await pool.close()
+    assert all(b.closed for b in driver.browsers) and driver.stopped
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_after_max_uses_and_replaces_crashed_browsers() -> None:
+    pool, driver = _pool(max_uses=2)
+
+    async with pool.context("chromium", True):
+        async with pool.context("chromium", True):
+            pass
+        assert not driver.browsers[0].closed  # Retired, but still serving the outer call
+    assert driver.browsers[0].closed
+
+    async with pool.context("chromium", True):
+        pass
+    driver.browsers[1].connected = False  # Crashed while idle
+    async with pool.context("chromium", True):
+        pass
+
+    assert len(driver.browsers) == 3
+    assert pool.stats.recycled == 1 and pool.stats.crashed == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_closes_idle_browsers_and_stops_driver() -> None:
+    pool, driver = _pool(idle_timeout=0)
+
+    async with pool.context("chromium", True):
+        assert await pool.reap_idle() == 0  # In use
+    assert await pool.reap_idle() == 1
+
+    assert driver.browsers[0].closed and driver.stopped
+    async with pool.context("chromium", True):
+        pass
+    assert len(driver.browsers) == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_browser_run_uses_pool(monkeypatch, tmp_path) -> None:
+    pool, driver = _pool()
+    monkeypatch.setattr("nanobot.agent.tools.browser.tool.get_browser_pool", lambda **_: pool)
+    tool = BrowserRunTool(workspace=tmp_path, web_browser_config=BrowserToolConfig(auto_install_browsers=False))
+
+    for _ in range(3):
+        payload = json.loads(await tool.execute(actions=[{"type": "goto", "url": "https://example.com/a"}]))
+        assert payload["ok"] is True
+        assert payload["finalUrl"] == "https://example.com/a"
+
+    assert len(driver.browsers) == 1
+    assert len(driver.browsers[0].contexts) == 3
+    await pool.close()
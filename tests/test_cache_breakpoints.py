@@ -0,0 +1,102 @@
+"""Tests for prompt-cache breakpoint placement and cache usage reporting."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from nanobot.providers.base import usage_dict
+from nanobot.providers.cache_breakpoints import apply_breakpoints, plan_breakpoints
+from nanobot.providers.streaming import ChatCompletionStream
+
+
+def _tool_round(n: int) -> list[dict]:
+    return [
+        {"role": "assistant", "content": None, "tool_calls": [{"id": f"c{n}", "type": "function"}]},
+        {"role": "tool", "tool_call_id": f"c{n}", "name": "exec", "content": f"result {n}"},
+    ]
+
+
+def _conversation(history_turns: int, tool_rounds: int) -> list[dict]:
+    messages = [{"role": "system", "content": "You are nanobot."}]
+    for i in range(history_turns):
+        messages.append({"role": "user", "content": f"question {i}"})
+        messages.append({"role": "assistant", "content": f"answer {i}"})
+    messages.append({"role": "user", "content": "current question"})
+    for n in range(tool_rounds):
+        messages.extend(_tool_round(n))
+    return messages
+
+
+def _marked(messages: list[dict]) -> list[int]:
+    return [
+        i for i, m in enumerate(messages)
+        if isinstance(m["content"], list) and "cache_control" in m["content"][-1]
+    ]
+
+
+def test_breakpoints_cover_system_history_and_latest_tool_result() -> None:
+    messages = _conversation(history_turns=3, tool_rounds=2)
+    current_user = 7
+
+    chosen = plan_breakpoints(messages, limit=3)
+
+    assert chosen == [0, current_user - 1, len(messages) - 1]
+
+
+def test_breakpoints_skip_messages_without_content() -> None:
+    messages = _conversation(history_turns=0, tool_rounds=1)
+    messages.append({"role": "assistant", "content": None, "tool_calls": [{"id": "x", "type": "function"}]})
+
+    chosen = plan_breakpoints(messages, limit=2)
+
+    assert chosen == [0, len(messages) - 2]
+
+
+def test_spare_breakpoints_roll_back_through_long_history() -> None:
+    messages = _conversation(history_turns=30, tool_rounds=1)
+
+    chosen = plan_breakpoints(messages, limit=5)
+
+    assert len(chosen) == 5
+    gaps = [b - a for a, b in zip(chosen[1:], chosen[2:])]
+    assert all(gap <= 20 for gap in gaps)
+
+
+def test_apply_breakpoints_spends_one_marker_on_tools_and_copies_inputs() -> None:
+    messages = _conversation(history_turns=3, tool_rounds=2)
+    tools = [{"type": "function", "function": {"name": "a"}}, {"type": "function", "function": {"name": "b"}}]
+
+    new_messages, new_tools = apply_breakpoints(messages, tools, limit=4)
+
+    assert new_tools[-1]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in tools[-1]
+    assert len(_marked(new_messages)) == 3
+    assert _marked(messages) == []
+    assert new_messages[-1]["content"] == [
+        {"type": "text", "text": "result 1", "cache_control": {"type": "ephemeral"}},
+    ]
+
+
+def test_usage_dict_reports_cache_reads_and_writes() -> None:
+    anthropic = SimpleNamespace(
+        prompt_tokens=1200, completion_tokens=50, total_tokens=1250,
+        cache_read_input_tokens=1000, cache_creation_input_tokens=150,
+    )
+    openai = SimpleNamespace(
+        prompt_tokens=900, completion_tokens=10, total_tokens=910,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=768),
+    )
+
+    assert usage_dict(anthropic)["cache_read_tokens"] == 1000
+    assert usage_dict(anthropic)["cache_write_tokens"] == 150
+    assert usage_dict(openai)["cache_read_tokens"] == 768
+    assert "cache_write_tokens" not in usage_dict(openai)
+    assert usage_dict(None) == {}
+
+
+def test_stream_keeps_cache_usage_from_final_chunk() -> None:
+    stream = ChatCompletionStream()
+    usage = SimpleNamespace(prompt_tokens=10, completion_tokens=2, total_tokens=12, cache_read_input_tokens=8)
+    stream.feed(SimpleNamespace(choices=[], usage=usage))
+
+    assert stream.response().usage["cache_read_tokens"] == 8
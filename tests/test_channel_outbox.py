@@ -0,0 +1,166 @@
+"""Tests for per-channel outbound queues."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.manager import ChannelManager
+from nanobot.channels.outbox import ChannelOutbox
+from nanobot.config.schema import Config
+from nanobot.utils import metrics
+
+
+def _msg(chat_id: str, content: str, **metadata) -> OutboundMessage:
+    return OutboundMessage(channel="test", chat_id=chat_id, content=content, metadata=metadata)
+
+
+class _Recorder:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent: list[str] = []
+        self.gate: asyncio.Event | None = None
+
+    async def __call__(self, msg: OutboundMessage) -> None:
+        if self.gate is not None:
+            await self.gate.wait()
+        await asyncio.sleep(self.delay)
+        self.sent.append(msg.content)
+
+
+async def _settle(outbox: ChannelOutbox) -> None:
+    while outbox._tasks:
+        await asyncio.gather(*list(outbox._tasks.values()))
+
+
+@pytest.mark.asyncio
+async def test_messages_to_one_chat_keep_their_order() -> None:
+    send = _Recorder(delay=0.001)
+    outbox = ChannelOutbox("test", send, concurrency=4)
+    for i in range(20):
+        outbox.put(_msg("a", f"a{i}"))
+        outbox.put(_msg("b", f"b{i}"))
+    await _settle(outbox)
+
+    assert [m for m in send.sent if m.startswith("a")] == [f"a{i}" for i in range(20)]
+    assert [m for m in send.sent if m.startswith("b")] == [f"b{i}" for i in range(20)]
+    assert outbox.depth == 0 and not outbox._lanes
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limits_parallel_chats() -> None:
+    active = peak = 0
+
+    async def send(msg: OutboundMessage) -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    outbox = ChannelOutbox("test", send, concurrency=2)
+    for i in range(6):
+        outbox.put(_msg(str(i), "hi"))
+    await _settle(outbox)
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_queued_stream_updates_and_progress_are_coalesced() -> None:
+    send = _Recorder()
+    send.gate = asyncio.Event()
+    outbox = ChannelOutbox("test", send)
+    before = metrics.CHANNEL_OUTBOUND_DROPPED.value("test", "coalesced")
+
+    outbox.put(_msg("a", "first"))  # Picked up by the lane, waits on the gate
+    await asyncio.sleep(0)
+    outbox.put(_msg("a", "Hel", _stream_id="s1", _streaming=True))
+    outbox.put(_msg("a", "thinking", _progress=True))
+    outbox.put(_msg("a", "Hello wor", _stream_id="s1", _streaming=True))
+    outbox.put(_msg("a", "still thinking", _progress=True))
+    outbox.put(_msg("a", "Hello world", _stream_id="s1"))
+    send.gate.set()
+    await _settle(outbox)
+
+    assert send.sent == ["first", "Hello wor", "still thinking", "Hello world"]
+    assert metrics.CHANNEL_OUTBOUND_DROPPED.value("test", "coalesced") - before == 2
+
+
+@pytest.mark.asyncio
+async def test_progress_does_not_jump_ahead_of_a_queued_reply() -> None:
+    send = _Recorder()
+    send.gate = asyncio.Event()
+    outbox = ChannelOutbox("test", send)
+
+    outbox.put(_msg("a", "first"))
+    await asyncio.sleep(0)
+    outbox.put(_msg("a", "turn1 progress", _progress=True))
+    outbox.put(_msg("a", "turn1 reply"))
+    outbox.put(_msg("a", "turn2 progress", _progress=True))
+    outbox.put(_msg("a", "turn2 more progress", _progress=True))
+    send.gate.set()
+    await _settle(outbox)
+
+    assert send.sent == ["first", "turn1 progress", "turn1 reply", "turn2 more progress"]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_progress_but_keeps_replies() -> None:
+    send = _Recorder()
+    send.gate = asyncio.Event()
+    outbox = ChannelOutbox("test", send, max_queue=2, coalesce_progress=False)
+
+    results = [outbox.put(_msg(str(i), f"reply{i}")) for i in range(3)]
+    results.append(outbox.put(_msg("x", "progress", _progress=True)))
+    send.gate.set()
+    await _settle(outbox)
+
+    assert results == [True, True, True, False]
+    assert sorted(send.sent) == ["reply0", "reply1", "reply2"]
+
+
+class _FakeChannel(BaseChannel):
+    def __init__(self, name: str, delay: float):
+        super().__init__(None, MessageBus())
+        self.name = name
+        self.delay = delay
+        self.sent_at: list[float] = []
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, msg: OutboundMessage) -> None:
+        await asyncio.sleep(self.delay)
+        self.sent_at.append(asyncio.get_running_loop().time())
+
+
+@pytest.mark.asyncio
+async def test_slow_channel_does_not_delay_other_channels() -> None:
+    bus = MessageBus()
+    manager = ChannelManager(Config(), bus)
+    for name, delay in (("slow", 0.5), ("fast", 0.0)):
+        manager.channels[name] = _FakeChannel(name, delay)
+        manager.outboxes[name] = manager._make_outbox(name)
+
+    dispatcher = asyncio.create_task(manager._dispatch_outbound())
+    start = asyncio.get_running_loop().time()
+    await bus.publish_outbound(OutboundMessage(channel="slow", chat_id="1", content="upload"))
+    for i in range(3):
+        await bus.publish_outbound(OutboundMessage(channel="fast", chat_id=str(i), content="hi"))
+    await asyncio.sleep(0.1)
+
+    fast = manager.channels["fast"]
+    assert len(fast.sent_at) == 3 and max(fast.sent_at) - start < 0.1
+    assert manager.channels["slow"].sent_at == []
+    assert metrics.CHANNEL_OUTBOUND_QUEUE.value("slow") == 0  # In flight, not waiting
+
+    dispatcher.cancel()
+    await manager.stop_all()
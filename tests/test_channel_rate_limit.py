@@ -0,0 +1,130 @@
+"""Tests for channel send rate limiting."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel, RateLimiter, RateLimitProfile, retry_after
+from nanobot.utils import metrics
+
+
+@pytest.mark.asyncio
+async def test_per_chat_bucket_paces_one_chat_only() -> None:
+    limiter = RateLimiter(RateLimitProfile(global_rate=1000, global_burst=1000, chat_rate=20, chat_burst=1))
+    start = time.monotonic()
+
+    for _ in range(3):
+        await limiter.acquire("a")
+    paced = time.monotonic() - start
+    for chat in ("b", "c", "d"):
+        await limiter.acquire(chat)
+
+    assert paced >= 0.09
+    assert time.monotonic() - start - paced < 0.02
+
+
+@pytest.mark.asyncio
+async def test_replies_take_global_tokens_before_progress() -> None:
+    limiter = RateLimiter(RateLimitProfile(global_rate=20, global_burst=1, chat_rate=1000, chat_burst=1000))
+    await limiter.acquire("x")  # Drain the bucket
+    order: list[str] = []
+
+    async def send(chat_id: str, urgent: bool) -> None:
+        await limiter.acquire(chat_id, urgent=urgent)
+        order.append(chat_id)
+
+    progress = asyncio.create_task(send("progress", False))
+    await asyncio.sleep(0)
+    reply = asyncio.create_task(send("reply", True))
+    await asyncio.gather(progress, reply)
+
+    assert order == ["reply", "progress"]
+
+
+@pytest.mark.asyncio
+async def test_pause_holds_every_chat() -> None:
+    limiter = RateLimiter()
+    limiter.pause(0.05)
+    start = time.monotonic()
+
+    await limiter.acquire("any")
+
+    assert time.monotonic() - start >= 0.045
+
+
+def test_retry_after_reads_common_error_shapes() -> None:
+    telegram_style = SimpleNamespace(retry_after=timedelta(seconds=3))
+    http_style = SimpleNamespace(response=SimpleNamespace(status_code=429, headers={"Retry-After": "7"}))
+    server_error = SimpleNamespace(response=SimpleNamespace(status_code=500, headers={}))
+
+    assert retry_after(telegram_style) == 3.0
+    assert retry_after(SimpleNamespace(retry_after=2)) == 2.0
+    assert retry_after(http_style) == 7.0
+    assert retry_after(server_error) is None
+    assert retry_after(ValueError("boom")) is None
+
+
+class _ThrottledError(Exception):
+    retry_after = 0.02
+
+
+class _Channel(BaseChannel):
+    name = "limited"
+    rate_limit = RateLimitProfile(global_rate=100, global_burst=100, chat_rate=100, chat_burst=100)
+
+    def __init__(self):
+        super().__init__(None, MessageBus())
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, msg: OutboundMessage) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_backs_off_then_succeeds() -> None:
+    channel = _Channel()
+    calls: list[str] = []
+    before = metrics.CHANNEL_RATE_LIMITED.value("limited")
+
+    async def api(text: str) -> str:
+        calls.append(text)
+        if len(calls) == 1:
+            raise _ThrottledError()
+        return "ok"
+
+    assert await channel._call_with_retry(api, "hi") == "ok"
+    assert calls == ["hi", "hi"]
+    assert metrics.CHANNEL_RATE_LIMITED.value("limited") - before == 1
+
+    async def always_throttled() -> None:
+        raise _ThrottledError()
+
+    with pytest.raises(_ThrottledError):
+        await channel._call_with_retry(always_throttled)
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_does_not_retry_other_errors() -> None:
+    channel = _Channel()
+    calls = 0
+
+    async def broken() -> None:
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("bad request")
+
+    with pytest.raises(RuntimeError):
+        await channel._call_with_retry(broken)
+    assert calls == 1
@@ -0,0 +1,94 @@
+"""Tests for the Codex provider's prompt_cache_key and cached-token usage."""
+
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+import pytest
+
+from nanobot.providers.base import cache_session
+from nanobot.providers.openai_codex_provider import (
+    _convert_messages,
+    _prompt_cache_key,
+    _stream_sse,
+)
+
+MODEL = "gpt-5.1-codex"
+
+
+def _key(messages: list[dict]) -> str:
+    system_prompt, input_items = _convert_messages(messages)
+    return _prompt_cache_key(MODEL, system_prompt, input_items)
+
+
+def _turn() -> list[dict]:
+    return [
+        {"role": "system", "content": "You are nanobot."},
+        {"role": "user", "content": "list the files"},
+    ]
+
+
+def test_key_is_stable_as_the_conversation_grows() -> None:
+    messages = _turn()
+    first = _key(messages)
+
+    messages += [
+        {"role": "assistant", "content": None, "tool_calls": [
+            {"id": "call_1", "type": "function", "function": {"name": "exec", "arguments": "{}"}},
+        ]},
+        {"role": "tool", "tool_call_id": "call_1", "content": "a.txt"},
+        {"role": "assistant", "content": "a.txt"},
+        {"role": "user", "content": "and now?"},
+    ]
+
+    assert _key(messages) == first
+
+
+def test_key_differs_between_conversations() -> None:
+    other = _turn()
+    other[1] = {"role": "user", "content": "something else"}
+
+    assert _key(other) != _key(_turn())
+
+
+def test_session_scope_overrides_prefix() -> None:
+    other = _turn()
+    other[0] = {"role": "system", "content": "Updated memory."}
+
+    with cache_session("telegram:42"):
+        a, b = _key(_turn()), _key(other)
+    with cache_session("telegram:43"):
+        c = _key(_turn())
+
+    assert a == b
+    assert a != c
+
+
+class _FakeSSE:
+    def __init__(self, events: list[str]):
+        self._lines = []
+        for event in events:
+            self._lines.extend([f"data: {event}", ""])
+
+    async def aiter_lines(self) -> AsyncIterator[str]:
+        for line in self._lines:
+            yield line
+
+
+@pytest.mark.asyncio
+async def test_completed_event_reports_cached_tokens() -> None:
+    response = _FakeSSE([
+        '{"type": "response.output_text.delta", "delta": "ok"}',
+        '{"type": "response.completed", "response": {"status": "completed", "usage": '
+        '{"input_tokens": 2048, "input_tokens_details": {"cached_tokens": 1920}, '
+        '"output_tokens": 12, "total_tokens": 2060}}}',
+    ])
+
+    chunks = [chunk async for chunk in _stream_sse(response)]
+
+    assert chunks[-1].response.usage == {
+        "prompt_tokens": 2048,
+        "completion_tokens": 12,
+        "total_tokens": 2060,
+        "cache_read_tokens": 1920,
+    }
@@ -0,0 +1,179 @@
+"""Tests for the background consolidation worker and chunked consolidation."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from nanobot.agent.consolidation import ConsolidationWorker
+from nanobot.agent.memory import MemoryStore
+from nanobot.providers.base import (
+    LLMResponse,
+    ToolCallRequest,
+    cache_session,
+    current_cache_session,
+)
+from nanobot.session.manager import Session
+
+
+def _session(key: str = "cli:test", count: int = 0) -> Session:
+    session = Session(key=key)
+    for i in range(count):
+        session.add_message("user", f"message {i} " + "x" * 80)
+    return session
+
+
+def _save(entry: str) -> LLMResponse:
+    return LLMResponse(
+        content=None,
+        tool_calls=[ToolCallRequest("c1", "save_memory", {"history_entry": entry, "memory_update": "# Memory"})],
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_coalesces_jobs_per_session() -> None:
+    calls: list[str] = []
+
+    async def consolidate(session: Session) -> bool:
+        calls.append(session.key)
+        await asyncio.sleep(0.02)
+        return True
+
+    worker = ConsolidationWorker(consolidate, max_concurrent=2)
+    a, b = _session("cli:a"), _session("cli:b")
+
+    assert worker.submit(a) and worker.submit(b)
+    assert not worker.submit(a)
+    await asyncio.gather(*worker.tasks)
+
+    assert sorted(calls) == ["cli:a", "cli:b"]
+    assert not worker.pending and not worker.tasks and not worker.locks
+
+
+@pytest.mark.asyncio
+async def test_worker_jobs_do_not_inherit_the_turn_cache_session() -> None:
+    seen: list[str | None] = []
+
+    async def consolidate(session: Session) -> bool:
+        seen.append(current_cache_session())
+        return True
+
+    worker = ConsolidationWorker(consolidate)
+    with cache_session("telegram:42"):
+        worker.submit(_session())
+    await asyncio.gather(*worker.tasks)
+
+    assert seen == [None]
+
+
+@pytest.mark.asyncio
+async def test_worker_drops_jobs_when_queue_is_full() -> None:
+    worker = ConsolidationWorker(AsyncMock(return_value=True), max_queue=1)
+
+    assert worker.submit(_session("cli:a"))
+    assert not worker.submit(_session("cli:b"))
+    await asyncio.gather(*worker.tasks)
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_with_backoff() -> None:
+    results = [False, RuntimeError("rate limited"), True]
+    calls = 0
+
+    async def consolidate(session: Session) -> bool:
+        nonlocal calls
+        calls += 1
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    worker = ConsolidationWorker(consolidate, max_retries=3, retry_backoff_s=0.001)
+    worker.submit(_session())
+    await asyncio.gather(*worker.tasks)
+
+    assert calls == 3 and not worker.pending
+
+
+@pytest.mark.asyncio
+async def test_worker_gives_up_after_max_retries() -> None:
+    consolidate = AsyncMock(return_value=False)
+    worker = ConsolidationWorker(consolidate, max_retries=2, retry_backoff_s=0.001)
+    worker.submit(_session())
+    await asyncio.gather(*worker.tasks)
+
+    assert consolidate.await_count == 3 and not worker.pending
+
+
+@pytest.mark.asyncio
+async def test_worker_waits_for_interactive_turns() -> None:
+    consolidate = AsyncMock(return_value=True)
+    worker = ConsolidationWorker(consolidate)
+
+    with worker.interactive():
+        worker.submit(_session())
+        await asyncio.sleep(0.02)
+        assert consolidate.await_count == 0
+    await asyncio.gather(*worker.tasks)
+
+    assert consolidate.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_anyway_after_max_defer() -> None:
+    consolidate = AsyncMock(return_value=True)
+    worker = ConsolidationWorker(consolidate, max_defer_s=0.01)
+
+    with worker.interactive():
+        worker.submit(_session())
+        await asyncio.gather(*worker.tasks)
+
+    assert consolidate.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_large_backlog_is_consolidated_in_chunks(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    provider = AsyncMock()
+    provider.chat = AsyncMock(side_effect=[_save(f"entry {i}") for i in range(10)])
+    session = _session(count=60)
+
+    assert await store.consolidate(session, provider, "m", memory_window=20, chunk_chars=1000)
+
+    prompts = [call.kwargs["messages"][1]["content"] for call in provider.chat.await_args_list]
+    assert len(prompts) > 1
+    assert all(len(p.split("## Conversation to Process", 1)[1]) <= 1000 for p in prompts)
+    assert session.last_consolidated == 50
+    assert "message 0 " in prompts[0] and "message 49 " in prompts[-1]
+    assert "message 50 " not in "".join(prompts)
+
+
+@pytest.mark.asyncio
+async def test_chunked_consolidation_resumes_after_failure(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    provider = AsyncMock()
+    provider.chat = AsyncMock(side_effect=[_save("first"), LLMResponse(content="no tool call")])
+    session = _session(count=60)
+
+    assert not await store.consolidate(session, provider, "m", memory_window=20, chunk_chars=1000)
+    done = session.last_consolidated
+    assert 0 < done < 50
+
+    provider.chat = AsyncMock(side_effect=[_save(f"entry {i}") for i in range(10)])
+    assert await store.consolidate(session, provider, "m", memory_window=20, chunk_chars=1000)
+    first_prompt = provider.chat.await_args_list[0].kwargs["messages"][1]["content"]
+    assert f"message {done} " in first_prompt and f"message {done - 1} " not in first_prompt
+    assert session.last_consolidated == 50
+
+
+def test_oversized_message_is_truncated_to_one_chunk() -> None:
+    chunks = MemoryStore._chunk_lines(
+        [{"role": "user", "content": "a" * 5000}, {"role": "assistant", "content": ""}, {"role": "user", "content": "b"}],
+        max_chars=1000,
+    )
+
+    assert [count for _, count in chunks] == [2, 1]
+    assert len(chunks[0][0][0]) < 1100 and chunks[0][0][0].endswith("...(truncated)")
@@ -0,0 +1,93 @@
+"""Tests for token-budget context trimming."""
+
+from __future__ import annotations
+
+from nanobot.agent.budget import IMAGE_TOKENS, ContextBudget, estimate_tokens
+from nanobot.providers.registry import find_context_window
+
+
+def _turn(i: int, size: int = 400) -> list[dict]:
+    return [
+        {"role": "user", "content": f"question {i} " + "x" * size},
+        {"role": "assistant", "content": None, "tool_calls": [
+            {"id": f"c{i}", "type": "function", "function": {"name": "read_file", "arguments": "{}"}},
+        ]},
+        {"role": "tool", "tool_call_id": f"c{i}", "name": "read_file", "content": "y" * size},
+        {"role": "assistant", "content": f"answer {i}"},
+    ]
+
+
+def _request(turns: int, size: int = 400) -> list[dict]:
+    messages = [{"role": "system", "content": "system prompt"}]
+    for i in range(turns):
+        messages.extend(_turn(i, size))
+    messages.append({"role": "user", "content": "current question"})
+    return messages
+
+
+def test_estimate_tokens_counts_text_and_images() -> None:
+    assert estimate_tokens("abcd" * 10) == 10
+    assert estimate_tokens([
+        {"type": "image_url", "image_url": {"url": "data:image/png;base64," + "A" * 100_000}},
+        {"type": "text", "text": "abcd"},
+    ]) == IMAGE_TOKENS + 1
+
+
+def test_fit_leaves_small_requests_untouched() -> None:
+    messages = _request(turns=2)
+    budget = ContextBudget(context_window=100_000, reserve_tokens=1_000)
+
+    request, report = budget.fit(messages, tools=None, turn_start=len(messages) - 1)
+
+    assert request is messages
+    assert not report.trimmed
+    assert report.total <= report.limit
+
+
+def test_fit_drops_whole_turns_from_the_front() -> None:
+    messages = _request(turns=10)
+    budget = ContextBudget(context_window=1_200, reserve_tokens=200, compress_chars=10_000)
+
+    request, report = budget.fit(messages, tools=None, turn_start=len(messages) - 1)
+
+    assert report.dropped > 0 and report.dropped % 4 == 0
+    assert report.total <= report.limit
+    assert request[0]["role"] == "system"
+    assert request[1]["role"] == "user"
+    assert request[-1]["content"] == "current question"
+    assert len(messages) == 1 + 10 * 4 + 1  # input untouched
+
+
+def test_fit_compresses_before_dropping() -> None:
+    messages = _request(turns=2, size=20_000)
+    budget = ContextBudget(context_window=4_000, reserve_tokens=500, compress_chars=500)
+
+    request, report = budget.fit(messages, tools=None, turn_start=len(messages) - 1)
+
+    assert report.compressed > 0
+    assert report.dropped == 0
+    assert "chars omitted" in request[1]["content"]
+    assert len(request) == len(messages)
+
+
+def test_fit_compresses_answered_tool_results_in_current_turn() -> None:
+    messages = [{"role": "system", "content": "s"}, {"role": "user", "content": "go"}]
+    turn_start = 1
+    for i in range(2):
+        messages.append({"role": "assistant", "content": None, "tool_calls": [
+            {"id": f"c{i}", "type": "function", "function": {"name": "web_fetch", "arguments": "{}"}},
+        ]})
+        messages.append({"role": "tool", "tool_call_id": f"c{i}", "name": "web_fetch", "content": "z" * 20_000})
+    budget = ContextBudget(context_window=8_000, reserve_tokens=1_000, compress_chars=1_000)
+
+    request, report = budget.fit(messages, tools=None, turn_start=turn_start)
+
+    assert report.compressed == 1
+    assert "chars omitted" in request[3]["content"]
+    assert request[-1]["content"] == "z" * 20_000  # latest result is kept intact
+
+
+def test_registry_context_windows() -> None:
+    assert find_context_window("anthropic/claude-opus-4-5") == 200_000
+    assert find_context_window("dashscope/qwen-max") == 32_000
+    assert find_context_window("my-local-model") == 0
@@ -19,3 +19,44 @@ def test_build_user_content_uses_suffix_fallback_when_mime_guess_missing(monkeyp
     assert content[0]["type"] == "image_url"
     assert content[0]["image_url"]["url"].startswith("data:image/webp;base64,")
     assert content[-1] == {"type": "text", "text": "请识别图片内容"}
+
+
+def test_system_prompt_sections_are_cached_until_files_change(monkeypatch, tmp_path: Path) -> None:
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    (workspace / "SOUL.md").write_text("calm", encoding="utf-8")
+    ctx = ContextBuilder(workspace)
+
+    first = ctx.build_system_prompt()
+    loads = []
+    monkeypatch.setattr(ctx, "_load_bootstrap_files", lambda: loads.append(1) or "rebuilt")
+    monkeypatch.setattr(ctx.skills, "build_skills_summary", lambda: loads.append(2) or "")
+
+    assert ctx.build_system_prompt() == first
+    assert loads == []
+
+    (workspace / "SOUL.md").write_text("calm and precise", encoding="utf-8")
+    assert "rebuilt" in ctx.build_system_prompt()
+    assert loads == [1]
+
+
+def test_memory_section_refreshes_after_memory_write(tmp_path: Path) -> None:
+    ctx = ContextBuilder(tmp_path)
+    assert "likes tea" not in ctx.build_system_prompt()
+
+    ctx.memory.write_long_term("- likes tea")
+    assert "likes tea" in ctx.build_system_prompt()
+
+
+def test_runtime_context_lives_in_user_message_not_system_prompt(tmp_path: Path) -> None:
+    ctx = ContextBuilder(tmp_path)
+    messages = ctx.build_messages(history=[], current_message="hi", channel="telegram", chat_id="42")
+
+    system, user = messages[0]["content"], messages[-1]["content"]
+    assert "Current Time" not in system and "Chat ID" not in system
+    assert user.startswith(ContextBuilder.RUNTIME_CONTEXT_TAG)
+    assert "Chat ID: 42" in user
+    assert ContextBuilder.strip_runtime_context(user) == "hi"
+
+    again = ctx.build_messages(history=[], current_message="hi", channel="telegram", chat_id="42")
+    assert again[0]["content"] == system
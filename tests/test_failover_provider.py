@@ -0,0 +1,151 @@
+"""Tests for the failover provider chain."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from nanobot.config.schema import FailoverConfig
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk
+from nanobot.providers.failover import CircuitBreaker, FailoverProvider
+from nanobot.providers.metered import MeteredProvider
+
+
+def _ok(text: str) -> LLMResponse:
+    return LLMResponse(content=text)
+
+
+def _error(status: int | None) -> LLMResponse:
+    return LLMResponse(content=f"Error calling LLM: HTTP {status}", finish_reason="error", error_status=status)
+
+
+class _Scripted(LLMProvider):
+    """Returns queued responses, then repeats the last one."""
+
+    supports_streaming = True
+
+    def __init__(self, name: str, *responses: LLMResponse):
+        super().__init__()
+        self.name = name
+        self.responses = list(responses)
+        self.models: list[str | None] = []
+
+    def get_default_model(self) -> str:
+        return self.name
+
+    async def chat(self, messages: list[dict[str, Any]], tools=None, model=None, max_tokens=4096,
+                   temperature=0.7) -> LLMResponse:
+        self.models.append(model)
+        return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+
+def _chain(*providers: _Scripted, **config: Any) -> FailoverProvider:
+    return FailoverProvider([(p, p.name) for p in providers], FailoverConfig(**config))
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_fails_over_within_the_same_request() -> None:
+    primary = _Scripted("primary", _error(503))
+    backup = _Scripted("backup", _ok("from backup"))
+    provider = _chain(primary, backup)
+
+    response = await provider.chat([{"role": "user", "content": "hi"}], model="primary-large")
+
+    assert response.content == "from backup"
+    assert primary.models == ["primary-large"] and backup.models == ["backup"]
+
+
+@pytest.mark.asyncio
+async def test_bad_request_is_returned_without_failing_over() -> None:
+    primary = _Scripted("primary", _error(400))
+    backup = _Scripted("backup", _ok("unused"))
+    provider = _chain(primary, backup)
+
+    response = await provider.chat([{"role": "user", "content": "hi"}])
+
+    assert response.error_status == 400 and backup.models == []
+    assert not provider.backends[0].breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_backend_until_a_trial_succeeds() -> None:
+    primary = _Scripted("primary", _error(429), _ok("recovered"))
+    backup = _Scripted("backup", _ok("from backup"))
+    provider = _chain(primary, backup, open_s=0.05)
+    messages = [{"role": "user", "content": "hi"}]
+
+    assert (await provider.chat(messages)).content == "from backup"
+    assert (await provider.chat(messages)).content == "from backup"
+    assert len(primary.models) == 1  # Skipped while open
+
+    await asyncio.sleep(0.06)
+    assert (await provider.chat(messages)).content == "recovered"
+    assert not provider.backends[0].breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_all_backends_failing_returns_last_error() -> None:
+    provider = _chain(_Scripted("a", _error(None)), _Scripted("b", _error(502)))
+
+    response = await provider.chat([{"role": "user", "content": "hi"}])
+
+    assert response.finish_reason == "error" and response.error_status == 502
+    # b's circuit is open, but it is still tried once a fails again.
+    assert (await provider.chat([{"role": "user", "content": "hi"}])).error_status == 502
+
+
+def test_breaker_opens_on_consecutive_failures_and_error_rate() -> None:
+    breaker = CircuitBreaker(FailoverConfig(failure_threshold=3, min_requests=4, max_error_rate=0.5))
+    for _ in range(2):
+        breaker.record(False, 0.1)
+    assert not breaker.is_open
+    breaker.record(False, 0.1)
+    assert breaker.is_open
+
+    breaker = CircuitBreaker(FailoverConfig(failure_threshold=10, min_requests=4, max_error_rate=0.5))
+    for ok in (True, False, True, False):
+        breaker.record(ok, 0.2 if ok else 1.0)
+    assert breaker.is_open and breaker.error_rate == 0.5
+    assert breaker.latency(0.5) == 1.0 and breaker.latency(0.0) == 0.2
+
+
+class _Streaming(_Scripted):
+    def __init__(self, name: str, deltas: list[str], final: LLMResponse):
+        super().__init__(name, final)
+        self.deltas = deltas
+
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        for delta in self.deltas:
+            yield LLMStreamChunk(delta=delta)
+        yield LLMStreamChunk(response=self.responses[0])
+
+
+async def _collect(provider: FailoverProvider) -> tuple[str, LLMResponse]:
+    text, final = "", None
+    async for chunk in provider.chat_stream([{"role": "user", "content": "hi"}]):
+        text += chunk.delta
+        final = chunk.response or final
+    return text, final
+
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_only_before_text_was_sent() -> None:
+    provider = _chain(_Streaming("a", [], _error(500)), _Streaming("b", ["Hel", "lo"], _ok("Hello")))
+    assert await _collect(provider) == ("Hello", _ok("Hello"))
+
+    provider = _chain(_Streaming("a", ["partial"], _error(500)), _Streaming("b", ["Hello"], _ok("Hello")))
+    text, final = await _collect(provider)
+    assert text == "partial" and final.error_status == 500
+
+
+def test_secrets_cover_every_backend_through_wrappers() -> None:
+    primary = _Scripted("primary", _ok("ok"))
+    backup = _Scripted("backup", _ok("ok"))
+    primary.api_key, primary.api_base = "sk-primary", "https://primary.example"
+    backup.api_key = "sk-backup"
+
+    provider = MeteredProvider(_chain(primary, backup))
+
+    assert provider.secrets() == ["sk-primary", "https://primary.example", "sk-backup"]
@@ -0,0 +1,200 @@
+"""Tests for hedged LLM requests, against a local OpenAI-compatible stub server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+from typing import Any
+
+import pytest
+
+from nanobot.config.schema import HedgingConfig
+from nanobot.providers.admission import background_priority
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.custom_provider import CustomProvider
+from nanobot.providers.hedging import HedgedProvider
+from nanobot.utils import metrics
+
+
+class _StubServer:
+    """Answers /v1/chat/completions after a scripted delay per request."""
+
+    def __init__(self, delays: list[float]):
+        self.delays = delays
+        self.requests = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    async def __aenter__(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(re.search(rb"content-length:\s*(\d+)", head, re.IGNORECASE).group(1))
+            await reader.readexactly(length)
+            n = self.requests
+            self.requests += 1
+            await asyncio.sleep(self.delays[min(n, len(self.delays) - 1)])
+            body = json.dumps({
+                "id": f"stub-{n}", "object": "chat.completion", "created": 0, "model": "stub",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": f"reply {n}"},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+            }).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(body), body)
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # The client cancelled the losing request
+        finally:
+            writer.close()
+
+
+def _config(**overrides: Any) -> HedgingConfig:
+    values = dict(enabled=True, percentile=0.5, min_samples=3, min_delay_s=0.05, max_rate=1.0, max_burst=5)
+    values.update(overrides)
+    return HedgingConfig(**values)
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_against_stub_server() -> None:
+    before = metrics.LLM_HEDGES.value("stub", "hedge")
+    async with _StubServer([0.01, 0.01, 0.01, 2.0, 0.01]) as base_url:
+        provider = HedgedProvider(CustomProvider(api_base=base_url, default_model="stub"), _config())
+        for _ in range(3):  # Warm up the latency percentile
+            assert (await provider.chat(MESSAGES)).content.startswith("reply")
+        assert provider.hedge_delay("stub") == 0.05
+
+        start = time.perf_counter()
+        response = await provider.chat(MESSAGES)
+
+    assert response.content == "reply 4"  # The hedge, not the stalled request 3
+    assert time.perf_counter() - start < 1.0
+    assert metrics.LLM_HEDGES.value("stub", "hedge") - before == 1
+
+
+class _Delayed(LLMProvider):
+    def __init__(self, delays: list[float]):
+        super().__init__()
+        self.delays = delays
+        self.calls = 0
+
+    def get_default_model(self) -> str:
+        return "fake"
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        n = self.calls
+        self.calls += 1
+        await asyncio.sleep(self.delays[min(n, len(self.delays) - 1)])
+        return LLMResponse(content=f"reply {n}")
+
+
+async def _warm(provider: HedgedProvider) -> None:
+    for _ in range(3):
+        await provider.chat(MESSAGES)
+
+
+@pytest.mark.asyncio
+async def test_hedge_rate_is_capped() -> None:
+    inner = _Delayed([0.0, 0.0, 0.0, 0.15])
+    provider = HedgedProvider(inner, _config(max_rate=0.0, max_burst=1))
+    before = metrics.LLM_HEDGES_SKIPPED.value("fake", "rate")
+    await _warm(provider)
+
+    await provider.chat(MESSAGES)  # Uses the one hedge of credit
+    calls = inner.calls
+    await provider.chat(MESSAGES)
+
+    assert calls == 5 and inner.calls == calls + 1
+    assert metrics.LLM_HEDGES_SKIPPED.value("fake", "rate") - before == 1
+
+
+@pytest.mark.asyncio
+async def test_wasted_token_budget_is_capped_and_reported() -> None:
+    inner = _Delayed([0.0, 0.0, 0.0, 0.15])
+    provider = HedgedProvider(inner, _config(max_wasted_tokens_per_hour=150))
+    wasted_before = metrics.LLM_HEDGE_WASTED_TOKENS.value("fake")
+    skipped_before = metrics.LLM_HEDGES_SKIPPED.value("fake", "budget")
+    await _warm(provider)
+    long_prompt = [{"role": "user", "content": "x" * 400}]  # About 100 tokens
+
+    await provider.chat(long_prompt)
+    await provider.chat(long_prompt)
+
+    assert inner.calls == 3 + 2 + 1
+    assert metrics.LLM_HEDGE_WASTED_TOKENS.value("fake") - wasted_before == 100
+    assert metrics.LLM_HEDGES_SKIPPED.value("fake", "budget") - skipped_before == 1
+
+
+@pytest.mark.asyncio
+async def test_background_requests_are_not_hedged() -> None:
+    inner = _Delayed([0.0, 0.0, 0.0, 0.15])
+    provider = HedgedProvider(inner, _config())
+    await _warm(provider)
+
+    with background_priority():
+        assert (await provider.chat(MESSAGES)).content == "reply 3"
+    assert inner.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_error_from_the_faster_copy_does_not_win() -> None:
+    class _FailsFast(_Delayed):
+        async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+            response = await super().chat(messages, tools, model, max_tokens, temperature)
+            if response.content == "reply 4":  # The hedge
+                return LLMResponse(content="Error calling LLM: 500", finish_reason="error", error_status=500)
+            return response
+
+    provider = HedgedProvider(_FailsFast([0.0, 0.0, 0.0, 0.15, 0.0]), _config())
+    await _warm(provider)
+
+    assert (await provider.chat(MESSAGES)).content == "reply 3"
+
+
+@pytest.mark.asyncio
+async def test_exception_from_one_copy_does_not_abandon_the_other() -> None:
+    class _HedgeRaises(_Delayed):
+        async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+            response = await super().chat(messages, tools, model, max_tokens, temperature)
+            if response.content == "reply 4":  # The hedge
+                raise ConnectionError("reset")
+            return response
+
+    provider = HedgedProvider(_HedgeRaises([0.0, 0.0, 0.0, 0.15, 0.0]), _config())
+    await _warm(provider)
+
+    assert (await provider.chat(MESSAGES)).content == "reply 3"
+
+
+@pytest.mark.asyncio
+async def test_only_successful_primary_latencies_are_recorded() -> None:
+    class _FastErrors(_Delayed):
+        async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+            response = await super().chat(messages, tools, model, max_tokens, temperature)
+            if response.content == "reply 0":
+                return LLMResponse(content="Error calling LLM: 500", finish_reason="error", error_status=500)
+            return response
+
+    provider = HedgedProvider(_FastErrors([0.0, 0.0, 0.0, 0.0, 0.3, 0.0]), _config())
+    await _warm(provider)
+    assert len(provider._latency["fake"]) == 2  # The error was not a sample
+
+    await provider.chat(MESSAGES)
+    samples = len(provider._latency["fake"])
+    assert (await provider.chat(MESSAGES)).content == "reply 5"  # The hedge won
+
+    assert len(provider._latency["fake"]) == samples
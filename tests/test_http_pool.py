@@ -0,0 +1,51 @@
+"""Tests for the shared HTTP client pool."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from nanobot.config.schema import HttpConfig
+from nanobot.utils.http_pool import HttpClientPool
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_client_per_profile() -> None:
+    pool = HttpClientPool(HttpConfig(max_connections=7))
+
+    client = pool.get()
+    assert pool.get() is client
+    assert pool.get(verify=False) is not client
+    assert pool.get(max_redirects=5) is not client
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_closed_clients() -> None:
+    pool = HttpClientPool()
+
+    client = pool.get()
+    await pool.aclose()
+
+    assert client.is_closed
+    fresh = pool.get()
+    assert fresh is not client and not fresh.is_closed
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pooled_clients_do_not_keep_cookies() -> None:
+    pool = HttpClientPool()
+    client = pool.get()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        cookie = request.headers.get("cookie", "")
+        return httpx.Response(200, headers={"set-cookie": "sid=abc; Path=/"}, text=cookie)
+
+    client._transport = httpx.MockTransport(handler)
+    await client.get("https://example.com/")
+    second = await client.get("https://example.com/")
+
+    assert second.text == ""
+    assert not client.cookies
+    await pool.aclose()
@@ -0,0 +1,102 @@
+"""Tests for adaptive LLM admission control."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from nanobot.config.schema import AdmissionConfig
+from nanobot.providers.admission import AdaptiveLimiter, AdmissionProvider, background_priority
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+def _ok(**usage: int) -> LLMResponse:
+    return LLMResponse(content="ok", usage=usage)
+
+
+def _overloaded() -> LLMResponse:
+    return LLMResponse(content="Error calling LLM: 429", finish_reason="error", error_status=429)
+
+
+def test_limit_grows_additively_and_halves_on_overload() -> None:
+    limiter = AdaptiveLimiter(AdmissionConfig(initial_concurrency=4, max_concurrency=6, cooldown_s=60))
+    for _ in range(4):
+        limiter.in_flight += 1
+        limiter.release(_ok())
+    assert limiter.limit == pytest.approx(5.0, abs=0.1)
+
+    for _ in range(3):  # One burst of 429s is a single cut
+        limiter.in_flight += 1
+        limiter.release(_overloaded())
+    assert int(limiter.limit) == 2
+
+    limiter.in_flight += 1
+    limiter.release(LLMResponse(content="bad", finish_reason="error", error_status=400))
+    assert int(limiter.limit) == 2
+
+    limiter = AdaptiveLimiter(AdmissionConfig(initial_concurrency=1, min_concurrency=1, cooldown_s=0))
+    limiter.in_flight += 1
+    limiter.release(_overloaded())
+    assert limiter.limit == 1.0
+
+
+class _Slow(LLMProvider):
+    def __init__(self, delay: float = 0.02):
+        super().__init__()
+        self.delay = delay
+        self.active = self.peak = 0
+        self.order: list[str] = []
+
+    def get_default_model(self) -> str:
+        return "slow"
+
+    async def chat(self, messages: list[dict[str, Any]], tools=None, model=None, max_tokens=4096,
+                   temperature=0.7) -> LLMResponse:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.order.append(messages[0]["content"])
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return _ok()
+
+
+@pytest.mark.asyncio
+async def test_in_flight_requests_are_capped() -> None:
+    inner = _Slow()
+    provider = AdmissionProvider(inner, AdmissionConfig(initial_concurrency=2, max_concurrency=2), "slow")
+
+    await asyncio.gather(*(provider.chat([{"role": "user", "content": str(i)}]) for i in range(6)))
+
+    assert inner.peak == 2 and provider.limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_go_before_background_ones() -> None:
+    inner = _Slow()
+    provider = AdmissionProvider(inner, AdmissionConfig(initial_concurrency=1, max_concurrency=1), "slow")
+
+    async def background(name: str) -> None:
+        with background_priority():
+            await provider.chat([{"role": "user", "content": name}])
+
+    first = asyncio.create_task(provider.chat([{"role": "user", "content": "turn-1"}]))
+    await asyncio.sleep(0)
+    queued = [asyncio.create_task(background(f"bg-{i}")) for i in range(2)]
+    await asyncio.sleep(0)
+    queued.append(asyncio.create_task(provider.chat([{"role": "user", "content": "turn-2"}])))
+    await asyncio.gather(first, *queued)
+
+    assert inner.order[:2] == ["turn-1", "turn-2"]
+    assert sorted(inner.order[2:]) == ["bg-0", "bg-1"]
+
+
+def test_token_budget_is_corrected_from_reported_usage() -> None:
+    limiter = AdaptiveLimiter(AdmissionConfig(tokens_per_minute=600))
+    assert limiter._token_wait(100) == 0
+
+    asyncio.run(limiter.acquire(100))
+    limiter.release(_ok(total_tokens=590), estimated=100)
+
+    assert limiter._token_wait(100) == pytest.approx(9.0, abs=0.1)
@@ -0,0 +1,107 @@
+"""Tests for the memory full-text index and memory_search tool."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.memory_index import MemoryIndex, build_match_query
+from nanobot.agent.tools.memory_search import MemorySearchTool
+from nanobot.session.manager import SessionManager
+
+
+def test_build_match_query_quotes_terms() -> None:
+    assert build_match_query('deploy "prod" x*') == '"deploy"* "prod"* "x"*'
+    assert build_match_query("deploy AND NOT prod", any_term=True) == '"deploy"* OR "AND"* OR "NOT"* OR "prod"*'
+    assert build_match_query("  !! ") == ""
+
+
+def test_history_is_indexed_incrementally_and_ranked(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-01-05 09:00] Discussed the database migration plan with Alice.")
+    store.append_history("[2026-02-10 14:30] Migration finished; database migration verified twice.")
+    index = MemoryIndex(tmp_path)
+
+    assert index.refresh() == 2
+    assert index.refresh() == 0
+    store.append_history("[2026-03-01 08:00] Booked flights to Berlin.")
+    assert index.refresh() == 1
+
+    hits = index.search("database migration")
+    assert [h.ts for h in hits] == ["2026-02-10 14:30", "2026-01-05 09:00"]
+    assert "**migration**" in hits[0].snippet.lower()
+    assert [h.ts for h in index.search("migrat", until="2026-01-31")] == ["2026-01-05 09:00"]
+    assert [h.ts for h in index.search("berlin", since="2026-03-01")] == ["2026-03-01 08:00"]
+
+
+def test_rewritten_history_replaces_entries(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-01-05 09:00] Old note about kiwis.")
+    index = MemoryIndex(tmp_path)
+    index.refresh()
+
+    store.history_file.write_text("[2026-01-06 10:00] Edited note about mangos.\n\n", encoding="utf-8")
+    index.refresh()
+
+    assert index.search("kiwis") == []
+    assert len(index.search("mangos")) == 1
+
+
+def test_session_messages_survive_clear_and_filter_by_session(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    tg = manager.get_or_create("telegram:42")
+    tg.add_message("user", "Please remember the router password hint is purple")
+    tg.add_message("assistant", "Noted the router hint.")
+    manager.save(tg)
+    other = manager.get_or_create("cli:direct")
+    other.add_message("user", "router reboot schedule")
+    manager.save(other)
+
+    index = MemoryIndex(tmp_path)
+    assert index.refresh() == 3
+
+    tg.clear()  # /new rewrites the file without the old messages
+    tg.add_message("user", "fresh start")
+    manager.save(tg)
+    assert index.refresh() == 1
+
+    hits = index.search("router", session="telegram")
+    assert {(h.session, h.role) for h in hits} == {("telegram:42", "user"), ("telegram:42", "assistant")}
+    assert len(index.search("router", source="session")) == 3
+    assert index.search("router", source="history") == []
+
+
+@pytest.mark.asyncio
+async def test_memory_search_tool_formats_results(tmp_path: Path) -> None:
+    MemoryStore(tmp_path).append_history("[2026-01-05 09:00] Chose Postgres for the billing service.")
+    tool = MemorySearchTool(workspace=tmp_path)
+
+    result = await tool.execute(query="postgres")
+    missing = await tool.execute(query="nothing-like-this")
+
+    assert "1. [2026-01-05 09:00] history" in result
+    assert "**Postgres**" in result
+    assert missing.startswith("No memory entries match")
+
+
+@pytest.mark.asyncio
+async def test_memory_search_tool_runs_off_the_event_loop(tmp_path: Path) -> None:
+    MemoryStore(tmp_path).append_history("[2026-01-05 09:00] Chose Postgres for the billing service.")
+    tool = MemorySearchTool(workspace=tmp_path)
+    loop_thread = threading.get_ident()
+    threads: set[int] = set()
+    search = tool._search
+
+    def spy(*args, **kwargs):
+        threads.add(threading.get_ident())
+        return search(*args, **kwargs)
+
+    tool._search = spy
+    results = await asyncio.gather(*(tool.execute(query="postgres") for _ in range(4)))
+
+    assert all("Postgres" in r for r in results)
+    assert loop_thread not in threads
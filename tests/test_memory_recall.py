@@ -0,0 +1,122 @@
+"""Tests for relevance-selected memory injection."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from nanobot.agent.budget import estimate_tokens
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.memory_recall import tokenize
+from nanobot.config.schema import MemoryRecallConfig
+
+
+def _big_memory() -> str:
+    sections = [
+        "# Long-term Memory",
+        "## User Information\n\n- Name is Sam\n- Timezone is Europe/Berlin",
+        "## Preferences\n\n- Prefers short answers",
+        "## Garden\n\n- Grows tomatoes on the balcony\n- Waters plants every morning",
+        "## Homelab\n\n- Runs a Proxmox server with three VMs\n- Backups go to a NAS nightly",
+    ]
+    for i in range(40):
+        sections.append(f"## Project {i}\n\n- Project {i} is about topic{i} and uses library{i} heavily")
+    return "\n\n".join(sections) + "\n"
+
+
+@pytest.fixture
+def ctx(tmp_path: Path) -> ContextBuilder:
+    builder = ContextBuilder(tmp_path, MemoryRecallConfig(max_tokens=200, top_k=2))
+    builder.memory.write_long_term(_big_memory())
+    return builder
+
+
+def test_small_memory_stays_whole_in_system_prompt(tmp_path: Path) -> None:
+    ctx = ContextBuilder(tmp_path)
+    ctx.memory.write_long_term("## Garden\n\n- Grows tomatoes\n")
+
+    messages = ctx.build_messages(history=[], current_message="how are my tomatoes?")
+
+    assert "- Grows tomatoes" in messages[0]["content"]
+    assert "Recalled Memory" not in messages[-1]["content"]
+
+
+def test_large_memory_keeps_pinned_sections_and_recalls_relevant_ones(ctx: ContextBuilder) -> None:
+    messages = ctx.build_messages(history=[], current_message="Should I water the tomatoes today?")
+    system, user = messages[0]["content"], messages[-1]["content"]
+
+    assert "- Name is Sam" in system and "- Prefers short answers" in system
+    assert "Grows tomatoes" not in system and "Project 7" not in system
+    assert "## Garden\n- Grows tomatoes on the balcony\n- Waters plants every morning" in user
+    assert "Proxmox" not in user and "Name is Sam" not in user
+    assert ContextBuilder.strip_runtime_context(user) == "Should I water the tomatoes today?"
+
+    other = ctx.build_messages(history=[], current_message="is the proxmox backup running?")
+    assert other[0]["content"] == system
+    assert "Proxmox" in other[-1]["content"] and "tomatoes" not in other[-1]["content"]
+
+
+def test_recent_history_counts_toward_relevance(ctx: ContextBuilder) -> None:
+    history = [
+        {"role": "user", "content": "Tell me about project 12"},
+        {"role": "assistant", "content": "Sure."},
+    ]
+    user = ctx.build_messages(history=history, current_message="what library does it use?")[-1]["content"]
+
+    assert "library12" in user
+
+
+def test_recall_respects_top_k_and_budget(ctx: ContextBuilder) -> None:
+    query = " ".join(f"topic{i}" for i in range(40))
+    recalled = ctx.recall.select(query)
+
+    assert recalled.count("## Project") == 2
+    pinned = estimate_tokens("## User Information\n- Name is Sam\n- Timezone is Europe/Berlin")
+    assert estimate_tokens(recalled) <= 200 - pinned
+
+
+def test_oversized_section_is_recalled_partially(tmp_path: Path) -> None:
+    ctx = ContextBuilder(tmp_path, MemoryRecallConfig(max_tokens=60, pinned=[]))
+    facts = [f"- Fact {i} about filler{i} words" for i in range(30)] + ["- The wifi password is on the fridge"]
+    ctx.memory.write_long_term("## Notes\n\n" + "\n".join(facts) + "\n")
+
+    recalled = ctx.recall.select("where is the wifi password?")
+
+    assert recalled.startswith("## Notes\n") and "wifi password is on the fridge" in recalled
+    assert estimate_tokens(recalled) <= 60 + estimate_tokens("## Notes\n")
+
+
+def test_tokenize_splits_cjk_characters() -> None:
+    assert tokenize("Python教程 Hello") == ["python", "教", "程", "hello"]
+
+
+@pytest.mark.asyncio
+async def test_embedding_backend_ranks_sections(monkeypatch, ctx: ContextBuilder) -> None:
+    import litellm
+
+    def vector(text: str) -> list[float]:
+        return [1.0, 0.0] if ("Homelab" in text or "servers" in text) else [0.0, 1.0]
+
+    async def fake_embedding(model, input):
+        return SimpleNamespace(data=[{"embedding": vector(t)} for t in input])
+
+    monkeypatch.setattr(litellm, "aembedding", fake_embedding)
+    ctx.recall.config.embedding_model = "test/embed"
+    ctx.recall.config.top_k = 1
+
+    assert "Proxmox" in await ctx.recall_memory([], "any news about my servers?")
+
+
+@pytest.mark.asyncio
+async def test_embedding_failure_falls_back_to_bm25(monkeypatch, ctx: ContextBuilder) -> None:
+    import litellm
+
+    async def failing_embedding(model, input):
+        raise RuntimeError("no credentials")
+
+    monkeypatch.setattr(litellm, "aembedding", failing_embedding)
+    ctx.recall.config.embedding_model = "test/embed"
+
+    assert "tomatoes" in await ctx.recall_memory([], "tomatoes")
@@ -0,0 +1,185 @@
+"""Tests for sectioned MEMORY.md and operation-based consolidation."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from nanobot.agent.memory import MemoryDocument, MemoryStore
+from nanobot.providers.base import LLMResponse, ToolCallRequest
+from nanobot.session.manager import Session
+
+TEMPLATE = (Path(__file__).parents[1] / "nanobot" / "templates" / "memory" / "MEMORY.md").read_text(encoding="utf-8")
+
+MEMORY = """# Long-term Memory
+
+## User Information
+
+- Name is Sam
+- Lives in Berlin
+
+## Preferences
+
+- Prefers short answers
+- Uses vim
+  (since 2019)
+
+Free-form note about the setup.
+"""
+
+
+def test_parse_render_round_trips() -> None:
+    for text in (TEMPLATE, MEMORY):
+        assert MemoryDocument.parse(text).render() == text
+
+
+def test_numbered_view_lists_every_fact_once() -> None:
+    numbered = MemoryDocument.parse(MEMORY).numbered()
+
+    assert numbered.splitlines() == [
+        "## User Information",
+        "[F1] - Name is Sam",
+        "[F2] - Lives in Berlin",
+        "## Preferences",
+        "[F3] - Prefers short answers",
+        "[F4] - Uses vim",
+        "  (since 2019)",
+        "[F5] Free-form note about the setup.",
+    ]
+
+
+def test_apply_operations() -> None:
+    doc = MemoryDocument.parse(MEMORY)
+
+    changed = doc.apply([
+        {"op": "update", "id": "F2", "text": "Lives in Hamburg"},
+        {"op": "delete", "id": "[f4]"},
+        {"op": "add", "section": "preferences", "text": "Likes dark mode"},
+        {"op": "add", "section": "Projects", "text": "- Building a home server"},
+        {"op": "add", "section": "User Information", "text": "- Name is Sam"},  # Duplicate
+        {"op": "delete", "id": "F99"},
+        {"op": "update", "id": "F1"},  # No text
+    ])
+
+    assert changed == 4
+    assert doc.render() == """# Long-term Memory
+
+## User Information
+
+- Name is Sam
+- Lives in Hamburg
+
+## Preferences
+
+- Prefers short answers
+
+Free-form note about the setup.
+
+- Likes dark mode
+
+## Projects
+
+- Building a home server
+"""
+
+
+def test_add_replaces_template_placeholder_and_keeps_footer() -> None:
+    doc = MemoryDocument.parse(TEMPLATE)
+    doc.apply([{"op": "add", "section": "Preferences", "text": "Prefers dark mode"}])
+    rendered = doc.render()
+
+    assert "(User preferences learned over time)" not in rendered
+    assert "## Preferences\n\n- Prefers dark mode\n\n## Project Context" in rendered
+    assert rendered.endswith("---\n\n*This file is automatically updated by nanobot when important information should be remembered.*\n")
+
+
+FENCED = """# Long-term Memory
+
+## Snippets
+
+- Deploy script:
+```py
+a = 1
+
+b = 2
+```
+
+| Host | Port |
+|------|------|
+| db   | 5432 |
+
+- Uses vim
+"""
+
+
+def test_code_blocks_and_tables_are_single_facts() -> None:
+    doc = MemoryDocument.parse(FENCED)
+
+    assert doc.render() == FENCED
+    assert [item.splitlines()[0] for item in doc.sections[0].items] == ["- Deploy script:", "| Host | Port |", "- Uses vim"]
+    assert doc.sections[0].items[0].endswith("b = 2\n```")
+
+
+def test_updating_a_fenced_fact_keeps_the_document_balanced() -> None:
+    doc = MemoryDocument.parse(FENCED)
+
+    doc.apply([
+        {"op": "update", "id": "F1", "text": "- Deploy script:\n```sh\nmake\n\nmake deploy\n```"},
+        {"op": "delete", "id": "F2"},
+    ])
+    rendered = doc.render()
+
+    assert rendered.count("```") == 2
+    reparsed = MemoryDocument.parse(rendered)
+    assert [item.splitlines()[0] for item in reparsed.sections[0].items] == ["- Deploy script:", "- Uses vim"]
+    assert reparsed.render() == rendered
+
+
+def test_unsectioned_memory_gets_ids() -> None:
+    doc = MemoryDocument.parse("User likes testing.\n")
+    doc.apply([{"op": "update", "id": "F1", "text": "User likes testing with pytest."}])
+
+    assert doc.render() == "- User likes testing with pytest.\n"
+
+
+@pytest.mark.asyncio
+async def test_consolidation_sends_ids_and_applies_operations(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_long_term(MEMORY)
+    provider = AsyncMock()
+    provider.chat = AsyncMock(return_value=LLMResponse(
+        content=None,
+        tool_calls=[ToolCallRequest("c1", "save_memory", {
+            "history_entry": "[2026-01-01 10:00] Sam moved to Hamburg.",
+            "memory_ops": [{"op": "update", "id": "F2", "text": "Lives in Hamburg"}],
+        })],
+    ))
+    session = Session(key="cli:test")
+    for i in range(30):
+        session.add_message("user", f"msg{i}")
+
+    assert await store.consolidate(session, provider, "m", memory_window=20)
+
+    prompt = provider.chat.await_args.kwargs["messages"][1]["content"]
+    assert "[F2] - Lives in Berlin" in prompt
+    assert store.read_long_term() == MEMORY.replace("Berlin", "Hamburg")
+
+
+@pytest.mark.asyncio
+async def test_consolidation_without_changes_leaves_file_untouched(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_long_term(MEMORY)
+    mtime = store.memory_file.stat().st_mtime_ns
+    provider = AsyncMock()
+    provider.chat = AsyncMock(return_value=LLMResponse(
+        content=None,
+        tool_calls=[ToolCallRequest("c1", "save_memory", {"history_entry": "[2026-01-01 10:00] Chat.", "memory_ops": []})],
+    ))
+    session = Session(key="cli:test")
+    for i in range(30):
+        session.add_message("user", f"msg{i}")
+
+    assert await store.consolidate(session, provider, "m", memory_window=20)
+    assert store.memory_file.stat().st_mtime_ns == mtime
@@ -0,0 +1,113 @@
+"""Tests for gateway metrics and the metrics/health endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.metered import MeteredProvider
+from nanobot.utils import metrics
+from nanobot.utils.metrics import MetricsRegistry, MetricsServer
+
+
+def test_registry_renders_prometheus_text() -> None:
+    reg = MetricsRegistry()
+    requests = reg.counter("app_requests_total", "Requests.", ("path",))
+    depth = reg.gauge("app_queue_depth", "Queue depth.")
+    latency = reg.histogram("app_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    requests.inc('/a"b')
+    requests.inc('/a"b', amount=2)
+    depth.set_function(lambda: 7)
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    text = reg.render()
+    assert 'app_requests_total{path="/a\\"b"} 3' in text
+    assert "# TYPE app_queue_depth gauge\napp_queue_depth 7" in text
+    assert 'app_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'app_latency_seconds_bucket{le="1"} 2' in text
+    assert 'app_latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "app_latency_seconds_count 2" in text
+    assert reg.counter("app_requests_total", "Requests.", ("path",)) is requests
+    with pytest.raises(ValueError):
+        requests.inc()
+
+
+class _Provider(LLMProvider):
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        return LLMResponse(content="hi", usage={"prompt_tokens": 10, "completion_tokens": 3, "total_tokens": 13})
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+@pytest.mark.asyncio
+async def test_metered_provider_records_latency_and_tokens() -> None:
+    provider = MeteredProvider(_Provider(api_key="k"), "metered-test")
+    before = metrics.LLM_TOKENS.value("metered-test", "test-model", "prompt")
+
+    await provider.chat(messages=[{"role": "user", "content": "x"}])
+    chunks = [chunk async for chunk in provider.chat_stream(messages=[{"role": "user", "content": "x"}])]
+
+    assert chunks[-1].response.content == "hi"
+    assert provider.api_key == "k" and provider.get_default_model() == "test-model"
+    assert metrics.LLM_REQUEST_SECONDS.count("metered-test", "test-model") == 2
+    assert metrics.LLM_FIRST_TOKEN_SECONDS.count("metered-test", "test-model") == 1
+    assert metrics.LLM_TOKENS.value("metered-test", "test-model", "prompt") == before + 20
+
+
+class _FailingTool(Tool):
+    name = "metrics_failing_tool"
+    description = "Always fails."
+    parameters = {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs) -> str:
+        raise RuntimeError("boom")
+
+
+@pytest.mark.asyncio
+async def test_tool_registry_records_time_and_errors() -> None:
+    registry = ToolRegistry()
+    registry.register(_FailingTool())
+
+    result = await registry.execute("metrics_failing_tool", {})
+
+    assert result.startswith("Error executing metrics_failing_tool")
+    assert metrics.TOOL_SECONDS.count("metrics_failing_tool") == 1
+    assert metrics.TOOL_ERRORS.value("metrics_failing_tool") == 1
+
+
+async def _get(port: int, path: str) -> tuple[str, str]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    raw = (await reader.read()).decode()
+    writer.close()
+    head, _, body = raw.partition("\r\n\r\n")
+    return head.splitlines()[0], body
+
+
+@pytest.mark.asyncio
+async def test_metrics_server_serves_metrics_and_health() -> None:
+    reg = MetricsRegistry()
+    reg.gauge("app_up", "Up.").set(1)
+    server = MetricsServer("127.0.0.1", 0, reg, health=lambda: {"inbound": 2})
+    await server.start()
+    try:
+        status, body = await _get(server.port, "/metrics")
+        assert status == "HTTP/1.1 200 OK" and "app_up 1" in body
+
+        status, body = await _get(server.port, "/health")
+        doc = json.loads(body)
+        assert status == "HTTP/1.1 200 OK" and doc["status"] == "ok" and doc["inbound"] == 2
+
+        status, _ = await _get(server.port, "/nope")
+        assert status == "HTTP/1.1 404 Not Found"
+    finally:
+        await server.stop()
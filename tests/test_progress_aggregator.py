@@ -0,0 +1,126 @@
+"""Tests for debounced progress delivery."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from nanobot.agent.runtime.progress import ProgressAggregator
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.manager import ChannelManager
+from nanobot.config.schema import Config
+
+
+def _aggregator(sent: list[OutboundMessage], interval_s: float) -> ProgressAggregator:
+    async def publish(msg: OutboundMessage) -> None:
+        sent.append(msg)
+
+    return ProgressAggregator(
+        publish=publish,
+        redact=lambda text: (text or "").replace("sk-secret", "[REDACTED]"),
+        channel="test",
+        chat_id="c1",
+        metadata={"message_id": 7},
+        interval_s=interval_s,
+    )
+
+
+@pytest.mark.asyncio
+async def test_updates_within_window_are_merged() -> None:
+    sent: list[OutboundMessage] = []
+    progress = _aggregator(sent, interval_s=0.05)
+
+    await progress.add("Thinking")
+    await progress.add("read_file(\"a.py\")", tool_hint=True)
+    await progress.add("exec(\"ls\")", tool_hint=True)
+    assert [m.content for m in sent] == ["Thinking"]
+
+    await asyncio.sleep(0.08)
+    assert [m.content for m in sent] == ["Thinking", "read_file(\"a.py\")\nexec(\"ls\")"]
+
+    last = sent[-1].metadata
+    assert last["_progress"] and last["_tool_hint"] and last["message_id"] == 7
+    assert last["_status_id"] == sent[0].metadata["_status_id"] == progress.status_id
+    assert last["_status_text"] == "Thinking\nread_file(\"a.py\")\nexec(\"ls\")"
+
+
+@pytest.mark.asyncio
+async def test_finish_drops_unsent_updates() -> None:
+    sent: list[OutboundMessage] = []
+    progress = _aggregator(sent, interval_s=0.05)
+
+    await progress.add("first")
+    await progress.add("second")
+    progress.finish()
+    await asyncio.sleep(0.08)
+
+    assert [m.content for m in sent] == ["first"]
+
+
+@pytest.mark.asyncio
+async def test_zero_interval_sends_each_update_redacted() -> None:
+    sent: list[OutboundMessage] = []
+    progress = _aggregator(sent, interval_s=0)
+
+    await progress.add("using key sk-secret")
+    await progress.add("  ")
+    await progress.add("done")
+
+    assert [m.content for m in sent] == ["using key [REDACTED]", "done"]
+    assert "sk-secret" not in sent[-1].metadata["_status_text"]
+
+
+class _EditingChannel(BaseChannel):
+    name = "edit"
+
+    def __init__(self, streaming: bool):
+        super().__init__(None, MessageBus())
+        self.streaming = streaming
+        self.sent: list[OutboundMessage] = []
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.streaming
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, msg: OutboundMessage) -> None:
+        self.sent.append(msg)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("streaming", [True, False])
+async def test_manager_edits_status_only_where_channel_can(streaming: bool) -> None:
+    bus = MessageBus()
+    manager = ChannelManager(Config(), bus)
+    channel = _EditingChannel(streaming)
+    manager.channels["edit"] = channel
+    manager.outboxes["edit"] = manager._make_outbox("edit")
+    dispatcher = asyncio.create_task(manager._dispatch_outbound())
+    await bus.publish_outbound(
+        OutboundMessage(
+            channel="edit",
+            chat_id="1",
+            content="exec(\"ls\")",
+            metadata={"_progress": True, "_status_id": "status-1", "_status_text": "Thinking\nexec(\"ls\")"},
+        )
+    )
+    await asyncio.sleep(0.05)
+
+    [delivered] = channel.sent
+    if streaming:
+        assert delivered.content == "Thinking\nexec(\"ls\")"
+        assert delivered.metadata["_stream_id"] == "status-1" and delivered.metadata["_streaming"]
+    else:
+        assert delivered.content == "exec(\"ls\")"
+        assert "_streaming" not in delivered.metadata
+
+    dispatcher.cancel()
+    await manager.stop_all()
@@ -0,0 +1,144 @@
+"""Tests for append-only session persistence."""
+
+import json
+from pathlib import Path
+
+from nanobot.session.manager import Session, SessionManager
+
+
+def _lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def _session_path(manager: SessionManager, key: str) -> Path:
+    return manager._get_session_path(key)
+
+
+def test_save_appends_only_new_messages(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("telegram:1")
+    session.add_message("user", "hello")
+    manager.save(session)
+    first = _session_path(manager, "telegram:1").read_text(encoding="utf-8")
+
+    session.add_message("assistant", "hi")
+    session.last_consolidated = 1
+    manager.save(session)
+    second = _session_path(manager, "telegram:1").read_text(encoding="utf-8")
+
+    assert second.startswith(first)
+    appended = [json.loads(line) for line in second[len(first):].splitlines()]
+    assert [r.get("content") for r in appended[:-1]] == ["hi"]
+    assert appended[-1]["_type"] == "metadata"
+    assert appended[-1]["last_consolidated"] == 1
+
+
+def test_appended_session_roundtrip(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("cli:direct")
+    for i in range(5):
+        session.add_message("user", f"msg{i}")
+        session.metadata["turn"] = i
+        manager.save(session)
+
+    reloaded = SessionManager(tmp_path).get_or_create("cli:direct")
+    assert [m["content"] for m in reloaded.messages] == [f"msg{i}" for i in range(5)]
+    assert reloaded.metadata == {"turn": 4}
+
+
+def test_clear_forces_full_rewrite(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("cli:direct")
+    for i in range(3):
+        session.add_message("user", f"msg{i}")
+        manager.save(session)
+
+    session.clear()
+    for i in range(5):
+        session.add_message("user", f"new{i}")
+    manager.save(session)
+
+    records = _lines(_session_path(manager, "cli:direct"))
+    assert records[0]["_type"] == "metadata"
+    assert [r["content"] for r in records[1:]] == [f"new{i}" for i in range(5)]
+
+
+def test_external_modification_forces_full_rewrite(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("cli:direct")
+    session.add_message("user", "one")
+    manager.save(session)
+
+    path = _session_path(manager, "cli:direct")
+    path.write_text(path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    session.add_message("user", "two")
+    manager.save(session)
+
+    records = _lines(path)
+    assert sum(1 for r in records if r.get("_type") == "metadata") == 1
+    assert [r["content"] for r in records[1:]] == ["one", "two"]
+
+
+def test_compaction_folds_metadata_records(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path, compact_threshold=3)
+    session = manager.get_or_create("slack:C1")
+    for i in range(4):
+        session.add_message("user", f"msg{i}")
+        manager.save(session)
+
+    assert manager.compact_pending() == 1
+    records = _lines(_session_path(manager, "slack:C1"))
+    assert [r.get("_type") for r in records].count("metadata") == 1
+    assert len(records) == 5
+
+    # Appending keeps working after the rewrite.
+    session.add_message("user", "after")
+    manager.save(session)
+    reloaded = SessionManager(tmp_path).get_or_create("slack:C1")
+    assert reloaded.messages[-1]["content"] == "after"
+
+
+def test_torn_trailing_line_is_skipped(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    session = manager.get_or_create("cli:direct")
+    session.add_message("user", "kept")
+    manager.save(session)
+
+    path = _session_path(manager, "cli:direct")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"role": "assistant", "cont')
+
+    fresh = SessionManager(tmp_path)
+    reloaded = fresh.get_or_create("cli:direct")
+    assert [m["content"] for m in reloaded.messages] == ["kept"]
+
+    reloaded.add_message("assistant", "next")
+    fresh.save(reloaded)
+    assert [r["content"] for r in _lines(path)[1:]] == ["kept", "next"]
+
+
+def test_list_sessions_reports_latest_updated_at(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path)
+    older = manager.get_or_create("telegram:old")
+    older.add_message("user", "a")
+    manager.save(older)
+    newer = manager.get_or_create("telegram:new")
+    newer.add_message("user", "b")
+    manager.save(newer)
+
+    older.add_message("user", "c")
+    manager.save(older)
+
+    keys = [s["key"] for s in manager.list_sessions()]
+    assert keys[0] == "telegram:old"
+
+
+def test_full_rewrite_mode(tmp_path: Path) -> None:
+    manager = SessionManager(tmp_path, append_only=False)
+    session = Session(key="cli:direct")
+    for i in range(3):
+        session.add_message("user", f"msg{i}")
+        manager.save(session)
+
+    records = _lines(_session_path(manager, "cli:direct"))
+    assert [r.get("_type") for r in records].count("metadata") == 1
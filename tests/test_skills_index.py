@@ -0,0 +1,115 @@
+"""Tests for the persistent skill index."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from nanobot.agent.skills import SkillsLoader
+
+
+def _write_skill(root: Path, name: str, description: str, extra: str = "") -> Path:
+    path = root / name / "SKILL.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\nname: {name}\ndescription: {description}\n{extra}---\n\n# {name}\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def roots(tmp_path: Path) -> tuple[Path, Path]:
+    workspace, builtin = tmp_path / "workspace", tmp_path / "builtin"
+    for i in range(5):
+        _write_skill(builtin, f"skill{i}", f"Builtin skill {i}")
+    return workspace, builtin
+
+
+def _count_parses(monkeypatch, loader: SkillsLoader) -> list[str]:
+    parsed: list[str] = []
+    original = loader._parse_entry
+
+    def counting(name, path, source, st):
+        parsed.append(name)
+        return original(name, path, source, st)
+
+    monkeypatch.setattr(loader, "_parse_entry", counting)
+    return parsed
+
+
+def test_unchanged_skills_are_not_reparsed(monkeypatch, roots) -> None:
+    workspace, builtin = roots
+    loader = SkillsLoader(workspace, builtin)
+    parsed = _count_parses(monkeypatch, loader)
+
+    first = loader.build_skills_summary()
+    assert sorted(parsed) == [f"skill{i}" for i in range(5)]
+
+    parsed.clear()
+    assert loader.build_skills_summary() == first
+    loader.get_always_skills()
+    loader.list_skills()
+    assert parsed == []
+
+    skill = builtin / "skill3" / "SKILL.md"
+    skill.write_text(skill.read_text(encoding="utf-8").replace("Builtin skill 3", "Edited skill three"), encoding="utf-8")
+    assert "Edited skill three" in loader.build_skills_summary()
+    assert parsed == ["skill3"]
+
+
+def test_index_persists_across_loaders(monkeypatch, roots) -> None:
+    workspace, builtin = roots
+    SkillsLoader(workspace, builtin).index()
+    assert (workspace / ".nanobot" / "skills" / "index.json").exists()
+
+    loader = SkillsLoader(workspace, builtin)
+    parsed = _count_parses(monkeypatch, loader)
+
+    assert len(loader.index()) == 5
+    assert parsed == []
+
+
+def test_workspace_skills_shadow_builtin_and_removals_are_seen(roots) -> None:
+    workspace, builtin = roots
+    loader = SkillsLoader(workspace, builtin)
+    _write_skill(workspace / "skills", "skill1", "Workspace override", "always: true\n")
+
+    skills = {s["name"]: s for s in loader.list_skills()}
+    assert skills["skill1"]["source"] == "workspace"
+    assert loader.get_skill_metadata("skill1")["description"] == "Workspace override"
+    assert loader.get_always_skills() == ["skill1"]
+
+    (workspace / "skills" / "skill1" / "SKILL.md").unlink()
+    assert loader.get_skill_metadata("skill1")["description"] == "Builtin skill 1"
+    assert loader.get_always_skills() == []
+
+
+def test_requirement_checks_refresh_when_path_changes(monkeypatch, tmp_path: Path, roots) -> None:
+    workspace, builtin = roots
+    _write_skill(builtin, "needs-tool", "Needs a CLI", 'metadata: {"nanobot":{"requires":{"bins":["mytool"]}}}\n')
+    loader = SkillsLoader(workspace, builtin)
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+
+    assert "needs-tool" not in {s["name"] for s in loader.list_skills()}
+    signature = loader.signature()
+
+    tool = bin_dir / "mytool"
+    tool.write_text("#!/bin/sh\n", encoding="utf-8")
+    tool.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{tmp_path / 'empty'}")
+
+    assert loader.signature() != signature
+    assert "needs-tool" in {s["name"] for s in loader.list_skills()}
+
+
+def test_signature_tracks_required_env_vars(monkeypatch, roots) -> None:
+    workspace, builtin = roots
+    _write_skill(builtin, "needs-key", "Needs a key", 'metadata: {"nanobot":{"requires":{"env":["SKILL_TEST_KEY"]}}}\n')
+    loader = SkillsLoader(workspace, builtin)
+    monkeypatch.delenv("SKILL_TEST_KEY", raising=False)
+    before = loader.signature()
+
+    monkeypatch.setenv("SKILL_TEST_KEY", "x")
+    assert loader.signature() != before
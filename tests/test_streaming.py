@@ -0,0 +1,275 @@
+"""Tests for streamed LLM responses and in-place channel edits."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.config.schema import BrowserToolConfig, ChannelsConfig
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk, ToolCallRequest
+from nanobot.providers.openai_codex_provider import _stream_sse
+from nanobot.providers.streaming import ChatCompletionStream
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls, reasoning_content=None)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)], usage=usage)
+
+
+def _tool_fragment(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def test_chat_completion_stream_assembles_text_and_tool_calls() -> None:
+    stream = ChatCompletionStream()
+    deltas = [
+        stream.feed(_chunk(content="Hel")),
+        stream.feed(_chunk(content="lo")),
+        stream.feed(_chunk(tool_calls=[_tool_fragment(0, id="call_1", name="read_file", arguments='{"pa')])),
+        stream.feed(_chunk(tool_calls=[_tool_fragment(0, arguments='th": "a.txt"}')])),
+        stream.feed(_chunk(finish_reason="tool_calls")),
+        stream.feed(SimpleNamespace(
+            choices=[],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+        )),
+    ]
+
+    response = stream.response()
+    assert deltas == ["Hel", "lo", "", "", "", ""]
+    assert response.content == "Hello"
+    assert response.finish_reason == "tool_calls"
+    assert response.usage == {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    assert [(tc.id, tc.name, tc.arguments) for tc in response.tool_calls] == [
+        ("call_1", "read_file", {"path": "a.txt"}),
+    ]
+
+
+class _FakeSSE:
+    def __init__(self, events: list[str]):
+        self._lines = []
+        for event in events:
+            self._lines.extend([f"data: {event}", ""])
+
+    async def aiter_lines(self) -> AsyncIterator[str]:
+        for line in self._lines:
+            yield line
+
+
+@pytest.mark.asyncio
+async def test_codex_sse_yields_deltas_then_response() -> None:
+    response = _FakeSSE([
+        '{"type": "response.output_text.delta", "delta": "Hi "}',
+        '{"type": "response.output_text.delta", "delta": "there"}',
+        '{"type": "response.completed", "response": {"status": "completed"}}',
+    ])
+
+    chunks = [chunk async for chunk in _stream_sse(response)]
+
+    assert [c.delta for c in chunks if c.delta] == ["Hi ", "there"]
+    assert chunks[-1].response.content == "Hi there"
+    assert chunks[-1].response.finish_reason == "stop"
+
+
+class ScriptedProvider(LLMProvider):
+    """Streaming provider stub that replays scripted deltas per call."""
+
+    supports_streaming = True
+
+    def __init__(self, script: list[tuple[list[str], list[ToolCallRequest]]]):
+        super().__init__(api_key=None, api_base=None)
+        self.script = list(script)
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        raise AssertionError("streaming path expected")
+
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        deltas, tool_calls = self.script.pop(0)
+        for delta in deltas:
+            yield LLMStreamChunk(delta=delta)
+        yield LLMStreamChunk(response=LLMResponse(content="".join(deltas) or None, tool_calls=tool_calls))
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+class _PlainProvider(LLMProvider):
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        return LLMResponse(content="whole reply")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+@pytest.mark.asyncio
+async def test_default_chat_stream_wraps_chat() -> None:
+    chunks = [c async for c in _PlainProvider().chat_stream(messages=[])]
+
+    assert [c.delta for c in chunks] == ["whole reply", ""]
+    assert chunks[-1].response.content == "whole reply"
+
+
+def _build_loop(tmp_path: Path, provider: LLMProvider, bus: MessageBus) -> AgentLoop:
+    return AgentLoop(
+        bus=bus,
+        provider=provider,
+        workspace=tmp_path,
+        web_browser_config=BrowserToolConfig(enabled=False),
+        channels_config=ChannelsConfig(stream_replies=True),
+    )
+
+
+def _drain(bus: MessageBus) -> list[OutboundMessage]:
+    out = []
+    while bus.outbound_size:
+        out.append(bus.outbound.get_nowait())
+    return out
+
+
+@pytest.mark.asyncio
+async def test_agent_streams_partial_text_and_settles_with_final_reply(tmp_path: Path) -> None:
+    bus = MessageBus()
+    provider = ScriptedProvider([(["Hello ", "wor", "ld ", "again"], [])])
+    loop = _build_loop(tmp_path, provider, bus)
+
+    reply = await loop._process_message(
+        InboundMessage(channel="telegram", sender_id="u", chat_id="1", content="hi")
+    )
+
+    partials = _drain(bus)
+    assert [m.content for m in partials] == ["Hello"]
+    assert partials[0].metadata["_streaming"] is True
+    assert reply.content == "Hello world again"
+    assert reply.metadata["_stream_id"] == partials[0].metadata["_stream_id"]
+    assert "_streaming" not in reply.metadata
+
+
+@pytest.mark.asyncio
+async def test_streamed_tool_turn_is_settled_without_duplicate_progress(tmp_path: Path) -> None:
+    bus = MessageBus()
+    call = ToolCallRequest(id="c1", name="list_dir", arguments={"path": str(tmp_path)})
+    provider = ScriptedProvider([(["Let me look. "], [call]), (["Done."], [])])
+    loop = _build_loop(tmp_path, provider, bus)
+
+    reply = await loop._process_message(
+        InboundMessage(channel="telegram", sender_id="u", chat_id="1", content="hi")
+    )
+
+    sent = _drain(bus)
+    first_id = sent[0].metadata["_stream_id"]
+    assert [(m.content, m.metadata.get("_streaming")) for m in sent if m.metadata.get("_stream_id")] == [
+        ("Let me look.", True),
+        ("Let me look.", False),
+    ]
+    assert not any(m.metadata.get("_progress") and not m.metadata.get("_tool_hint") for m in sent)
+    assert reply.content == "Done."
+    assert reply.metadata.get("_stream_id") != first_id
+
+
+@pytest.mark.asyncio
+async def test_cli_and_disabled_config_do_not_stream(tmp_path: Path) -> None:
+    bus = MessageBus()
+    loop = _build_loop(tmp_path, _PlainProvider(), bus)
+    msg = InboundMessage(channel="telegram", sender_id="u", chat_id="1", content="hi")
+
+    assert not loop._should_stream(msg, None)  # provider cannot stream
+    loop.provider = ScriptedProvider([])
+    assert loop._should_stream(msg, None)
+    assert not loop._should_stream(InboundMessage(channel="cli", sender_id="u", chat_id="1", content="hi"), None)
+    loop.channels_config = ChannelsConfig()
+    assert not loop._should_stream(msg, None)
+
+
+class EditableChannel(BaseChannel):
+    name = "fake"
+    supports_streaming = True
+    stream_max_chars = 20
+
+    def __init__(self):
+        super().__init__(config=SimpleNamespace(allow_from=[]), bus=MessageBus())
+        self.log: list[tuple[str, Any, str]] = []
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, msg: OutboundMessage) -> None:
+        if await self._send_streamed(msg):
+            return
+        self.log.append(("send", None, msg.content))
+
+    async def _stream_start(self, msg: OutboundMessage) -> Any:
+        self.log.append(("start", None, msg.content))
+        return len(self.log)
+
+    async def _stream_edit(self, handle: Any, msg: OutboundMessage) -> None:
+        self.log.append(("edit", handle, msg.content))
+
+    async def _stream_delete(self, handle: Any, msg: OutboundMessage) -> None:
+        self.log.append(("delete", handle, ""))
+
+
+class UndeletableChannel(EditableChannel):
+    async def _stream_delete(self, handle: Any, msg: OutboundMessage) -> None:
+        raise NotImplementedError
+
+
+def _out(content: str, **meta: Any) -> OutboundMessage:
+    return OutboundMessage(channel="fake", chat_id="c", content=content, metadata=meta)
+
+
+@pytest.mark.asyncio
+async def test_channel_edits_streamed_message_in_place() -> None:
+    channel = EditableChannel()
+
+    await channel.send(_out("Hel", _stream_id="s1", _streaming=True))
+    await channel.send(_out("Hello", _stream_id="s1", _streaming=True))
+    await channel.send(_out("Hello world", _stream_id="s1"))
+    await channel.send(_out("plain"))
+
+    assert channel.log == [
+        ("start", None, "Hel"),
+        ("edit", 1, "Hello"),
+        ("edit", 1, "Hello world"),
+        ("send", None, "plain"),
+    ]
+    assert channel._stream_handles == {}
+
+
+@pytest.mark.asyncio
+async def test_channel_falls_back_to_send_for_unknown_or_oversized_stream() -> None:
+    channel = EditableChannel()
+
+    await channel.send(_out("never streamed", _stream_id="s0"))
+    await channel.send(_out("short", _stream_id="s1", _streaming=True))
+    await channel.send(_out("x" * 30, _stream_id="s1", _streaming=True))
+    await channel.send(_out("y" * 30, _stream_id="s1"))
+
+    assert channel.log == [
+        ("send", None, "never streamed"),
+        ("start", None, "short"),
+        ("delete", 2, ""),
+        ("send", None, "y" * 30),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_oversized_final_reply_continues_the_streamed_message_without_repeating_it() -> None:
+    channel = UndeletableChannel()
+
+    await channel.send(_out("first line", _stream_id="s1", _streaming=True))
+    await channel.send(_out("first line\nsecond line, much longer", _stream_id="s1"))
+
+    assert channel.log == [
+        ("start", None, "first line"),
+        ("edit", 1, "first line"),
+        ("send", None, "second line, much longer"),
+    ]
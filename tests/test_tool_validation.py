@@ -1,3 +1,4 @@
+import asyncio
 from types import SimpleNamespace
 from typing import Any
 import time
@@ -282,3 +283,78 @@ async def test_write_file_tool_relative_path_writes_under_workspace(tmp_path: Pa
 
     assert "Successfully wrote" in result
     assert (workspace / "memory" / "MEMORY.md").read_text(encoding="utf-8") == "hello"
+
+
+class SleepTool(Tool):
+    def __init__(self, name: str, *, parallel_safe: bool, max_concurrency: int | None = None, log=None):
+        self._name = name
+        self.parallel_safe = parallel_safe
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self.max_active = 0
+        self.log = log if log is not None else []
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "sleep"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"tag": {"type": "string"}}}
+
+    async def execute(self, tag: str = "", **kwargs: Any) -> str:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.log.append(f"start:{tag}")
+        await asyncio.sleep(0.05)
+        self.log.append(f"end:{tag}")
+        self.active -= 1
+        return f"{self._name}:{tag}"
+
+
+async def test_registry_execute_many_runs_parallel_safe_calls_concurrently() -> None:
+    reg = ToolRegistry()
+    search = SleepTool("search", parallel_safe=True)
+    reg.register(search)
+
+    start = time.perf_counter()
+    results = await reg.execute_many([("search", {"tag": str(i)}) for i in range(4)])
+    elapsed = time.perf_counter() - start
+
+    assert results == [f"search:{i}" for i in range(4)]
+    assert search.max_active == 4
+    assert elapsed < 0.15
+
+
+async def test_registry_execute_many_serializes_around_side_effects() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(SleepTool("read", parallel_safe=True, log=log))
+    reg.register(SleepTool("write", parallel_safe=False, log=log))
+
+    results = await reg.execute_many([
+        ("read", {"tag": "r1"}),
+        ("read", {"tag": "r2"}),
+        ("write", {"tag": "w"}),
+        ("read", {"tag": "r3"}),
+    ])
+
+    assert results == ["read:r1", "read:r2", "write:w", "read:r3"]
+    w_start = log.index("start:w")
+    assert log.index("end:r1") < w_start and log.index("end:r2") < w_start
+    assert log.index("end:w") < log.index("start:r3")
+
+
+async def test_registry_execute_many_respects_tool_concurrency_cap() -> None:
+    reg = ToolRegistry()
+    fetch = SleepTool("fetch", parallel_safe=True, max_concurrency=2)
+    reg.register(fetch)
+
+    results = await reg.execute_many([("fetch", {"tag": str(i)}) for i in range(5)])
+
+    assert results == [f"fetch:{i}" for i in range(5)]
+    assert fetch.max_active == 2
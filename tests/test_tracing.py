@@ -0,0 +1,138 @@
+"""Tests for per-turn tracing spans and the flame breakdown."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import BrowserToolConfig, TracingConfig
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.utils import tracing
+from nanobot.utils.tracing import Tracer, load_spans, render_flame, slowest_traces
+
+
+@pytest.fixture
+def trace_file(tmp_path: Path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    tracing.configure_tracing(TracingConfig(enabled=True), path)
+    yield path
+    tracing.configure_tracing(TracingConfig(enabled=False), path)
+
+
+def test_spans_nest_and_round_trip_through_the_file(trace_file: Path) -> None:
+    with tracing.span("agent.turn", session_key="cli:direct") as turn:
+        with tracing.span("tool.execute", tool="exec"):
+            pass
+        with pytest.raises(ValueError):
+            with tracing.span("tool.execute", tool="read_file"):
+                raise ValueError("bad path")
+    with tracing.span("channel.send", parent=turn.traceparent, channel="cli"):
+        pass
+
+    spans = {(s.name, s.attributes.get("tool") or s.attributes.get("channel")): s for s in load_spans(trace_file)}
+    root = spans[("agent.turn", None)]
+    assert root.parent_id == "" and root.attributes == {"session_key": tracing._pseudonymize("cli:direct")}
+    for key in [("tool.execute", "exec"), ("tool.execute", "read_file"), ("channel.send", "cli")]:
+        assert spans[key].trace_id == root.trace_id and spans[key].parent_id == root.span_id
+    assert spans[("tool.execute", "read_file")].error == "ValueError: bad path"
+
+
+def test_disabled_tracer_writes_nothing(tmp_path: Path) -> None:
+    tracer = Tracer()
+    with tracer.span("agent.turn") as span:
+        span.set(x=1)
+    assert not tracer.enabled and span.traceparent == ""
+    assert tracing.current_traceparent() is None
+
+
+def test_trace_file_rotates(tmp_path: Path) -> None:
+    path = tmp_path / "spans.jsonl"
+    tracer = Tracer(path, max_bytes=2000)
+    for i in range(20):
+        with tracer.span("agent.turn", session_key=f"cli:{i}"):
+            pass
+
+    assert path.with_name("spans.jsonl.1").exists()
+    assert path.stat().st_size <= 2000
+    assert len(load_spans(path)) < 20
+
+
+def test_slowest_traces_render_as_flame(tmp_path: Path) -> None:
+    path = tmp_path / "spans.jsonl"
+    tracer = Tracer(path)
+    for key in ("cli:fast", "cli:slow"):
+        with tracer.span("agent.turn", session_key=key):
+            with tracer.span("llm.chat", iteration=1, model="m"):
+                pass
+    spans = load_spans(path)
+    fast, slow = [s for s in spans if s.name == "agent.turn"]
+    slow.end_ns = slow.start_ns + 2_000_000_000
+
+    turns = slowest_traces(spans, limit=1)
+    lines = render_flame(turns[0], width=20)
+
+    assert turns == [slow]
+    assert lines[0].startswith(f"agent.turn {tracing._pseudonymize('cli:slow')}") and "100.0%" in lines[0]
+    assert lines[1].lstrip().startswith("llm.chat #1 m")
+    assert lines[0].endswith("|" + "█" * 20 + "|")
+
+
+class _ToolThenAnswer(LLMProvider):
+    def __init__(self, tmp_path: Path):
+        super().__init__()
+        self.calls = [
+            LLMResponse(content=None, tool_calls=[ToolCallRequest("c1", "list_dir", {"path": str(tmp_path)})]),
+            LLMResponse(content="done", usage={"prompt_tokens": 12, "completion_tokens": 2}),
+        ]
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7) -> LLMResponse:
+        return self.calls.pop(0)
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+@pytest.mark.asyncio
+async def test_agent_turn_records_llm_tool_and_session_spans(tmp_path: Path, trace_file: Path) -> None:
+    bus = MessageBus()
+    loop = AgentLoop(
+        bus=bus,
+        provider=_ToolThenAnswer(tmp_path),
+        workspace=tmp_path,
+        web_browser_config=BrowserToolConfig(enabled=False),
+    )
+
+    reply = await loop._process_message(InboundMessage(channel="telegram", sender_id="u", chat_id="7", content="hi"))
+    await bus.publish_outbound(OutboundMessage(channel="telegram", chat_id="7", content="later"))
+
+    spans = load_spans(trace_file)
+    root = next(s for s in spans if s.name == "agent.turn")
+    children = [(s.name, s.attributes.get("iteration") or s.attributes.get("tool")) for s in spans if s.parent_id == root.span_id]
+    assert root.attributes["session_key"] == tracing._pseudonymize("telegram:7")
+    assert ("llm.chat", 1) in children and ("llm.chat", 2) in children
+    assert ("tool.execute", "list_dir") in children
+    assert ("session.load", None) in children and ("session.save", None) in children
+    assert reply.metadata["_traceparent"] == f"00-{root.trace_id}-{root.span_id}-01"
+    assert "_traceparent" not in bus.outbound.get_nowait().metadata  # Published outside any span
+
+
+def test_session_keys_are_pseudonymized_on_export(tmp_path: Path) -> None:
+    path = tmp_path / "spans.jsonl"
+    tracer = Tracer(path)
+    for key in ("telegram:12345", "telegram:12345", "telegram:67890"):
+        with tracer.span("agent.turn", session_key=key):
+            pass
+
+    keys = [s.attributes["session_key"] for s in load_spans(path)]
+
+    assert "12345" not in path.read_text(encoding="utf-8")
+    assert all(k.startswith("telegram:") for k in keys)
+    assert keys[0] == keys[1] != keys[2]
+
+
+def test_tracing_is_off_by_default() -> None:
+    assert TracingConfig().enabled is False
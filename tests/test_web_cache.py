@@ -0,0 +1,190 @@
+"""Tests for the web_search/web_fetch result cache."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
+from nanobot.agent.tools.web_cache import WebCache, cache_key, http_ttl
+from nanobot.agent.tools.websearch.models import SearchHit
+from nanobot.config.schema import WebSearchConfig
+from nanobot.utils import metrics
+
+
+def test_cache_persists_to_disk_and_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = WebCache(tmp_path, memory_max_bytes=10_000, disk_max_bytes=3_500)
+    for i in range(3):
+        cache.put(f"k{i}", "x" * 1000, ttl=60)
+    cache.get("k0")  # k1 is now the least recently used
+    cache.put("k3", "x" * 1000, ttl=60)
+
+    reopened = WebCache(tmp_path)
+    assert reopened.get("k1") is None
+    assert reopened.get("k0").value == "x" * 1000
+    assert reopened.stats.disk_hits == 1
+    assert cache.stats.evictions == 1
+    assert cache.stats.disk_bytes <= 3_500
+
+
+def test_stale_entries_without_validators_are_dropped(tmp_path: Path) -> None:
+    cache = WebCache(tmp_path)
+    cache.put("plain", "v", ttl=60)
+    cache.put("tagged", "v", ttl=0, etag='"abc"')
+    cache._memory["plain"].expires = 0
+    cache._memory["tagged"].expires = 0
+
+    assert cache.get("plain") is None
+    assert not (tmp_path / "plain.json").exists()
+    stale = cache.get("tagged")
+    assert stale is not None and not stale.fresh and stale.etag == '"abc"'
+    assert cache.stats.misses == 2
+
+
+def test_http_ttl_honors_cache_headers() -> None:
+    assert http_ttl({}, default=900, max_ttl=3600) == 900
+    assert http_ttl({"cache-control": "public, max-age=120"}, default=900, max_ttl=3600) == 120
+    assert http_ttl({"cache-control": "max-age=999999"}, default=900, max_ttl=3600) == 3600
+    assert http_ttl({"cache-control": "no-cache"}, default=900, max_ttl=3600) == 0
+    assert http_ttl({"cache-control": "private, no-store"}, default=900, max_ttl=3600) is None
+    assert http_ttl({"cache-control": "private, max-age=600"}, default=900, max_ttl=3600) is None
+    assert http_ttl({
+        "expires": "Thu, 01 Jan 2026 00:10:00 GMT",
+        "date": "Thu, 01 Jan 2026 00:00:00 GMT",
+    }, default=900, max_ttl=3600) == 600
+
+
+@pytest.mark.asyncio
+async def test_web_search_reuses_cached_results_for_equivalent_queries(monkeypatch, tmp_path: Path) -> None:
+    calls = []
+
+    async def fake_search(*, query: str, count: int) -> list[SearchHit]:
+        calls.append(query)
+        return [SearchHit(title="T", url="https://example.com", snippet="S")]
+
+    cache = WebCache(tmp_path)
+    tool = WebSearchTool(web_search_config=WebSearchConfig(), cache=cache)
+    monkeypatch.setattr(tool.client, "search", fake_search)
+
+    first = await tool.execute(query="Python  asyncio", count=3)
+    second = await tool.execute(query="python asyncio", count=3)
+    await tool.execute(query="python asyncio", count=5)
+
+    assert first.splitlines()[1:] == second.splitlines()[1:]
+    assert calls == ["Python  asyncio", "python asyncio"]
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_web_search_does_not_cache_empty_results(monkeypatch, tmp_path: Path) -> None:
+    calls = []
+
+    async def fake_search(*, query: str, count: int) -> list[SearchHit]:
+        calls.append(query)
+        return []
+
+    cache = WebCache(tmp_path)
+    tool = WebSearchTool(web_search_config=WebSearchConfig(), cache=cache)
+    monkeypatch.setattr(tool.client, "search", fake_search)
+
+    await tool.execute(query="nothing here", count=3)
+    await tool.execute(query="nothing here", count=3)
+
+    assert len(calls) == 2
+    assert cache.stats.stores == 0
+
+
+def test_cache_lookups_are_exported_as_metrics(tmp_path: Path) -> None:
+    hits = metrics.WEB_CACHE_HITS.value("memory")
+    disk_hits = metrics.WEB_CACHE_HITS.value("disk")
+    misses = metrics.WEB_CACHE_MISSES.value()
+    cache = WebCache(tmp_path)
+    cache.put("k", "v", ttl=60)
+
+    cache.get("k")
+    WebCache(tmp_path).get("k")
+    cache.get("missing")
+
+    assert metrics.WEB_CACHE_HITS.value("memory") == hits + 1
+    assert metrics.WEB_CACHE_HITS.value("disk") == disk_hits + 1
+    assert metrics.WEB_CACHE_MISSES.value() == misses + 1
+
+
+class _StubClient:
+    def __init__(self, responses: list[httpx.Response]):
+        self.responses = responses
+        self.requests: list[dict] = []
+
+    async def get(self, url, headers=None, follow_redirects=None, timeout=None):
+        self.requests.append(headers)
+        response = self.responses.pop(0)
+        response.request = httpx.Request("GET", url)
+        return response
+
+
+@pytest.mark.asyncio
+async def test_web_fetch_serves_cache_and_revalidates_with_etag(monkeypatch, tmp_path: Path) -> None:
+    url = "https://example.com/data.json"
+    client = _StubClient([
+        httpx.Response(200, json={"v": 1}, headers={"etag": '"v1"', "cache-control": "no-cache"}),
+        httpx.Response(304, headers={"etag": '"v1"'}),
+        httpx.Response(200, text="other", headers={"content-type": "text/plain", "cache-control": "max-age=60"}),
+    ])
+    monkeypatch.setattr("nanobot.agent.tools.web.get_http_client", lambda **_: client)
+    cache = WebCache(tmp_path)
+    tool = WebFetchTool(cache=cache)
+
+    first = json.loads(await tool.execute(url=url))
+    second = json.loads(await tool.execute(url=url))
+    other = json.loads(await tool.execute(url=url, extractMode="text"))
+    again = json.loads(await tool.execute(url=url, extractMode="text", maxChars=100))
+
+    assert "cached" not in first and second["cached"] is True
+    assert second["text"] == first["text"]
+    assert client.requests[1]["If-None-Match"] == '"v1"'
+    assert other["text"] == "other" and again["cached"] is True
+    assert len(client.requests) == 3
+    assert cache.stats.revalidated == 1
+    assert cache.get(cache_key("fetch", url, "markdown")).etag == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_web_fetch_does_not_share_personalized_pages(monkeypatch, tmp_path: Path) -> None:
+    url = "https://example.com/account"
+    client = _StubClient([
+        httpx.Response(200, text="hello alice", headers={"content-type": "text/plain", "cache-control": "private"}),
+        httpx.Response(200, text="hello bob", headers={"content-type": "text/plain"}),
+    ])
+    monkeypatch.setattr("nanobot.agent.tools.web.get_http_client", lambda **_: client)
+    cache = WebCache(tmp_path)
+    tool = WebFetchTool(cache=cache)
+
+    first = json.loads(await tool.execute(url=url))
+    second = json.loads(await tool.execute(url=url))
+
+    assert first["text"] == "hello alice" and second["text"] == "hello bob"
+    assert "cached" not in second
+
+    with_cookie = httpx.Request("GET", url, headers={"cookie": "sid=1"})
+    assert tool._ttl(httpx.Response(200, request=with_cookie)) is None
+
+
+@pytest.mark.asyncio
+async def test_web_fetch_drops_entry_when_revalidation_turns_private(monkeypatch, tmp_path: Path) -> None:
+    url = "https://example.com/data.json"
+    client = _StubClient([
+        httpx.Response(200, json={"v": 1}, headers={"etag": '"v1"', "cache-control": "no-cache"}),
+        httpx.Response(304, headers={"etag": '"v1"', "cache-control": "private"}),
+    ])
+    monkeypatch.setattr("nanobot.agent.tools.web.get_http_client", lambda **_: client)
+    cache = WebCache(tmp_path)
+    tool = WebFetchTool(cache=cache)
+
+    await tool.execute(url=url)
+    second = json.loads(await tool.execute(url=url))
+
+    assert second["cached"] is True
+    assert cache.get(cache_key("fetch", url, "markdown")) is None
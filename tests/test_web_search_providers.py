@@ -59,7 +59,7 @@ async def test_web_search_brave_success(monkeypatch) -> None:
                 }
             )
 
-    monkeypatch.setattr("nanobot.agent.tools.websearch.brave.httpx.AsyncClient", StubClient)
+    monkeypatch.setattr("nanobot.agent.tools.websearch.brave.get_http_client", lambda **_: StubClient())
 
     tool = WebSearchTool(web_search_config=_make_config("brave"))
     result = await tool.execute(query="python", count=1)
@@ -100,7 +100,7 @@ async def test_web_search_tavily_success(monkeypatch) -> None:
                 }
             )
 
-    monkeypatch.setattr("nanobot.agent.tools.websearch.tavily.httpx.AsyncClient", StubClient)
+    monkeypatch.setattr("nanobot.agent.tools.websearch.tavily.get_http_client", lambda **_: StubClient())
 
     tool = WebSearchTool(web_search_config=_make_config("tavily"))
     result = await tool.execute(query="agent", count=1)
@@ -140,7 +140,7 @@ async def test_web_search_serper_success(monkeypatch) -> None:
                 }
             )
 
-    monkeypatch.setattr("nanobot.agent.tools.websearch.serper.httpx.AsyncClient", StubClient)
+    monkeypatch.setattr("nanobot.agent.tools.websearch.serper.get_http_client", lambda **_: StubClient())
 
     tool = WebSearchTool(web_search_config=_make_config("serper"))
     result = await tool.execute(query="search", count=1)
@@ -180,7 +180,7 @@ async def test_web_search_count_is_clamped(monkeypatch) -> None:
                 }
             )
 
-    monkeypatch.setattr("nanobot.agent.tools.websearch.brave.httpx.AsyncClient", StubClient)
+    monkeypatch.setattr("nanobot.agent.tools.websearch.brave.get_http_client", lambda **_: StubClient())
 
     tool = WebSearchTool(web_search_config=_make_config("brave"))
     await tool.execute(query="q", count=0)
@@ -225,7 +225,7 @@ async def test_web_search_empty_results(monkeypatch) -> None:
         async def post(self, url, json=None, headers=None, timeout=None):
             return FakeResponse({"results": []})
 
-    monkeypatch.setattr("nanobot.agent.tools.websearch.tavily.httpx.AsyncClient", StubClient)
+    monkeypatch.setattr("nanobot.agent.tools.websearch.tavily.get_http_client", lambda **_: StubClient())
 
     tool = WebSearchTool(web_search_config=_make_config("tavily"))
     result = await tool.execute(query="nothing", count=3)
@@ -244,7 +244,7 @@ async def test_web_search_http_error_wrapped(monkeypatch) -> None:
         async def get(self, url, params=None, headers=None, timeout=None):
             return FakeResponse({}, error=httpx.HTTPError("boom"))
 
-    monkeypatch.setattr("nanobot.agent.tools.websearch.brave.httpx.AsyncClient", StubClient)
+    monkeypatch.setattr("nanobot.agent.tools.websearch.brave.get_http_client", lambda **_: StubClient())
 
     tool = WebSearchTool(web_search_config=_make_config("brave"))
     result = await tool.execute(query="fail", count=1)
@@ -266,7 +266,7 @@ async def test_web_search_uses_default_base_url_when_config_base_url_empty(monke
             calls["url"] = url
             return FakeResponse({"results": []})
 
-    monkeypatch.setattr("nanobot.agent.tools.websearch.tavily.httpx.AsyncClient", StubClient)
+    monkeypatch.setattr("nanobot.agent.tools.websearch.tavily.get_http_client", lambda **_: StubClient())
 
     cfg = _make_config("tavily")
     cfg.providers.tavily.base_url = ""